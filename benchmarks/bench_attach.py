@@ -0,0 +1,125 @@
+"""
+Benchmark: keystroke-echo round trip for an interactive session.
+
+Types single keystrokes into a ``cat`` session and times each one until the
+terminal's echo reaches the client, over
+- POST + SSE: ``POST /tools/terminal:write_input`` per keystroke through the
+  full ASGI stack (httpx ``ASGITransport``), echo read from a
+  ``terminal:stream`` generator, at the configured flush interval and
+  with coalescing disabled
+- WebSocket: STDIN frames into ``/tools/terminal:attach``, driven as raw
+  ASGI messages, echo read from its STDOUT frames
+
+Everything runs in-process, so this measures the adapter and PTY path,
+not the network.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_attach.py [probes]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from terminal_adapter import main
+from terminal_adapter.domain.pty_executor import PTYExecutor
+
+TIMEOUT = 5.0
+
+
+async def post_sse(session_id: str, probes: int):
+    waiter = None
+
+    async def consume():
+        response = await main.terminal_stream(session_id, "skip", None)
+        async for event in response.body_iterator:
+            if waiter and not waiter.done() and "k" in event:
+                waiter.set_result(time.perf_counter())
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0.1)
+    latencies = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://adapter") as client:
+        for _ in range(probes):
+            waiter = asyncio.get_running_loop().create_future()
+            start = time.perf_counter()
+            response = await client.post(
+                "/tools/terminal:write_input", json={"session_id": session_id, "data": "k"}
+            )
+            response.raise_for_status()
+            latencies.append(await asyncio.wait_for(waiter, TIMEOUT) - start)
+    consumer.cancel()
+    return latencies
+
+
+async def websocket(session_id: str, probes: int):
+    to_app, from_app = asyncio.Queue(), asyncio.Queue()
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "scheme": "ws",
+        "path": "/tools/terminal:attach",
+        "raw_path": b"/tools/terminal:attach",
+        "root_path": "",
+        "query_string": f"session_id={session_id}".encode(),
+        "headers": [],
+        "server": ("adapter", 80),
+        "client": ("bench", 1),
+        "subprotocols": [],
+    }
+    await to_app.put({"type": "websocket.connect"})
+    app = asyncio.create_task(main.app(scope, to_app.get, from_app.put))
+    assert (await from_app.get())["type"] == "websocket.accept"
+
+    latencies = []
+    for _ in range(probes):
+        start = time.perf_counter()
+        await to_app.put({"type": "websocket.receive", "bytes": bytes([main.AttachFrame.STDIN]) + b"k"})
+        while True:
+            message = await asyncio.wait_for(from_app.get(), TIMEOUT)
+            data = message.get("bytes") or b""
+            if data[:1] == bytes([main.AttachFrame.STDOUT]) and b"k" in data:
+                break
+        latencies.append(time.perf_counter() - start)
+    await to_app.put({"type": "websocket.disconnect", "code": 1000})
+    await asyncio.wait_for(app, TIMEOUT)
+    return latencies
+
+
+async def run(path, probes: int):
+    executor = main.state.pty_executor = PTYExecutor(project_root=tempfile.gettempdir())
+    session = await executor.start_session("cat", [], tempfile.gettempdir())
+    await asyncio.sleep(0.1)
+    try:
+        return await path(session.session_id, probes)
+    finally:
+        await executor.cleanup_all()
+        main.state.pty_executor = None
+
+
+def main_() -> None:
+    logging.disable(logging.INFO)
+    probes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    flush_ms = main.STREAM_FLUSH_MS
+
+    print(f"{probes} keystrokes, echo from `cat` under a PTY")
+    print(f"{'transport':<24} {'p50':>9} {'p99':>9}")
+    for name, path, stream_flush in (
+        (f"POST + SSE ({flush_ms:g}ms flush)", post_sse, flush_ms),
+        ("POST + SSE (no flush)", post_sse, 0.0),
+        ("WebSocket", websocket, flush_ms),
+    ):
+        main.STREAM_FLUSH_MS = stream_flush
+        latencies = sorted(asyncio.run(run(path, probes)))
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{name:<24} {statistics.median(latencies) * 1000:>7.3f}ms {p99 * 1000:>7.3f}ms", flush=True)
+
+
+if __name__ == "__main__":
+    main_()
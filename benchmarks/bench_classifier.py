@@ -0,0 +1,91 @@
+"""
+Benchmark: CommandClassifier per-call latency.
+
+Compares the compiled single-alternation matcher used by
+``CommandClassifier.classify`` against the previous per-pattern loop
+(blocklist, then HIGH_RISK, READ and WRITE, one ``search`` each), with
+and without the classification LRU cache.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_classifier.py [iterations]
+"""
+
+import re
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from terminal_adapter.domain.classifier import (
+    COMMAND_BLOCKLIST,
+    COMMAND_RISK_MAP,
+    CommandClassifier,
+    RiskLevel,
+)
+
+WORKLOAD: List[Tuple[str, List[str]]] = [
+    ("ls", ["-la"]),
+    ("git", ["status"]),
+    ("cat", ["README.md"]),
+    ("npm", ["install"]),
+    ("make", ["-j8"]),
+    ("rm", ["-rf", "build"]),
+    ("echo", ["hello", ">", "out.txt"]),
+    ("my_custom_binary", ["--flag", "value"]),
+    ("pnpm", ["add", "left-pad"]),
+    ("python", ["-c", "print(1)"] * 8),
+]
+
+
+class LegacyLoopClassifier:
+    """The original tier-by-tier loop, kept here as the baseline."""
+
+    def __init__(self):
+        self._blocklist_patterns = [re.compile(p) for p in COMMAND_BLOCKLIST]
+        self._read_patterns = [re.compile(p) for p in COMMAND_RISK_MAP["read"]]
+        self._write_patterns = [re.compile(p) for p in COMMAND_RISK_MAP["write"]]
+        self._high_risk_patterns = [re.compile(p) for p in COMMAND_RISK_MAP["high_risk"]]
+
+    def classify(self, command: str, args: List[str]) -> Tuple[Optional[RiskLevel], Optional[str]]:
+        full_command = f"{command} {' '.join(args)}".strip()
+        for pattern in self._blocklist_patterns:
+            if pattern.search(full_command):
+                return None, pattern.pattern
+        for level, patterns in (
+            (RiskLevel.HIGH_RISK, self._high_risk_patterns),
+            (RiskLevel.READ, self._read_patterns),
+            (RiskLevel.WRITE, self._write_patterns),
+        ):
+            for pattern in patterns:
+                if pattern.search(full_command):
+                    return level, pattern.pattern
+        return RiskLevel.HIGH_RISK, None
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for command, args in WORKLOAD:
+            fn(command, args)
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * len(WORKLOAD)) * 1e6
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    legacy = LegacyLoopClassifier()
+    compiled = CommandClassifier(cache_size=0)
+    cached = CommandClassifier()
+
+    legacy_us = _time_per_call(legacy.classify, iterations)
+    compiled_us = _time_per_call(compiled.classify, iterations)
+    cached_us = _time_per_call(cached.classify, iterations)
+
+    print(f"calls per variant: {iterations * len(WORKLOAD):,}")
+    print(f"legacy loop:      {legacy_us:8.2f} us/call")
+    print(f"compiled matcher: {compiled_us:8.2f} us/call  ({legacy_us / compiled_us:.2f}x)")
+    print(f"cached:           {cached_us:8.2f} us/call  ({legacy_us / cached_us:.2f}x)")
+    print(f"cache:            {cached.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
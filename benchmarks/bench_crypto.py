@@ -0,0 +1,90 @@
+"""
+Benchmark: Ed25519 + JCS sign and verify throughput.
+
+Compares the previous per-call path (parse the raw key on every call)
+against the keyring behind ``sign_json`` / ``verify_json_signature``,
+for a repeated payload (capability tokens, manifests, identical
+proposals) and for distinct payloads. Both paths run ``rfc8785.dumps``
+on every call. Also times ``verify_many`` over a batch of capability
+tokens.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_crypto.py [iterations]
+"""
+
+import sys
+import time
+
+import rfc8785
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+
+from terminal_adapter.domain.crypto import KEYRING, generate_keypair, sign_json, verify_json_signature
+
+
+def payload(n: int) -> dict:
+    return {
+        "scope": "terminal:write",
+        "agent_id": "did:key:z6MkAgent",
+        "command": "npm",
+        "args": ["install", f"pkg-{n}"],
+        "cwd": "/workspace/project",
+        "expires_at": "2026-01-01T00:00:00Z",
+    }
+
+
+def uncached_sign(data: dict, private_key: bytes) -> bytes:
+    return Ed25519PrivateKey.from_private_bytes(private_key).sign(rfc8785.dumps(data))
+
+
+def uncached_verify(data: dict, signature: bytes, public_key: bytes) -> bool:
+    Ed25519PublicKey.from_public_bytes(public_key).verify(signature, rfc8785.dumps(data))
+    return True
+
+
+def rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    private_key, public_key = generate_keypair()
+    same = payload(0)
+    distinct = [payload(n) for n in range(iterations)]
+    same_sig = sign_json(same, private_key)
+    distinct_sigs = [sign_json(d, private_key) for d in distinct]
+
+    runs = (
+        ("sign, repeated payload",
+         lambda i: uncached_sign(same, private_key),
+         lambda i: sign_json(same, private_key)),
+        ("sign, distinct payloads",
+         lambda i: uncached_sign(distinct[i], private_key),
+         lambda i: sign_json(distinct[i], private_key)),
+        ("verify, repeated payload",
+         lambda i: uncached_verify(same, same_sig, public_key),
+         lambda i: verify_json_signature(same, same_sig, public_key)),
+        ("verify, distinct payloads",
+         lambda i: uncached_verify(distinct[i], distinct_sigs[i], public_key),
+         lambda i: verify_json_signature(distinct[i], distinct_sigs[i], public_key)),
+    )
+
+    print(f"{iterations:,} operations each")
+    print(f"{'operation':<26} {'per call':>12} {'keyring':>14} {'speedup':>8}")
+    for name, before, after in runs:
+        old, new = rate(before, iterations), rate(after, iterations)
+        print(f"{name:<26} {old:>8,.0f}/s {new:>10,.0f}/s {new / old:>7.1f}x")
+
+    batch = [(same, same_sig)] * iterations
+    start = time.perf_counter()
+    KEYRING.verify_many(batch, public_key)
+    print(f"{'verify_many, tokens':<26} {'':>12} {iterations / (time.perf_counter() - start):>10,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
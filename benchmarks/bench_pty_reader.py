@@ -0,0 +1,111 @@
+"""
+Benchmark: PTY output reader cost as interactive session count grows.
+
+Starts ``n`` idle ``cat`` sessions, then measures
+- idle CPU: process CPU seconds per wall second while nothing is written
+- output latency: time from writing a line to one session until its echo
+  reaches the ``on_output`` callback (median of ``probes``)
+for the event-driven reader (``loop.add_reader``) and for the previous
+per-session task that ran ``select.select(..., 0.1)`` on the event loop
+followed by ``asyncio.sleep(0.01)``.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_pty_reader.py [counts] [idle_seconds] [probes]
+    e.g. bench_pty_reader.py 10,100,500 2 20
+"""
+
+import asyncio
+import os
+import select
+import statistics
+import sys
+import tempfile
+import time
+
+from terminal_adapter.domain.pty_executor import PTYExecutor
+
+PROBE_TIMEOUT = 5.0
+# The select reader blocks the loop ~100ms per idle session per round, so
+# beyond this many sessions a single run takes minutes; it is skipped
+SELECT_LOOP_MAX_SESSIONS = 100
+
+
+class SelectLoopExecutor(PTYExecutor):
+    """The previous reader: one select+sleep polling task per session."""
+
+    def _watch(self, session, on_output):
+        self._readers[session.session_id] = asyncio.get_running_loop()
+        asyncio.ensure_future(self._read_output_loop(session, on_output))
+
+    def _unwatch(self, session):
+        self._readers.pop(session.session_id, None)
+
+    async def _read_output_loop(self, session, on_output):
+        while session.session_id in self._readers:
+            readable, _, _ = select.select([session.master_fd], [], [], 0.1)
+            if readable:
+                try:
+                    chunk = os.read(session.master_fd, 4096)
+                except OSError:
+                    break
+                if chunk and on_output:
+                    on_output(session.session_id, chunk.decode("utf-8", errors="replace"))
+            await asyncio.sleep(0.01)
+
+
+async def run(executor_cls, count: int, idle_seconds: float, probes: int):
+    executor = executor_cls(project_root=tempfile.gettempdir())
+    waiters = {}
+
+    def on_output(session_id, text):
+        waiter = waiters.get(session_id)
+        if waiter and not waiter.done() and "probe" in text:
+            waiter.set_result(time.perf_counter())
+
+    sessions = [
+        await executor.start_session("cat", [], tempfile.gettempdir(), on_output=on_output)
+        for _ in range(count)
+    ]
+    await asyncio.sleep(0.2)
+
+    cpu = time.process_time()
+    await asyncio.sleep(idle_seconds)
+    idle_cpu = (time.process_time() - cpu) / idle_seconds
+
+    latencies = []
+    loop = asyncio.get_running_loop()
+    for i in range(probes):
+        session = sessions[i % count]
+        waiters[session.session_id] = loop.create_future()
+        start = time.perf_counter()
+        await executor.write_input(session.session_id, "probe\n")
+        try:
+            done = await asyncio.wait_for(waiters[session.session_id], PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            latencies.append(float("inf"))
+            break
+        latencies.append(done - start)
+
+    await executor.cleanup_all()
+    return idle_cpu, statistics.median(latencies)
+
+
+def main() -> None:
+    counts = [int(n) for n in (sys.argv[1] if len(sys.argv) > 1 else "10,100,500").split(",")]
+    idle_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    probes = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    print(f"idle window {idle_seconds}s, {probes} latency probes")
+    print(f"{'reader':<14} {'sessions':>9} {'idle CPU':>9} {'p50 latency':>12}")
+    for count in counts:
+        for name, cls in (("select+sleep", SelectLoopExecutor), ("add_reader", PTYExecutor)):
+            if cls is SelectLoopExecutor and count > SELECT_LOOP_MAX_SESSIONS:
+                print(f"{name:<14} {count:>9} {'skipped':>9} {f'~{count * 0.1:.0f}s/round':>12}")
+                continue
+            idle_cpu, latency = asyncio.run(run(cls, count, idle_seconds, probes))
+            shown = f">{PROBE_TIMEOUT:.0f}s" if latency == float("inf") else f"{latency * 1000:.2f}ms"
+            print(f"{name:<14} {count:>9} {idle_cpu:>8.1%} {shown:>12}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
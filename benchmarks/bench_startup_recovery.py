@@ -0,0 +1,89 @@
+"""
+Benchmark: adapter cold start with many sessions in the WAL.
+
+Writes ``sessions`` sessions of ``actions`` actions each into a segmented
+log, then times a fresh ``SessionManager`` recovering all of them:
+sequential ``recover_session`` calls versus ``recover_all`` on a thread
+pool and on a process pool. Every run rebuilds sessions and Merkle trees.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_startup_recovery.py [sessions] [actions] [workers]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from terminal_adapter.domain import RiskLevel, SessionManager, TerminalAction
+from terminal_adapter.domain.session_manager import pack_action
+from terminal_adapter.domain.wal import DEFAULT_SEGMENT_BYTES, RECORD_ENTRY, encode_record
+
+
+def write_segments(wal_dir: str, session_ids, per_session: int) -> None:
+    segment_id, size = 0, 0
+    f = open(os.path.join(wal_dir, f"{segment_id:08d}.seg"), "wb")
+    for i in range(per_session):
+        for session_id in session_ids:
+            action = TerminalAction(
+                session_id=session_id,
+                command="git",
+                args=["status", f"-n{i}"],
+                cwd="/workspace/project",
+                risk_level=RiskLevel.READ,
+                exit_code=0,
+            )
+            record = encode_record(RECORD_ENTRY, session_id, i, pack_action(action))
+            if size + len(record) > DEFAULT_SEGMENT_BYTES:
+                f.close()
+                segment_id, size = segment_id + 1, 0
+                f = open(os.path.join(wal_dir, f"{segment_id:08d}.seg"), "wb")
+            f.write(record)
+            size += len(record)
+    f.close()
+
+
+def recover_sequential(wal_dir: str) -> int:
+    manager = SessionManager(project_root="/workspace/project", wal_dir=wal_dir)
+    for session_id in manager.wal_log.sessions():
+        manager.recover_session(session_id)
+    return len(manager.sessions)
+
+
+async def recover_parallel(wal_dir: str, workers: int, processes: bool) -> int:
+    manager = SessionManager(project_root="/workspace/project", wal_dir=wal_dir)
+    executor = ProcessPoolExecutor(max_workers=workers) if processes else None
+    try:
+        return await manager.recover_all(max_workers=workers, executor=executor)
+    finally:
+        if executor:
+            executor.shutdown()
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    actions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 4)
+    session_ids = [f"session-{n:05d}" for n in range(sessions)]
+
+    with tempfile.TemporaryDirectory() as wal_dir:
+        write_segments(wal_dir, session_ids, actions)
+        runs = (
+            ("sequential", lambda: recover_sequential(wal_dir)),
+            (f"threads x{workers}", lambda: asyncio.run(recover_parallel(wal_dir, workers, False))),
+            (f"processes x{workers}", lambda: asyncio.run(recover_parallel(wal_dir, workers, True))),
+        )
+
+        print(f"{sessions:,} sessions x {actions} actions")
+        print(f"{'mode':<16} {'sessions':>10} {'cold start':>11} {'sessions/s':>12}")
+        for name, run in runs:
+            start = time.perf_counter()
+            count = run()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<16} {count:>10,} {elapsed:>10.2f}s {count / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: terminal:stream SSE latency and idle cost.
+
+Opens one ``terminal:stream`` response per idle ``cat`` session and drives
+the SSE generators directly (no HTTP), then measures
+- idle CPU: process CPU seconds per wall second while nothing is written
+- event latency: time from writing a line to one session until the SSE
+  event carrying its echo is yielded (median of ``probes``)
+for the push-driven stream and for the previous generator, which called
+``read_output`` (itself polling every 50ms) and slept another 50ms.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_stream.py [counts] [idle_seconds] [probes]
+    e.g. bench_stream.py 10,100 2 20
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+
+from terminal_adapter import main
+from terminal_adapter.domain.pty_executor import PTYExecutor
+
+
+async def legacy_stream(session_id: str):
+    """The previous generator: poll read_output, then sleep."""
+    while True:
+        session = main.state.pty_executor.sessions[session_id]
+        while not session.unread_bytes and PTYExecutor._is_session_active(session):
+            await asyncio.sleep(0.05)
+        output = session.read_text()
+        if output:
+            yield f"data: {output}\n\n"
+        if not PTYExecutor._is_session_active(session):
+            yield "event: complete\ndata: {}\n\n"
+            break
+        await asyncio.sleep(0.05)
+
+
+async def push_stream(session_id: str):
+    response = await main.terminal_stream(session_id, "skip", None)
+    async for event in response.body_iterator:
+        yield event
+
+
+async def run(stream, count: int, idle_seconds: float, probes: int):
+    executor = main.state.pty_executor = PTYExecutor(project_root=tempfile.gettempdir())
+    sessions = [await executor.start_session("cat", [], tempfile.gettempdir()) for _ in range(count)]
+    waiters = {}
+
+    async def consume(session_id):
+        async for event in stream(session_id):
+            waiter = waiters.get(session_id)
+            if waiter and not waiter.done() and "probe" in event:
+                waiter.set_result(time.perf_counter())
+
+    consumers = [asyncio.create_task(consume(s.session_id)) for s in sessions]
+    await asyncio.sleep(0.2)
+
+    cpu = time.process_time()
+    await asyncio.sleep(idle_seconds)
+    idle_cpu = (time.process_time() - cpu) / idle_seconds
+
+    latencies = []
+    loop = asyncio.get_running_loop()
+    for i in range(probes):
+        session = sessions[i % count]
+        waiters[session.session_id] = loop.create_future()
+        start = time.perf_counter()
+        await executor.write_input(session.session_id, f"probe {i}\n")
+        latencies.append(await asyncio.wait_for(waiters[session.session_id], 5) - start)
+
+    await executor.cleanup_all()
+    await asyncio.wait(consumers, timeout=5)
+    main.state.pty_executor = None
+    return idle_cpu, statistics.median(latencies)
+
+
+def main_() -> None:
+    counts = [int(n) for n in (sys.argv[1] if len(sys.argv) > 1 else "10,100").split(",")]
+    idle_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    probes = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    print(f"idle window {idle_seconds}s, {probes} latency probes, flush {main.STREAM_FLUSH_MS}ms")
+    print(f"{'stream':<12} {'streams':>8} {'idle CPU':>9} {'p50 latency':>12}")
+    for count in counts:
+        for name, stream in (("poll+sleep", legacy_stream), ("push", push_stream)):
+            idle_cpu, latency = asyncio.run(run(stream, count, idle_seconds, probes))
+            print(f"{name:<12} {count:>8} {idle_cpu:>8.1%} {latency * 1000:>10.2f}ms", flush=True)
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,96 @@
+"""
+Benchmark: Supervisor approval latency, client per request vs pooled client.
+
+Starts a local stub TGA server that approves every ActionRequest, then
+sends ``requests`` approvals with ``concurrency`` in flight, either
+through a fresh ``TGAClient`` per request (the previous behaviour of
+``terminal_execute``) or through one long-lived pooled client.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_tga_client.py [requests] [concurrency]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from terminal_adapter.domain import RiskLevel, TGAClient
+
+_BODY = json.dumps({"decision": "approved", "rationale": "stub"}).encode()
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: " + str(len(_BODY)).encode() + b"\r\n"
+    b"\r\n" + _BODY
+)
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Minimal keep-alive HTTP/1.1 server answering every request with approval."""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            writer.write(_RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def percentile(samples, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+
+async def run(url: str, requests: int, concurrency: int, pooled: bool):
+    shared = TGAClient(tga_url=url, max_connections=concurrency)
+    action_request = shared.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one() -> None:
+        async with limit:
+            start = time.perf_counter()
+            if pooled:
+                await shared.request_approval(action_request)
+            else:
+                async with TGAClient(tga_url=url) as tga:
+                    await tga.request_approval(action_request)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    pool = shared.metrics()["pool"]
+    await shared.close()
+    return latencies, elapsed, pool
+
+
+async def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    print(f"{requests:,} approvals, {concurrency} concurrent, stub TGA at {url}")
+    print(f"{'client':<12} {'p50':>9} {'p99':>9} {'req/s':>9} {'connections':>12}")
+    async with server:
+        for name, pooled in (("per request", False), ("pooled", True)):
+            latencies, elapsed, pool = await run(url, requests, concurrency, pooled)
+            connections = pool["connections_opened"] if pooled else requests
+            print(
+                f"{name:<12} {percentile(latencies, 0.50):>7.2f}ms {percentile(latencies, 0.99):>7.2f}ms "
+                f"{requests / elapsed:>9,.0f} {connections:>12,}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
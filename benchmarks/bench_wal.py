@@ -0,0 +1,70 @@
+"""
+Benchmark: WAL append throughput under concurrency.
+
+Compares one open/write/fsync per append (``WriteAheadLog.append`` on a
+log without a writer) with the group-commit writer used by
+``SessionManager.record_action``, for a growing number of concurrent
+sessions sharing one segmented log.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_wal.py [appends_per_session]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+
+from terminal_adapter.domain import (
+    GroupCommitWriter,
+    SegmentedLog,
+    TerminalAction,
+    WriteAheadLog,
+)
+
+CONCURRENCY = [1, 16, 128]
+
+
+async def run_sync(wal_dir: str, sessions: int, appends: int) -> float:
+    log = SegmentedLog(f"{wal_dir}/sync-{sessions}")
+    wals = [WriteAheadLog(f"sync-{i}", log) for i in range(sessions)]
+
+    async def worker(wal: WriteAheadLog) -> None:
+        for _ in range(appends):
+            wal.append(TerminalAction(session_id=wal.session_id, command="ls"))
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in wals))
+    return time.perf_counter() - start
+
+
+async def run_group(wal_dir: str, sessions: int, appends: int) -> float:
+    writer = GroupCommitWriter(commit_window_ms=2.0)
+    log = SegmentedLog(f"{wal_dir}/group-{sessions}", writer=writer)
+    wals = [WriteAheadLog(f"group-{i}", log) for i in range(sessions)]
+
+    async def worker(wal: WriteAheadLog) -> None:
+        for _ in range(appends):
+            await wal.append_async(TerminalAction(session_id=wal.session_id, command="ls"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in wals))
+    elapsed = time.perf_counter() - start
+    await writer.close()
+    return elapsed
+
+
+async def main() -> None:
+    appends = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as wal_dir:
+        print(f"{'sessions':>8} {'fsync/append':>16} {'group commit':>16}")
+        for sessions in CONCURRENCY:
+            total = sessions * appends
+            sync_s = await run_sync(wal_dir, sessions, appends)
+            group_s = await run_group(wal_dir, sessions, appends)
+            print(f"{sessions:>8} {total / sync_s:>12,.0f} /s {total / group_s:>12,.0f} /s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Benchmark: WAL recovery time, JSON lines vs binary segmented log.
+
+Writes the same actions in the previous per-session JSON-lines format and
+in the CRC-framed binary format of ``SegmentedLog``, then times a full
+recovery of every session from each.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_wal_recovery.py [records] [sessions]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from terminal_adapter.domain import RiskLevel, SegmentedLog, TerminalAction
+from terminal_adapter.domain.session_manager import pack_action, unpack_action
+from terminal_adapter.domain.wal import DEFAULT_SEGMENT_BYTES, RECORD_ENTRY, encode_record
+
+
+def make_action(session_id: str, i: int) -> TerminalAction:
+    return TerminalAction(
+        session_id=session_id,
+        command="git",
+        args=["log", "--oneline", f"-n{i % 50}"],
+        cwd="/workspace/project",
+        risk_level=RiskLevel.READ,
+        exit_code=0,
+        stdout_hash="9f86d081884c7d65",
+    )
+
+
+def write_json_lines(wal_dir: str, session_ids, per_session: int) -> None:
+    for session_id in session_ids:
+        with open(os.path.join(wal_dir, f"{session_id}.wal"), "w") as f:
+            for i in range(per_session):
+                action = make_action(session_id, i)
+                f.write(json.dumps({
+                    "sequence": i,
+                    "action_id": action.action_id,
+                    "session_id": session_id,
+                    "timestamp": action.timestamp.isoformat(),
+                    "command": action.command,
+                    "args": action.args,
+                    "cwd": action.cwd,
+                    "risk_level": action.risk_level.value,
+                }) + "\n")
+
+
+def recover_json_lines(wal_dir: str, session_id: str) -> list:
+    actions = []
+    with open(os.path.join(wal_dir, f"{session_id}.wal")) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            actions.append(TerminalAction(
+                action_id=data["action_id"],
+                session_id=data["session_id"],
+                timestamp=datetime.fromisoformat(data["timestamp"]),
+                command=data["command"],
+                args=data["args"],
+                cwd=data["cwd"],
+                risk_level=RiskLevel(data["risk_level"]),
+            ))
+    return actions
+
+
+def write_segments(wal_dir: str, session_ids, per_session: int) -> None:
+    segment_id, size = 0, 0
+    f = open(os.path.join(wal_dir, f"{segment_id:08d}.seg"), "wb")
+    for i in range(per_session):
+        for session_id in session_ids:
+            record = encode_record(RECORD_ENTRY, session_id, i, pack_action(make_action(session_id, i)))
+            if size + len(record) > DEFAULT_SEGMENT_BYTES:
+                f.close()
+                segment_id, size = segment_id + 1, 0
+                f = open(os.path.join(wal_dir, f"{segment_id:08d}.seg"), "wb")
+            f.write(record)
+            size += len(record)
+    f.close()
+
+
+def dir_bytes(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    per_session = records // sessions
+    session_ids = [f"session-{n:05d}" for n in range(sessions)]
+
+    with tempfile.TemporaryDirectory() as json_dir, tempfile.TemporaryDirectory() as seg_dir:
+        write_json_lines(json_dir, session_ids, per_session)
+        write_segments(seg_dir, session_ids, per_session)
+
+        start = time.perf_counter()
+        json_count = sum(len(recover_json_lines(json_dir, sid)) for sid in session_ids)
+        json_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        log = SegmentedLog(seg_dir)
+        seg_count = sum(
+            len([unpack_action(sid, payload) for _, payload in entries])
+            for sid, entries in log.iter_sessions()
+        )
+        seg_s = time.perf_counter() - start
+
+        print(f"{'format':<12} {'records':>10} {'MiB':>8} {'recovery':>10} {'records/s':>12}")
+        for name, count, path, elapsed in (
+            ("json lines", json_count, json_dir, json_s),
+            ("binary", seg_count, seg_dir, seg_s),
+        ):
+            print(
+                f"{name:<12} {count:>10,} {dir_bytes(path) / 2**20:>8.1f} "
+                f"{elapsed:>9.2f}s {count / elapsed:>12,.0f}"
+            )
+        print(f"(binary index scan: {log.metrics()['recovery_seconds']:.2f}s of {seg_s:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
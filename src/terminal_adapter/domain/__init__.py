@@ -3,6 +3,7 @@
 from .classifier import (
     RiskLevel,
     PolicyManifest,
+    ManifestIndex,
     CommandClassifier,
     ClassificationResult,
     TerminalAction,
@@ -11,44 +12,112 @@ from .classifier import (
     COMMAND_BLOCKLIST,
 )
 
+from .merkle import (
+    MerkleAccumulator,
+    MerkleTree,
+    verify_inclusion,
+    verify_consistency,
+)
+
 from .session_manager import (
     SessionManager,
     WriteAheadLog,
-    WALEntry,
+)
+
+from .wal import (
+    GroupCommitWriter,
+    SegmentedLog,
+)
+
+from .anchor_outbox import (
+    AnchorEvent,
+    AnchorOutbox,
+    CircuitBreaker,
+)
+
+from .audit_client import (
+    AuditClient,
+    AuditError,
 )
 
 from .tga_client import (
     TGAClient,
     ActionRequest,
+    ActionPlan,
     SupervisorResponse,
     SupervisorDecision,
+    ApprovalCache,
     TGAError,
 )
 
+from .approval_tracker import (
+    ApprovalTracker,
+    ApprovalTicket,
+    ApprovalBacklogError,
+    TicketStatus,
+)
+
+from .policy_watcher import (
+    ManifestWatcher,
+    load_policy,
+    build_classifier,
+)
+
+from .output_buffers import (
+    CappedOutput,
+    OutputRing,
+)
+
 from .pty_executor import (
     PTYExecutor,
     InteractiveSession,
     SessionState,
+    OutputSubscriber,
+    OutputChunk,
 )
 
 __all__ = [
     "RiskLevel",
     "PolicyManifest",
+    "ManifestIndex",
     "CommandClassifier",
     "ClassificationResult",
     "TerminalAction",
     "TerminalSession",
+    "MerkleAccumulator",
+    "MerkleTree",
+    "verify_inclusion",
+    "verify_consistency",
     "SessionManager",
     "WriteAheadLog",
-    "WALEntry",
+    "GroupCommitWriter",
+    "SegmentedLog",
+    "AnchorEvent",
+    "AnchorOutbox",
+    "CircuitBreaker",
+    "AuditClient",
+    "AuditError",
     "TGAClient",
     "ActionRequest",
+    "ActionPlan",
     "SupervisorResponse",
     "SupervisorDecision",
+    "ApprovalCache",
     "TGAError",
+    "ApprovalTracker",
+    "ApprovalTicket",
+    "ApprovalBacklogError",
+    "TicketStatus",
+    "ManifestWatcher",
+    "load_policy",
+    "build_classifier",
+    "CappedOutput",
+    "OutputRing",
     "PTYExecutor",
     "InteractiveSession",
     "SessionState",
+    "OutputSubscriber",
+    "OutputChunk",
     "COMMAND_RISK_MAP",
     "COMMAND_BLOCKLIST",
 ]
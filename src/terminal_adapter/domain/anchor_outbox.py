@@ -0,0 +1,410 @@
+"""
+Terminal MCP Adapter - Anchor Outbox
+
+Durable outbox for audit anchor events. Every Merkle root handed to the
+audit service is first written to a segmented log next to the WAL and only
+dropped once the service has accepted it, so each root is submitted
+at-least-once across failures and restarts. Event IDs are derived from the
+anchored state, so a retried submission is recognisably the same event.
+
+Failed submissions are retried with exponential backoff and jitter, and a
+circuit breaker stops all traffic to the audit service while it is down.
+"""
+
+import os
+import time
+import uuid
+import random
+import struct
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .wal import GroupCommitWriter, SegmentedLog
+
+logger = logging.getLogger("terminal-adapter.outbox")
+
+# Namespace for deterministic anchor event IDs
+ANCHOR_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "talos:terminal-adapter:anchor")
+
+# Outbox entry payload: action_count, through_sequence, created_at,
+# queued_at, then event_id and merkle_root joined by NUL
+_EVENT_HEADER = struct.Struct("<qqdd")
+
+
+def anchor_event_id(session_id: str, action_count: int, merkle_root: str) -> str:
+    """Stable event ID for anchoring a session at a given size and root."""
+    return str(uuid.uuid5(ANCHOR_NAMESPACE, f"{session_id}:{action_count}:{merkle_root}"))
+
+
+@dataclass
+class AnchorEvent:
+    """A session root waiting to be anchored, and its delivery state."""
+    session_id: str
+    merkle_root: str
+    action_count: int
+    through_sequence: int  # Last WAL sequence covered by the root
+    created_at: float = 0.0
+    event_id: str = ""
+    sequence: int = -1  # Position in the outbox log
+    attempts: int = 0
+    next_attempt: float = 0.0  # time.monotonic() deadline
+    queued_at: float = 0.0  # time.time() the event entered the outbox
+
+    def __post_init__(self):
+        if not self.created_at:
+            self.created_at = time.time()
+        if not self.event_id:
+            self.event_id = anchor_event_id(self.session_id, self.action_count, self.merkle_root)
+
+    @property
+    def ts(self) -> str:
+        """``created_at`` as an ISO-8601 UTC timestamp (stable across retries)."""
+        return datetime.fromtimestamp(self.created_at, timezone.utc).isoformat().replace("+00:00", "Z")
+
+    def pack(self) -> bytes:
+        """Encode as an outbox entry payload."""
+        header = _EVENT_HEADER.pack(self.action_count, self.through_sequence,
+                                    self.created_at, self.queued_at)
+        return header + f"{self.event_id}\0{self.merkle_root}".encode()
+
+    @classmethod
+    def unpack(cls, session_id: str, sequence: int, payload: bytes) -> "AnchorEvent":
+        """Decode a payload produced by ``pack``."""
+        action_count, through_sequence, created_at, queued_at = _EVENT_HEADER.unpack_from(payload)
+        event_id, merkle_root = payload[_EVENT_HEADER.size:].decode().split("\0")
+        return cls(session_id, merkle_root, action_count, through_sequence,
+                   created_at, event_id, sequence, queued_at=queued_at)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` failures in a row and rejects calls
+    for ``reset_timeout`` seconds. Then it lets a single probe through
+    (half-open): success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opens = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() >= self._opened_at + self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opens += 1
+                logger.warning(f"Audit circuit breaker open after {self.failures} consecutive failures")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+
+class AnchorOutbox:
+    """Durable, retrying queue of anchor events.
+
+    Events are kept in FIFO order per session and only a session's oldest
+    event is ever in flight, so roots reach the audit service (and
+    ``on_delivered``) in anchoring order. Delivered events are dropped from
+    the log with a checkpoint marker. Undelivered ones are reloaded on
+    startup and retried by ``start()``'s background loop.
+
+    ``send`` submits one event; ``send_batch``, if given, submits up to
+    ``batch_size`` events in one call. At most ``concurrency`` submissions
+    run at once, and none while the circuit breaker is open.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        send: Callable[[AnchorEvent], Awaitable[Any]],
+        send_batch: Optional[Callable[[List[AnchorEvent]], Awaitable[Any]]] = None,
+        on_delivered: Optional[Callable[[AnchorEvent], Awaitable[Any]]] = None,
+        writer: Optional[GroupCommitWriter] = None,
+        concurrency: int = 8,
+        batch_size: int = 100,
+        base_backoff: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.log = SegmentedLog(directory, writer=writer)
+        self.send = send
+        self.send_batch = send_batch
+        self.on_delivered = on_delivered
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.base_backoff = (
+            base_backoff if base_backoff is not None
+            else float(os.getenv("TALOS_ANCHOR_RETRY_BASE_SECONDS", "1"))
+        )
+        self.max_backoff = (
+            max_backoff if max_backoff is not None
+            else float(os.getenv("TALOS_ANCHOR_RETRY_MAX_SECONDS", "300"))
+        )
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=int(os.getenv("TALOS_AUDIT_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("TALOS_AUDIT_BREAKER_RESET_SECONDS", "30")),
+        )
+        self._pending: Dict[str, List[AnchorEvent]] = {}
+        self._in_flight: Set[str] = set()
+        self._loaded = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed_attempts = 0
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """Reload undelivered events from disk (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        recovered = 0
+        for session_id, entries in self.log.iter_sessions():
+            queue = self._pending.setdefault(session_id, [])
+            for sequence, payload in entries:
+                try:
+                    queue.append(AnchorEvent.unpack(session_id, sequence, payload))
+                    recovered += 1
+                except (struct.error, ValueError) as e:
+                    logger.warning(f"Skipping undecodable outbox entry {sequence} for {session_id}: {e}")
+            if not queue:
+                del self._pending[session_id]
+        if recovered:
+            logger.info(f"Recovered {recovered} undelivered anchor events")
+
+    def pending_tail(self, session_id: str) -> Optional[AnchorEvent]:
+        """A session's newest undelivered event, if any."""
+        self.load()
+        queue = self._pending.get(session_id)
+        return queue[-1] if queue else None
+
+    def enqueue(self, event: AnchorEvent) -> Tuple[AnchorEvent, Optional[asyncio.Future]]:
+        """Add an event to its session's queue.
+
+        Returns the queued event (an identical pending one if the event ID
+        is already queued) and a future for the entry's durability, or
+        None if there is nothing to wait for.
+        """
+        self.load()
+        queue = self._pending.setdefault(event.session_id, [])
+        for queued in queue:
+            if queued.event_id == event.event_id:
+                return queued, None
+        event.sequence = self.log.high_sequence(event.session_id) + 1
+        event.queued_at = time.time()
+        future = self.log.append(event.session_id, event.sequence, event.pack())
+        queue.append(event)
+        self.enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return event, future
+
+    async def put(self, event: AnchorEvent) -> AnchorEvent:
+        """Enqueue an event and wait until it is durable."""
+        event, future = self.enqueue(event)
+        if future is not None:
+            await future
+        return event
+
+    def due(self) -> List[AnchorEvent]:
+        """Each session's oldest event, if idle and past its backoff."""
+        now = time.monotonic()
+        return [
+            queue[0] for session_id, queue in self._pending.items()
+            if queue and session_id not in self._in_flight and queue[0].next_attempt <= now
+        ]
+
+    def _backoff(self, attempts: int) -> float:
+        # Exponential backoff with "equal jitter": half fixed, half random
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    async def deliver(self, events: Sequence[AnchorEvent]) -> int:
+        """Submit those of ``events`` that are at the head of their queue.
+
+        Returns:
+            Number of events delivered
+        """
+        events = [
+            e for e in events
+            if e.session_id not in self._in_flight and self._pending.get(e.session_id, [None])[0] is e
+        ]
+        if not events:
+            return 0
+        for event in events:
+            self._in_flight.add(event.session_id)
+
+        if self.send_batch is not None:
+            size = self.batch_size
+            chunks = [events[i:i + size] for i in range(0, len(events), size)]
+        else:
+            chunks = [[event] for event in events]
+
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(chunk: List[AnchorEvent]) -> int:
+            async with limit:
+                return await self._submit(chunk)
+
+        try:
+            return sum(await asyncio.gather(*(_bounded(chunk) for chunk in chunks)))
+        finally:
+            for event in events:
+                self._in_flight.discard(event.session_id)
+
+    async def _submit(self, chunk: List[AnchorEvent]) -> int:
+        if not self.breaker.allow():
+            return 0
+        try:
+            if self.send_batch is not None:
+                await self.send_batch(chunk)
+            else:
+                await self.send(chunk[0])
+        except Exception as e:
+            self.breaker.record_failure()
+            self.failed_attempts += 1
+            now = time.monotonic()
+            for event in chunk:
+                event.attempts += 1
+                event.next_attempt = now + self._backoff(event.attempts)
+            logger.error(
+                f"Anchor submission failed for {len(chunk)} sessions "
+                f"(attempt {chunk[0].attempts}): {e}"
+            )
+            return 0
+
+        self.breaker.record_success()
+        for event in chunk:
+            await self._complete(event)
+        return len(chunk)
+
+    async def _complete(self, event: AnchorEvent) -> None:
+        if self.on_delivered is not None:
+            try:
+                await self.on_delivered(event)
+            except Exception as e:
+                logger.error(f"Post-anchor bookkeeping failed for {event.session_id}: {e}")
+        queue = self._pending.get(event.session_id)
+        if queue and queue[0] is event:
+            queue.pop(0)
+            if not queue:
+                del self._pending[event.session_id]
+        self.delivered += 1
+        future = self.log.checkpoint(event.session_id, event.sequence)
+        if future is not None:
+            await future
+
+    async def flush(self) -> int:
+        """Deliver every event that is currently due."""
+        self.load()
+        return await self.deliver(self.due())
+
+    # ------------------------------------------------------------------
+    # Background retries
+    # ------------------------------------------------------------------
+
+    def _next_wakeup(self) -> float:
+        heads = [q[0].next_attempt for q in self._pending.values() if q]
+        if not heads:
+            return 60.0
+        delay = max(0.0, min(heads) - time.monotonic(), self.breaker.retry_after())
+        return min(max(delay, 0.01), 60.0)
+
+    async def start(self) -> None:
+        """Load undelivered events and start the retry loop."""
+        await asyncio.to_thread(self.load)
+        self._wakeup = asyncio.Event()
+
+        async def _retry_loop():
+            while True:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_wakeup())
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.error(f"Anchor retry pass failed: {e}")
+
+        self._task = asyncio.create_task(_retry_loop())
+
+    async def stop(self) -> None:
+        """Stop the retry loop. Undelivered events stay on disk."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue depth, retry age and delivery counters.
+
+        ``oldest_age_seconds`` is how long the oldest undelivered event has
+        been queued (not the age of the state it anchors).
+        """
+        events = [e for queue in self._pending.values() for e in queue]
+        oldest = min((e.queued_at for e in events), default=None)
+        return {
+            "depth": len(events),
+            "sessions": len(self._pending),
+            "in_flight": len(self._in_flight),
+            "oldest_age_seconds": time.time() - oldest if oldest is not None else 0.0,
+            "max_attempts": max((e.attempts for e in events), default=0),
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "failed_attempts": self.failed_attempts,
+            "breaker": self.breaker.state,
+            "breaker_opens": self.breaker.opens,
+        }
@@ -0,0 +1,362 @@
+"""
+Terminal MCP Adapter - Approval Tracker
+
+Asynchronous Supervisor approval. Instead of holding a request open while
+the Supervisor (or a human behind it) decides, ``terminal:execute`` can
+hand back a pending ticket. The tracker follows the decision in the
+background, by polling TGA with backoff or by accepting a signed decision
+callback, runs the command once it is approved and keeps the outcome for
+clients to collect.
+
+Tickets live in memory only: pending approvals do not survive a restart.
+"""
+
+import os
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from .classifier import RiskLevel
+from .tga_client import ActionRequest, SupervisorDecision, SupervisorResponse, TGAClient, TGAError
+
+logger = logging.getLogger("terminal-adapter.approvals")
+
+
+class TicketStatus(str, Enum):
+    """Lifecycle of an asynchronously approved command."""
+    PENDING = "pending"      # Waiting for the Supervisor
+    RUNNING = "running"      # Approved, command executing
+    COMPLETED = "completed"  # Command ran; result available
+    REJECTED = "rejected"    # Supervisor said no
+    FAILED = "failed"        # TGA error, approval deadline, or execution error
+
+
+_FINAL = {TicketStatus.COMPLETED, TicketStatus.REJECTED, TicketStatus.FAILED}
+
+
+class ApprovalBacklogError(Exception):
+    """Too many approvals are pending to accept another ticket."""
+    pass
+
+
+@dataclass
+class ApprovalTicket:
+    """A command waiting on (or done with) asynchronous approval."""
+    ticket_id: str
+    action_request_id: str
+    session_id: str
+    risk_level: RiskLevel
+    status: TicketStatus = TicketStatus.PENDING
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    rationale: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    polls: int = 0
+    # Set (and replaced) on every status change
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in _FINAL
+
+    def update(self, status: TicketStatus, **changes: Any) -> None:
+        """Move to ``status`` and wake everyone waiting on this ticket."""
+        self.status = status
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self.updated_at = time.time()
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dict."""
+        return {
+            "ticket_id": self.ticket_id,
+            "action_request_id": self.action_request_id,
+            "session_id": self.session_id,
+            "risk_level": self.risk_level.value,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "rationale": self.rationale,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class ApprovalTracker:
+    """Follows Supervisor decisions for pending tickets and runs approved commands.
+
+    Each ticket first submits its ActionRequest as usual. If that returns
+    ESCALATE (202) or times out, the decision is polled from
+    ``GET /action-requests/{id}`` with exponential backoff and jitter until
+    ``deadline_seconds``; a verified decision callback (``resolve``) cuts
+    the wait short. A ticket fails after ``max_poll_errors`` consecutive
+    TGA errors (e.g. TGA does not know the request) instead of polling on
+    until the deadline. Finished tickets are kept for ``retention_seconds``.
+    
+    Submissions bypass the TGA client's single-flight coalescing: every
+    ticket is followed under its own ``action_request_id``, so TGA must
+    have seen that id.
+    """
+
+    def __init__(
+        self,
+        tga_client: TGAClient,
+        poll_base_seconds: Optional[float] = None,
+        poll_max_seconds: Optional[float] = None,
+        deadline_seconds: Optional[float] = None,
+        retention_seconds: Optional[float] = None,
+        max_tickets: Optional[int] = None,
+        max_poll_errors: Optional[int] = None,
+    ):
+        self.tga_client = tga_client
+        self.poll_base = poll_base_seconds if poll_base_seconds is not None else float(
+            os.getenv("TALOS_APPROVAL_POLL_BASE_SECONDS", "1")
+        )
+        self.poll_max = poll_max_seconds if poll_max_seconds is not None else float(
+            os.getenv("TALOS_APPROVAL_POLL_MAX_SECONDS", "30")
+        )
+        self.deadline = deadline_seconds if deadline_seconds is not None else float(
+            os.getenv("TALOS_APPROVAL_DEADLINE_SECONDS", "3600")
+        )
+        self.retention = retention_seconds if retention_seconds is not None else float(
+            os.getenv("TALOS_APPROVAL_TICKET_RETENTION_SECONDS", "900")
+        )
+        self.max_tickets = max_tickets or int(os.getenv("TALOS_APPROVAL_MAX_TICKETS", "10000"))
+        # Consecutive TGA errors while polling before a ticket fails
+        self.max_poll_errors = max_poll_errors or int(
+            os.getenv("TALOS_APPROVAL_MAX_POLL_ERRORS", "5")
+        )
+
+        self.tickets: "OrderedDict[str, ApprovalTicket]" = OrderedDict()
+        # action_request_id -> decision delivered by callback
+        self._decisions: Dict[str, "asyncio.Future[SupervisorResponse]"] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.submitted = 0
+        self.polls = 0
+        self.callbacks = 0
+        self.outcomes: Dict[str, int] = {s.value: 0 for s in _FINAL}
+
+    def submit(
+        self,
+        action_request: ActionRequest,
+        session_id: str,
+        run: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> ApprovalTicket:
+        """Open a ticket and start following its approval.
+
+        ``run`` executes the command once approved and returns the result
+        stored on the ticket.
+
+        Raises:
+            ApprovalBacklogError: If ``max_tickets`` are already pending
+        """
+        self._prune()
+        if len(self.tickets) >= self.max_tickets:
+            raise ApprovalBacklogError(f"{len(self.tickets)} approval tickets outstanding")
+
+        ticket = ApprovalTicket(
+            ticket_id=str(uuid.uuid4()),
+            action_request_id=action_request.action_request_id,
+            session_id=session_id,
+            risk_level=action_request.risk_level,
+        )
+        self.tickets[ticket.ticket_id] = ticket
+        self._decisions[ticket.action_request_id] = asyncio.get_running_loop().create_future()
+        self.submitted += 1
+
+        task = asyncio.create_task(self._track(ticket, action_request, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return ticket
+
+    def get(self, ticket_id: str) -> Optional[ApprovalTicket]:
+        return self.tickets.get(ticket_id)
+
+    def resolve(self, response: SupervisorResponse) -> bool:
+        """Deliver a (verified) Supervisor decision for a pending ticket.
+
+        Returns False if no ticket is waiting on that action request.
+        ESCALATE is ignored: the ticket keeps waiting.
+        """
+        future = self._decisions.get(response.action_request_id)
+        if future is None or future.done():
+            return False
+        if response.decision != SupervisorDecision.ESCALATE:
+            future.set_result(response)
+            self.callbacks += 1
+        return True
+
+    async def wait(self, ticket_id: str, timeout: float) -> Optional[ApprovalTicket]:
+        """Wait up to ``timeout`` seconds for a ticket to finish."""
+        ticket = self.tickets.get(ticket_id)
+        deadline = time.monotonic() + timeout
+        while ticket is not None and not ticket.done:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(ticket._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return ticket
+
+    async def updates(self, ticket_id: str) -> AsyncIterator[ApprovalTicket]:
+        """Yield the ticket now and after every status change until it finishes."""
+        ticket = self.tickets.get(ticket_id)
+        while ticket is not None:
+            changed = ticket._changed
+            yield ticket
+            if ticket.done:
+                return
+            await changed.wait()
+
+    async def close(self) -> None:
+        """Stop following approvals. Pending tickets are abandoned."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for future in self._decisions.values():
+            future.cancel()
+        self._decisions.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return ticket counts by status and approval-tracking counters."""
+        by_status = {s.value: 0 for s in TicketStatus}
+        for ticket in self.tickets.values():
+            by_status[ticket.status.value] += 1
+        return {
+            "tickets": by_status,
+            "submitted": self.submitted,
+            "polls": self.polls,
+            "callbacks": self.callbacks,
+            "outcomes": dict(self.outcomes),
+        }
+
+    # ------------------------------------------------------------------
+    # Tracking
+    # ------------------------------------------------------------------
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention
+        for ticket_id in [
+            t.ticket_id for t in self.tickets.values() if t.done and t.updated_at < cutoff
+        ]:
+            del self.tickets[ticket_id]
+        # Over capacity: drop the oldest finished tickets early
+        excess = len(self.tickets) - self.max_tickets + 1
+        if excess > 0:
+            for ticket_id in [t.ticket_id for t in self.tickets.values() if t.done][:excess]:
+                del self.tickets[ticket_id]
+
+    def _backoff(self, attempt: int) -> float:
+        # Exponential backoff with "equal jitter": half fixed, half random
+        delay = min(self.poll_max, self.poll_base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _finish(self, ticket: ApprovalTicket, status: TicketStatus, **changes: Any) -> None:
+        ticket.update(status, **changes)
+        self.outcomes[status.value] += 1
+
+    async def _track(
+        self,
+        ticket: ApprovalTicket,
+        action_request: ActionRequest,
+        run: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> None:
+        try:
+            response = await self._await_decision(ticket, action_request)
+        except TimeoutError:
+            self._finish(ticket, TicketStatus.FAILED, error="Supervisor approval timed out")
+            return
+        except TGAError as e:
+            self._finish(ticket, TicketStatus.FAILED, error=f"TGA error: {e}")
+            return
+        except Exception as e:
+            logger.error(f"Tracking approval for ticket {ticket.ticket_id} failed: {e}")
+            self._finish(ticket, TicketStatus.FAILED, error=str(e) or type(e).__name__)
+            return
+        finally:
+            self._decisions.pop(ticket.action_request_id, None)
+
+        if response.decision != SupervisorDecision.APPROVED:
+            self._finish(ticket, TicketStatus.REJECTED, rationale=response.rationale)
+            return
+
+        logger.info(f"Supervisor approved {ticket.risk_level.value} ticket {ticket.ticket_id}")
+        ticket.update(TicketStatus.RUNNING, rationale=response.rationale)
+        try:
+            result = await run()
+        except Exception as e:
+            logger.error(f"Approved command for ticket {ticket.ticket_id} failed: {e}")
+            self._finish(ticket, TicketStatus.FAILED, error=str(e) or type(e).__name__)
+            return
+        self._finish(ticket, TicketStatus.COMPLETED, result=result)
+
+    async def _await_decision(
+        self,
+        ticket: ApprovalTicket,
+        action_request: ActionRequest,
+    ) -> SupervisorResponse:
+        callback = self._decisions[ticket.action_request_id]
+        deadline = time.monotonic() + self.deadline
+
+        # Submit as usual; a callback may still overtake the answer
+        submit = asyncio.create_task(
+            self.tga_client.request_approval(action_request, coalesce=False)
+        )
+        await asyncio.wait({submit, callback}, return_when=asyncio.FIRST_COMPLETED)
+        if callback.done():
+            submit.cancel()
+            return callback.result()
+        try:
+            response = submit.result()
+        except TimeoutError:
+            response = None  # Still deciding; keep polling
+        if response is not None and response.decision != SupervisorDecision.ESCALATE:
+            return response
+
+        attempt = 0
+        errors = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Supervisor approval timed out")
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(callback), min(self._backoff(attempt), remaining)
+                )
+            except asyncio.TimeoutError:
+                pass
+            attempt += 1
+
+            try:
+                response = await self.tga_client.get_decision(action_request.action_request_id)
+            except TimeoutError as e:
+                logger.warning(f"Polling decision for ticket {ticket.ticket_id} failed: {e}")
+                continue
+            except TGAError as e:
+                errors += 1
+                logger.warning(
+                    f"Polling decision for ticket {ticket.ticket_id} failed "
+                    f"({errors}/{self.max_poll_errors}): {e}"
+                )
+                if errors >= self.max_poll_errors:
+                    raise
+                continue
+            finally:
+                ticket.polls += 1
+                self.polls += 1
+            errors = 0
+            if response.decision != SupervisorDecision.ESCALATE:
+                return response
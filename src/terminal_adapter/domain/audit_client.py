@@ -0,0 +1,172 @@
+"""
+Terminal MCP Adapter - Audit Client
+
+Long-lived, pooled client for anchoring session Merkle roots to the Talos
+Audit Service. One connection pool is shared by every anchor for the
+lifetime of the adapter, and many sessions' roots can be submitted in a
+single request when the audit service accepts batches.
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence
+
+import httpx
+
+from .anchor_outbox import AnchorEvent
+from .http_pool import PooledHTTPClient
+
+logger = logging.getLogger("terminal-adapter.audit")
+
+
+class AuditError(Exception):
+    """Error submitting events to the audit service."""
+    pass
+
+
+class AuditClient:
+    """Pooled client that anchors Merkle roots as audit events.
+
+    ``anchor_batch`` posts many roots to ``/events/batch`` in one request.
+    If the service answers 404, 405 or 501 there, batching is switched off
+    for the client's lifetime and roots are posted to ``/events``
+    individually, still over the shared pool.
+    """
+
+    # Responses that mean "this service has no batch endpoint"
+    _NO_BATCH = {404, 405, 501}
+
+    def __init__(
+        self,
+        audit_url: Optional[str] = None,
+        timeout_seconds: float = 10.0,
+        max_connections: int = 16,
+        batch: Optional[bool] = None,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.audit_url = audit_url or os.getenv("TALOS_AUDIT_URL", "http://localhost:8002")
+        # None = not yet known; probed on the first batch
+        self.batch_supported = batch
+        self._client = PooledHTTPClient(
+            timeout_seconds, max_connections, http2=http2, transport=transport
+        )
+
+        # Metrics
+        self.requests = 0
+        self.events = 0
+        self.batches = 0
+        self.failures = 0
+
+    @staticmethod
+    def build_event(
+        session_id: str,
+        merkle_root: str,
+        event_id: Optional[str] = None,
+        ts: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build an audit event anchoring ``merkle_root`` for a session.
+
+        Pass the ``event_id`` and ``ts`` of a queued anchor so retries
+        produce the same event (and event hash); fresh ones are generated
+        otherwise.
+        """
+        # Payload matches the audit service's Event model
+        event_data = {
+            "schema_id": "talos.audit_event",
+            "schema_version": "v1",
+            "event_id": event_id or str(uuid.uuid4()),
+            "ts": ts or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "request_id": session_id,
+            "surface_id": "terminal-adapter",
+            "outcome": "success",
+            "principal": {"id": "terminal-adapter"},
+            "http": {},
+            "meta": {"session_id": session_id},
+            "hashes": {"merkle_root": merkle_root},
+        }
+
+        # Compute event_hash (matching Event.__str__ hashing)
+        # Exclude event_hash itself and hashes
+        hash_data = {k: v for k, v in event_data.items() if k not in ["event_hash", "hashes"]}
+        canonical = json.dumps(hash_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        event_data["event_hash"] = hashlib.sha256(canonical.encode()).hexdigest()
+        return event_data
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> httpx.Response:
+        self.requests += 1
+        try:
+            return await self._client.post(f"{self.audit_url}{path}", json=payload)
+        except httpx.HTTPError as e:
+            self.failures += 1
+            raise AuditError(f"Failed to reach audit service: {e}") from e
+
+    def _check(self, response: httpx.Response, what: str) -> None:
+        if response.status_code not in (200, 201):
+            self.failures += 1
+            raise AuditError(f"Audit service rejected {what}: {response.status_code} {response.text}")
+
+    async def anchor(
+        self,
+        session_id: str,
+        merkle_root: str,
+        event_id: Optional[str] = None,
+        ts: Optional[str] = None,
+    ) -> None:
+        """Anchor one session's root. Raises AuditError on failure."""
+        response = await self._post("/events", self.build_event(session_id, merkle_root, event_id, ts))
+        self._check(response, f"anchor for {session_id}")
+        self.events += 1
+        logger.info(f"Successfully anchored {session_id}: {merkle_root[:16]}")
+
+    async def anchor_batch(self, roots: Sequence[AnchorEvent]) -> None:
+        """Anchor queued roots, in one request if possible.
+
+        All-or-nothing when batched; when falling back to individual
+        posts, raises AuditError if any of them failed.
+        """
+        if not roots:
+            return
+        if self.batch_supported is not False:
+            events = [
+                self.build_event(e.session_id, e.merkle_root, e.event_id, e.ts) for e in roots
+            ]
+            response = await self._post("/events/batch", {"events": events})
+            if response.status_code in self._NO_BATCH and self.batch_supported is None:
+                logger.info("Audit service has no batch endpoint; anchoring sessions individually")
+                self.batch_supported = False
+            else:
+                self._check(response, f"batch of {len(roots)} anchors")
+                self.batch_supported = True
+                self.batches += 1
+                self.events += len(roots)
+                logger.info(f"Successfully anchored {len(roots)} sessions in one batch")
+                return
+
+        results = await asyncio.gather(
+            *(self.anchor(e.session_id, e.merkle_root, e.event_id, e.ts) for e in roots),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise AuditError(f"{len(errors)} of {len(roots)} anchors failed: {errors[0]}")
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        await self._client.aclose()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return request counters."""
+        return {
+            "requests": self.requests,
+            "events": self.events,
+            "batches": self.batches,
+            "failures": self.failures,
+            "batch_supported": self.batch_supported,
+            "pool": self._client.metrics(),
+        }
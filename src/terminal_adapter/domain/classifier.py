@@ -6,16 +6,18 @@ risk level assessment, and policy enforcement per the Terminal MCP Adapter spec.
 """
 
 import re
+from collections import OrderedDict
 import hashlib
 import json
 from enum import Enum
-from typing import List, Dict, Optional
+from typing import Any, FrozenSet, Iterable, List, Dict, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import uuid
 
 
 from .crypto import verify_json_signature
+from .merkle import MerkleAccumulator, MerkleTree
 
 
 class RiskLevel(str, Enum):
@@ -33,6 +35,20 @@ class PolicyManifest:
     write_commands: List[str]
     blocked_patterns: List[str]
     signature: str
+    index: "ManifestIndex" = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.compile()
+    
+    def compile(self) -> "ManifestIndex":
+        """(Re)build the lookup index from the manifest lists.
+        
+        Called on construction; the manifest is treated as immutable
+        afterwards, so call this again after mutating any of the lists.
+        Raises ``re.error`` if a blocked pattern is not a valid regex.
+        """
+        self.index = ManifestIndex(self.safe_commands, self.write_commands, self.blocked_patterns)
+        return self.index
     
     @classmethod
     def load(cls, path: str) -> "PolicyManifest":
@@ -108,17 +124,171 @@ COMMAND_BLOCKLIST: List[str] = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True)
 class ClassificationResult:
-    """Result of command classification."""
+    """Result of command classification.
+
+    Immutable so a single instance can be shared by every cache hit.
+    """
     command: str
-    args: List[str]
+    args: Tuple[str, ...]
     risk_level: RiskLevel
     is_blocked: bool
     block_reason: Optional[str] = None
     matched_pattern: Optional[str] = None
 
 
+# Numbered or named backreferences; group numbers shift once patterns are
+# merged. Escaped backslashes (``\\1``) also match, which only costs the
+# merged fast path.
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _is_start_anchored(pattern: str) -> bool:
+    """Return True if every branch of ``pattern`` is anchored at ``^``.
+
+    Only patterns that start with ``^`` and have no top-level alternation
+    qualify; anything else is conservatively treated as unanchored.
+    """
+    if not pattern.startswith("^"):
+        return False
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if in_class:
+            if ch == "]":
+                in_class = False
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return False
+        i += 1
+    return True
+
+
+class CompiledPatternSet:
+    """Ordered regex patterns compiled into a single alternation.
+
+    Each pattern keeps its ``re.search`` semantics and, when several
+    patterns match, the one listed first wins. One ``re.match`` call
+    therefore replaces a loop of per-pattern searches while preserving
+    tier precedence and the reported ``matched_pattern``.
+
+    Patterns that cannot share one expression (inline global flags such
+    as ``(?i)``, backreferences, duplicate group names) make the set fall
+    back to searching each pattern on its own, in the same order.
+    """
+
+    def __init__(self, groups: Sequence[Tuple[Any, Sequence[str]]]):
+        self._labels: Dict[str, Tuple[Any, str]] = {}
+        self._searches: Optional[List[Tuple[re.Pattern, Tuple[Any, str]]]] = None
+        alternatives = []
+        for label, patterns in groups:
+            for pattern in patterns:
+                name = f"p{len(self._labels)}"
+                self._labels[name] = (label, pattern)
+                # Anchored patterns only ever match at position 0; the rest
+                # get a lazy DOTALL prefix so matching at 0 emulates search.
+                if _is_start_anchored(pattern):
+                    alternatives.append(f"(?P<{name}>{pattern})")
+                else:
+                    alternatives.append(f"(?P<{name}>(?s:.*?)(?:{pattern}))")
+        self._regex = None
+        if not alternatives:
+            return
+        if not any(_BACKREFERENCE.search(pattern) for _, pattern in self._labels.values()):
+            try:
+                self._regex = re.compile("|".join(alternatives))
+                return
+            except re.error:
+                pass
+        # Invalid patterns still raise re.error here
+        self._searches = [(re.compile(pattern), (label, pattern)) for label, pattern in self._labels.values()]
+
+    @property
+    def merged(self) -> bool:
+        """Whether the patterns are matched as one alternation."""
+        return self._regex is not None
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def first_match(self, text: str) -> Optional[Tuple[Any, str]]:
+        """Return ``(label, pattern)`` of the first matching pattern, if any."""
+        if self._searches is not None:
+            for regex, hit in self._searches:
+                if regex.search(text):
+                    return hit
+            return None
+        if self._regex is None:
+            return None
+        match = self._regex.match(text)
+        if match is None:
+            return None
+        return self._labels[match.lastgroup]
+
+
+class ManifestIndex:
+    """Precompiled lookup structures for a PolicyManifest.
+    
+    Entries are tokenized on whitespace and keyed by their token tuple, so
+    ``"git"`` indexes ``("git",)`` and ``"git status"`` indexes
+    ``("git", "status")``. A lookup probes at most ``depth`` prefixes of the
+    command line, which keeps it O(1) in the number of manifest entries.
+    The most specific entry wins; for identical entries safe_commands
+    beats write_commands, as the original list checks did.
+    """
+    
+    def __init__(
+        self,
+        safe_commands: Iterable[str],
+        write_commands: Iterable[str],
+        blocked_patterns: Iterable[str],
+    ):
+        self.safe_commands: FrozenSet[str] = frozenset(safe_commands)
+        self.write_commands: FrozenSet[str] = frozenset(write_commands)
+        self.blocked = CompiledPatternSet([(None, list(blocked_patterns))])
+        
+        self._entries: Dict[Tuple[str, ...], Tuple[RiskLevel, str]] = {}
+        for level, entries in (
+            (RiskLevel.WRITE, self.write_commands),
+            (RiskLevel.READ, self.safe_commands),  # Inserted last so it wins ties
+        ):
+            for entry in entries:
+                tokens = tuple(entry.split())
+                if tokens:
+                    self._entries[tokens] = (level, entry)
+        self.depth = max(map(len, self._entries), default=0)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def lookup(self, command: str, args: Sequence[str]) -> Optional[Tuple[RiskLevel, str]]:
+        """Return ``(risk_level, entry)`` for the most specific matching entry."""
+        if not self.depth:
+            return None
+        tokens = (command, *args[: self.depth - 1])
+        for n in range(len(tokens), 0, -1):
+            hit = self._entries.get(tokens[:n])
+            if hit is not None:
+                return hit
+        return None
+    
+    def blocked_match(self, full_command: str) -> Optional[str]:
+        """Return the first blocked pattern matching ``full_command``, if any."""
+        match = self.blocked.first_match(full_command)
+        return match[1] if match is not None else None
+
+
 class CommandClassifier:
     """Classifies terminal commands by risk level.
     
@@ -128,15 +298,81 @@ class CommandClassifier:
     3. Blocklist for always-denied commands
     """
     
-    def __init__(self, manifest: Optional[PolicyManifest] = None, paranoid_mode: bool = False):
-        self.manifest = manifest
-        self.paranoid_mode = paranoid_mode
+    DEFAULT_CACHE_SIZE = 4096
+    
+    # Commands longer than this are classified but never cached, so a few
+    # oversized requests cannot pin large strings in the LRU.
+    MAX_CACHED_COMMAND_LENGTH = 1024
+    
+    def __init__(
+        self,
+        manifest: Optional[PolicyManifest] = None,
+        paranoid_mode: bool = False,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self._manifest = manifest
+        self._paranoid_mode = paranoid_mode
+        
+        # Policy generation: bumped whenever the manifest or paranoid mode
+        # changes, which invalidates every cached classification.
+        self._generation = 0
+        
+        # Bounded LRU of (command, args) -> (generation, result)
+        self.cache_size = max(0, cache_size)
+        self._cache: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[int, ClassificationResult]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
         
-        # Compile regex patterns for performance
-        self._blocklist_patterns = [re.compile(p) for p in COMMAND_BLOCKLIST]
-        self._read_patterns = [re.compile(p) for p in COMMAND_RISK_MAP["read"]]
-        self._write_patterns = [re.compile(p) for p in COMMAND_RISK_MAP["write"]]
-        self._high_risk_patterns = [re.compile(p) for p in COMMAND_RISK_MAP["high_risk"]]
+        # Every tier is compiled into one alternation, ordered by precedence:
+        # blocklist, then HIGH_RISK, READ and WRITE. HIGH_RISK comes before
+        # READ/WRITE so shell redirection and similar constructs cannot be
+        # misclassified by a benign binary prefix.
+        self._patterns = CompiledPatternSet([
+            (None, COMMAND_BLOCKLIST),
+            (RiskLevel.HIGH_RISK, COMMAND_RISK_MAP["high_risk"]),
+            (RiskLevel.READ, COMMAND_RISK_MAP["read"]),
+            (RiskLevel.WRITE, COMMAND_RISK_MAP["write"]),
+        ])
+    
+    @property
+    def manifest(self) -> Optional[PolicyManifest]:
+        return self._manifest
+    
+    @manifest.setter
+    def manifest(self, manifest: Optional[PolicyManifest]) -> None:
+        self._manifest = manifest
+        self._generation += 1
+    
+    @property
+    def paranoid_mode(self) -> bool:
+        return self._paranoid_mode
+    
+    @paranoid_mode.setter
+    def paranoid_mode(self, enabled: bool) -> None:
+        if enabled != self._paranoid_mode:
+            self._paranoid_mode = enabled
+            self._generation += 1
+    
+    @property
+    def generation(self) -> int:
+        """Current policy generation used to validate cache entries."""
+        return self._generation
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Return classification cache counters."""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "evictions": self.cache_evictions,
+            "size": len(self._cache),
+            "capacity": self.cache_size,
+            "generation": self._generation,
+        }
+    
+    def clear_cache(self) -> None:
+        """Drop all cached classifications (counters are kept)."""
+        self._cache.clear()
     
     def classify(self, command: str, args: List[str]) -> ClassificationResult:
         """Classify a command and its arguments.
@@ -146,22 +382,73 @@ class CommandClassifier:
             args: Command arguments as a list
             
         Returns:
-            ClassificationResult with risk level and block status
+            ClassificationResult with risk level and block status.
+            Results are memoized per policy generation, so repeated calls
+            return the same shared instance.
+        """
+        key = (command, tuple(args))
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == self._generation:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry[1]
+        
+        self.cache_misses += 1
+        result = self._classify(command, key[1])
+        
+        if self.cache_size and len(command) + sum(map(len, key[1])) <= self.MAX_CACHED_COMMAND_LENGTH:
+            self._cache[key] = (self._generation, result)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.cache_evictions += 1
+        
+        return result
+    
+    def classify_many(
+        self,
+        commands: Sequence[Tuple[str, Sequence[str]]],
+    ) -> List[ClassificationResult]:
+        """Classify a batch of commands without executing anything.
+        
+        Each distinct (command, args) pair in the batch is matched once
+        against the compiled tiers; repeats within the batch, and pairs
+        already in the LRU, reuse the shared result.
+        
+        Args:
+            commands: Sequence of (command, args) pairs
+            
+        Returns:
+            One ClassificationResult per input, in input order
         """
+        seen: Dict[Tuple[str, Tuple[str, ...]], ClassificationResult] = {}
+        results = []
+        for command, args in commands:
+            key = (command, tuple(args))
+            result = seen.get(key)
+            if result is None:
+                result = seen[key] = self.classify(command, key[1])
+            results.append(result)
+        return results
+    
+    def _classify(self, command: str, args: Tuple[str, ...]) -> ClassificationResult:
+        """Classify without consulting the cache."""
         # Reconstruct full command for pattern matching
         full_command = f"{command} {' '.join(args)}".strip()
         
+        # Single pass over all compiled tiers; a blocklist hit wins outright
+        match = self._patterns.first_match(full_command)
+        
         # 1. Check blocklist first (always denied)
-        for pattern in self._blocklist_patterns:
-            if pattern.search(full_command):
-                return ClassificationResult(
-                    command=command,
-                    args=args,
-                    risk_level=RiskLevel.HIGH_RISK,
-                    is_blocked=True,
-                    block_reason="Command matches blocklist pattern",
-                    matched_pattern=pattern.pattern
-                )
+        if match is not None and match[0] is None:
+            return ClassificationResult(
+                command=command,
+                args=args,
+                risk_level=RiskLevel.HIGH_RISK,
+                is_blocked=True,
+                block_reason="Command matches blocklist pattern",
+                matched_pattern=match[1]
+            )
         
         # 2. In paranoid mode, everything requires Supervisor approval
         if self.paranoid_mode:
@@ -175,53 +462,38 @@ class CommandClassifier:
         
         # 3. Check manifest-based classification if available
         if self.manifest:
-            if command in self.manifest.safe_commands:
-                return ClassificationResult(
-                    command=command,
-                    args=args,
-                    risk_level=RiskLevel.READ,
-                    is_blocked=False
-                )
-            if command in self.manifest.write_commands:
-                return ClassificationResult(
-                    command=command,
-                    args=args,
-                    risk_level=RiskLevel.WRITE,
-                    is_blocked=False
-                )
-        
-        # 4. Fallback to regex pattern matching.
-        # Check HIGH_RISK before READ/WRITE so shell redirection and similar
-        # constructs cannot be misclassified by a benign binary prefix.
-        for pattern in self._high_risk_patterns:
-            if pattern.search(full_command):
+            index = self.manifest.index
+            
+            blocked = index.blocked_match(full_command)
+            if blocked is not None:
                 return ClassificationResult(
                     command=command,
                     args=args,
                     risk_level=RiskLevel.HIGH_RISK,
-                    is_blocked=False,
-                    matched_pattern=pattern.pattern
+                    is_blocked=True,
+                    block_reason="Command matches manifest blocked pattern",
+                    matched_pattern=blocked
                 )
-
-        for pattern in self._read_patterns:
-            if pattern.search(full_command):
+            
+            hit = index.lookup(command, args)
+            if hit is not None:
                 return ClassificationResult(
                     command=command,
                     args=args,
-                    risk_level=RiskLevel.READ,
+                    risk_level=hit[0],
                     is_blocked=False,
-                    matched_pattern=pattern.pattern
+                    matched_pattern=hit[1]
                 )
         
-        for pattern in self._write_patterns:
-            if pattern.search(full_command):
-                return ClassificationResult(
-                    command=command,
-                    args=args,
-                    risk_level=RiskLevel.WRITE,
-                    is_blocked=False,
-                    matched_pattern=pattern.pattern
-                )
+        # 4. Fallback to regex pattern matching (HIGH_RISK, READ, WRITE)
+        if match is not None:
+            return ClassificationResult(
+                command=command,
+                args=args,
+                risk_level=match[0],
+                is_blocked=False,
+                matched_pattern=match[1]
+            )
         
         # 5. Default: unknown commands are HIGH_RISK
         return ClassificationResult(
@@ -271,27 +543,48 @@ class TerminalSession:
     project_root: str = ""
     actions: List[TerminalAction] = field(default_factory=list)
     is_active: bool = True
+    _merkle: Union[MerkleAccumulator, MerkleTree] = field(
+        default_factory=MerkleAccumulator, init=False, repr=False, compare=False
+    )
     
     def add_action(self, action: TerminalAction) -> str:
         """Add an action to the session and return its hash."""
         action.session_id = self.session_id
         self.actions.append(action)
-        return action.compute_hash()
+        audit_hash = action.compute_hash()
+        if self._merkle.size == len(self.actions) - 1:
+            self._merkle.append(audit_hash)
+        return audit_hash
     
-    def compute_merkle_root(self) -> str:
-        """Compute Merkle root of all actions in this session."""
-        if not self.actions:
-            return hashlib.sha256(b"empty").hexdigest()
+    def merkle_tree(self) -> MerkleTree:
+        """Return the session's persistent hash tree, for proofs.
         
-        hashes = [a.compute_hash() for a in self.actions]
+        The first call swaps the O(log n) accumulator for a ``MerkleTree``
+        holding the same leaves; from then on the tree alone owns the root,
+        so each leaf is still hashed once.
+        """
+        if not isinstance(self._merkle, MerkleTree):
+            tree = MerkleTree()
+            for action in self.actions:
+                tree.append(action.compute_hash())
+            self._merkle = tree
+        else:
+            self.compute_merkle_root()
+        return self._merkle
+    
+    def compute_merkle_root(self) -> str:
+        """Compute Merkle root of all actions in this session.
         
-        # Build Merkle tree
-        while len(hashes) > 1:
-            if len(hashes) % 2 == 1:
-                hashes.append(hashes[-1])  # Duplicate last if odd
-            hashes = [
-                hashlib.sha256((hashes[i] + hashes[i+1]).encode()).hexdigest()
-                for i in range(0, len(hashes), 2)
-            ]
+        Leaf hashes are folded into an incremental accumulator (or the
+        session's ``merkle_tree()``) as actions are added, so this is O(1)
+        when nothing changed since the last call.
+        Actions appended to ``actions`` directly (e.g. during recovery) are
+        absorbed here. Actions are treated as immutable once added.
+        """
+        if self._merkle.size > len(self.actions):
+            # The action list was replaced or shrunk; start over
+            self._merkle = type(self._merkle)()
+        for action in self.actions[self._merkle.size:]:
+            self._merkle.append(action.compute_hash())
         
-        return hashes[0]
+        return self._merkle.root()
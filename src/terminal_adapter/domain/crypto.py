@@ -5,14 +5,116 @@ Provides Ed25519 signing and verification using RFC 8785 JSON Canonicalization S
 Used for securing communications with the Talos Governance Agent (TGA).
 """
 
-from typing import Any, Dict, Union
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple, Union
 import rfc8785
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives.asymmetric.ed25519 import (
     Ed25519PrivateKey,
     Ed25519PublicKey,
 )
 
 
+class Keyring:
+    """Parsed Ed25519 key objects, keyed by their raw bytes.
+    
+    Parsing a private key costs about as much as signing with it, so each
+    key is parsed once and reused; key objects may be passed straight
+    through. Every signature is still checked.
+    """
+    
+    def __init__(self, max_keys: int = 256):
+        self.max_keys = max(1, max_keys)
+        self._keys: "OrderedDict[Tuple[bool, bytes], Union[Ed25519PrivateKey, Ed25519PublicKey]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.parsed = 0
+        self.signs = 0
+        self.verifications = 0
+    
+    def _get(self, raw: bytes, private: bool):
+        key = (private, raw)
+        with self._lock:
+            parsed = self._keys.get(key)
+            if parsed is not None:
+                self._keys.move_to_end(key)
+                return parsed
+        if private:
+            parsed = Ed25519PrivateKey.from_private_bytes(raw)
+        else:
+            parsed = Ed25519PublicKey.from_public_bytes(raw)
+        with self._lock:
+            self.parsed += 1
+            self._keys[key] = parsed
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        return parsed
+    
+    def public_key(self, public_key: Union[bytes, Ed25519PublicKey]) -> Ed25519PublicKey:
+        if isinstance(public_key, bytes):
+            return self._get(public_key, private=False)
+        return public_key
+    
+    def private_key(self, private_key: Union[bytes, Ed25519PrivateKey]) -> Ed25519PrivateKey:
+        if isinstance(private_key, bytes):
+            return self._get(private_key, private=True)
+        return private_key
+    
+    def sign(self, data: Dict[str, Any], private_key: Union[bytes, Ed25519PrivateKey]) -> bytes:
+        """Sign a dictionary using Ed25519 and RFC 8785 JCS."""
+        self.signs += 1
+        return self.private_key(private_key).sign(canonical_json(data))
+    
+    def verify(
+        self,
+        data: Dict[str, Any],
+        signature: bytes,
+        public_key: Union[bytes, Ed25519PublicKey],
+    ) -> bool:
+        """Verify an Ed25519 signature for a canonicalized dictionary."""
+        return self.verify_many([(data, signature)], public_key)[0]
+    
+    def verify_many(
+        self,
+        items: Iterable[Tuple[Dict[str, Any], bytes]],
+        public_key: Union[bytes, Ed25519PublicKey],
+    ) -> List[bool]:
+        """Verify many ``(data, signature)`` pairs against one key.
+        
+        The key is resolved once for the whole batch. Ed25519 has no batch
+        verification in ``cryptography``, so each signature is still
+        checked on its own; an invalid key fails every item.
+        """
+        items = list(items)
+        self.verifications += len(items)
+        try:
+            key = self.public_key(public_key)
+        except (ValueError, TypeError):
+            return [False] * len(items)
+        results = []
+        for data, signature in items:
+            try:
+                key.verify(signature, canonical_json(data))
+                results.append(True)
+            except (InvalidSignature, ValueError, TypeError):
+                results.append(False)
+        return results
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._keys),
+            "parsed": self.parsed,
+            "signs": self.signs,
+            "verifications": self.verifications,
+        }
+
+
+# Process-wide keyring behind the module-level helpers
+KEYRING = Keyring()
+
+
 def canonical_json(data: Dict[str, Any]) -> bytes:
     """Serialize a dictionary to canonical JSON (RFC 8785)."""
     return rfc8785.dumps(data)
@@ -28,13 +130,7 @@ def sign_json(data: Dict[str, Any], private_key: Union[bytes, Ed25519PrivateKey]
     Returns:
         64-byte Ed25519 signature
     """
-    if isinstance(private_key, bytes):
-        key = Ed25519PrivateKey.from_private_bytes(private_key)
-    else:
-        key = private_key
-        
-    message = canonical_json(data)
-    return key.sign(message)
+    return KEYRING.sign(data, private_key)
 
 
 def verify_json_signature(
@@ -53,18 +149,16 @@ def verify_json_signature(
         True if signature is valid, False otherwise
     """
     try:
-        if isinstance(public_key, bytes):
-            key = Ed25519PublicKey.from_public_bytes(public_key)
-        else:
-            key = public_key
-            
-        message = canonical_json(data)
-        key.verify(signature, message)
-        return True
+        return KEYRING.verify(data, signature, public_key)
     except Exception:
         return False
 
 
+def crypto_metrics() -> Dict[str, Any]:
+    """Return keyring counters."""
+    return {"keyring": KEYRING.metrics()}
+
+
 def generate_keypair() -> tuple[bytes, bytes]:
     """Generate a new Ed25519 key pair.
     
@@ -0,0 +1,102 @@
+"""
+Terminal MCP Adapter - Pooled HTTP Client
+
+A long-lived ``httpx.AsyncClient`` with explicit pool limits, shared by all
+requests to one upstream service, that counts how often connections are
+reused and how often the pool is saturated.
+"""
+
+import importlib.util
+from typing import Any, Dict, Optional
+
+import httpx
+
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class PooledHTTPClient:
+    """Keep-alive HTTP client with bounded pool limits and pool metrics.
+
+    ``http2`` defaults to on when ``h2`` is installed, multiplexing
+    concurrent requests over one TLS connection; over plain ``http://``
+    httpx speaks HTTP/1.1 and keep-alive does the pooling. New connections
+    are counted through httpcore's ``trace`` extension, so
+    ``requests - connections_opened`` is the number of requests that
+    reused a pooled connection.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        max_connections: int,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: float = 30.0,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_connections = max(1, max_connections)
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=(
+                    self.max_connections if max_keepalive_connections is None
+                    else max_keepalive_connections
+                ),
+                keepalive_expiry=keepalive_expiry,
+            ),
+            transport=transport,
+        )
+
+        # Metrics
+        self.requests = 0
+        self.connections_opened = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated = 0  # Requests issued with max_connections already in flight
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.started":
+            self.connections_opened += 1
+
+    async def _send(self, send, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+        self.requests += 1
+        if self.in_flight >= self.max_connections:
+            self.saturated += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        extensions = kwargs.pop("extensions", None) or {}
+        extensions.setdefault("trace", self._trace)
+        try:
+            return await send(url, extensions=extensions, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST through the pool; ``timeout=`` overrides the default."""
+        return await self._send(self.client.post, url, kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET through the pool; ``timeout=`` overrides the default."""
+        return await self._send(self.client.get, url, kwargs)
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self.client.aclose()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return request, reuse and saturation counters."""
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connection_reuse_ratio": reused / self.requests if self.requests else 0.0,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturated_requests": self.saturated,
+        }
@@ -0,0 +1,275 @@
+"""
+Terminal MCP Adapter - Merkle Trees
+
+Append-only Merkle structures for session audit trails. Leaves are hex
+SHA-256 action hashes; a parent is ``sha256(left_hex + right_hex)`` and an
+odd node at the end of a level is paired with itself.
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+EMPTY_ROOT = hashlib.sha256(b"empty").hexdigest()
+
+
+def hash_pair(left: str, right: str) -> str:
+    """Hash two hex child nodes into their parent."""
+    return hashlib.sha256((left + right).encode()).hexdigest()
+
+
+def root_from_frontier(frontier: List[Optional[str]], size: int) -> str:
+    """Compute the root of a tree of ``size`` leaves from its frontier.
+
+    ``frontier[level]`` holds the root of the complete, still unpaired
+    subtree of ``2**level`` leaves on the right edge of the tree (present
+    exactly when bit ``level`` of ``size`` is set). The partial right edge
+    is folded upwards, applying the duplicate-last-node rule at each level.
+    """
+    if size == 0:
+        return EMPTY_ROOT
+
+    partial: Optional[str] = None
+    level = 0
+    while True:
+        complete = size >> level
+        if complete == 0:
+            return partial
+        if complete == 1 and partial is None:
+            return frontier[level]
+        if complete & 1:
+            node = frontier[level]
+            partial = hash_pair(node, partial if partial is not None else node)
+        elif partial is not None:
+            partial = hash_pair(partial, partial)
+        level += 1
+
+
+class MerkleAccumulator:
+    """Incremental Merkle root over an append-only sequence of leaves.
+
+    Keeps only the frontier of right-edge complete subtree roots, so an
+    append costs O(log n) hashes (amortized O(1)) and memory is O(log n).
+    The root is memoized until the next append. Roots are bit-identical to
+    building the full tree level by level with the duplicate-last rule.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._frontier: List[Optional[str]] = []
+        self._root: Optional[str] = None
+
+    def append(self, leaf: str) -> None:
+        """Add the next leaf hash."""
+        node = leaf
+        level = 0
+        while level < len(self._frontier) and self._frontier[level] is not None:
+            node = hash_pair(self._frontier[level], node)
+            self._frontier[level] = None
+            level += 1
+        if level == len(self._frontier):
+            self._frontier.append(node)
+        else:
+            self._frontier[level] = node
+        self.size += 1
+        self._root = None
+
+    def root(self) -> str:
+        """Return the current Merkle root."""
+        if self._root is None:
+            self._root = root_from_frontier(self._frontier, self.size)
+        return self._root
+
+
+def _range_blocks(start: int, end: int) -> List[Tuple[int, int]]:
+    """Split leaves ``[start, end)`` into maximal aligned complete subtrees.
+
+    Returns ``(first_leaf, level)`` pairs in left-to-right order.
+    """
+    blocks = []
+    while start < end:
+        level = (start & -start).bit_length() - 1 if start else end.bit_length()
+        while start + (1 << level) > end:
+            level -= 1
+        blocks.append((start, level))
+        start += 1 << level
+    return blocks
+
+
+def _frontier_levels(size: int) -> List[int]:
+    """Levels of the complete right-edge subtrees of ``size``, left to right."""
+    return [level for level in reversed(range(size.bit_length())) if size >> level & 1]
+
+
+class MerkleTree:
+    """Persistent append-only Merkle tree that retains interior nodes.
+
+    ``levels[L]`` holds the root of every complete, aligned subtree of
+    ``2**L`` leaves. Those nodes never change once created, so an append is
+    amortized O(1) and any historical root or proof is assembled from
+    O(log n) stored nodes; only the partial right edge is recomputed. The
+    current root is memoized until the next append.
+    """
+
+    def __init__(self):
+        self.levels: List[List[str]] = [[]]
+        self._root: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.levels[0])
+
+    def append(self, leaf: str) -> int:
+        """Add the next leaf hash and return its index."""
+        self.levels[0].append(leaf)
+        self._root = None
+        level = 0
+        while len(self.levels[level]) % 2 == 0:
+            nodes = self.levels[level]
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            self.levels[level + 1].append(hash_pair(nodes[-2], nodes[-1]))
+            level += 1
+        return self.size - 1
+
+    def _check_size(self, size: Optional[int]) -> int:
+        if size is None:
+            return self.size
+        if not 0 <= size <= self.size:
+            raise ValueError(f"Tree size {size} out of range (0..{self.size})")
+        return size
+
+    def _frontier(self, size: int) -> List[Optional[str]]:
+        return [
+            self.levels[level][(size >> level) - 1] if size >> level & 1 else None
+            for level in range(size.bit_length())
+        ]
+
+    def root(self, size: Optional[int] = None) -> str:
+        """Return the root of the first ``size`` leaves (default: all)."""
+        if size is None or size == self.size:
+            if self._root is None:
+                self._root = root_from_frontier(self._frontier(self.size), self.size)
+            return self._root
+        size = self._check_size(size)
+        return root_from_frontier(self._frontier(size), size)
+
+    def inclusion_proof(self, index: int, size: Optional[int] = None) -> List[str]:
+        """Return the sibling hashes from leaf ``index`` up to the root.
+
+        Where a node is the odd last node of its level, its "sibling" is
+        the node itself, per the duplicate-last rule.
+        """
+        size = self._check_size(size)
+        if not 0 <= index < size:
+            raise ValueError(f"Leaf index {index} out of range for tree size {size}")
+
+        proof = []
+        partial: Optional[str] = None  # Partial right-edge node at this level
+        level = 0
+        while True:
+            complete = size >> level
+            count = complete + (partial is not None)
+            if count == 1:
+                return proof
+
+            def node(i: int) -> str:
+                return self.levels[level][i] if i < complete else partial
+
+            sibling = index ^ 1
+            proof.append(node(sibling) if sibling < count else node(index))
+
+            if complete & 1:
+                last = self.levels[level][complete - 1]
+                partial = hash_pair(last, partial if partial is not None else last)
+            elif partial is not None:
+                partial = hash_pair(partial, partial)
+            index >>= 1
+            level += 1
+
+    def consistency_proof(self, old_size: int, new_size: Optional[int] = None) -> List[str]:
+        """Prove the first ``old_size`` leaves are a prefix of ``new_size``.
+
+        The proof is the old tree's right-edge subtree roots followed by
+        the aligned subtree roots covering the appended leaves.
+        """
+        new_size = self._check_size(new_size)
+        if not 0 < old_size <= new_size:
+            raise ValueError(f"Invalid consistency range {old_size}..{new_size}")
+        proof = [self.levels[level][(old_size >> level) - 1] for level in _frontier_levels(old_size)]
+        proof.extend(self.levels[level][start >> level] for start, level in _range_blocks(old_size, new_size))
+        return proof
+
+
+def verify_inclusion(leaf_hash: str, index: int, tree_size: int, proof: List[str], root: str) -> bool:
+    """Verify an inclusion proof produced by ``MerkleTree.inclusion_proof``.
+
+    Standalone so downstream services can check proofs offline.
+    """
+    if not 0 <= index < tree_size:
+        return False
+
+    node = leaf_hash
+    count = tree_size
+    steps = 0
+    while count > 1:
+        if steps >= len(proof):
+            return False
+        sibling = proof[steps]
+        if index & 1:
+            node = hash_pair(sibling, node)
+        else:
+            if index == count - 1 and sibling != node:
+                return False  # Odd last node must be paired with itself
+            node = hash_pair(node, sibling)
+        index >>= 1
+        count = (count + 1) // 2
+        steps += 1
+
+    return steps == len(proof) and node == root
+
+
+def verify_consistency(old_size: int, new_size: int, old_root: str, new_root: str, proof: List[str]) -> bool:
+    """Verify a consistency proof produced by ``MerkleTree.consistency_proof``.
+
+    Recomputes the old root from the old right edge, then merges in the
+    appended subtrees to recompute the new root.
+    """
+    if not 0 < old_size <= new_size:
+        return False
+
+    old_levels = _frontier_levels(old_size)
+    blocks = _range_blocks(old_size, new_size)
+    if len(proof) != len(old_levels) + len(blocks):
+        return False
+
+    old_frontier: List[Optional[str]] = [None] * old_size.bit_length()
+    for level, node in zip(old_levels, proof):
+        old_frontier[level] = node
+    if root_from_frontier(old_frontier, old_size) != old_root:
+        return False
+
+    # Merge adjacent sibling subtrees, left to right, into the new right edge
+    stack: List[Tuple[int, int, str]] = []  # (first_leaf, level, hash)
+    start = 0
+    for level, node in zip(old_levels, proof):
+        stack.append((start, level, node))
+        start += 1 << level
+    for (start, level), node in zip(blocks, proof[len(old_levels):]):
+        stack.append((start, level, node))
+        while (
+            len(stack) >= 2
+            and stack[-1][1] == stack[-2][1]
+            and stack[-2][0] % (1 << (stack[-2][1] + 1)) == 0
+        ):
+            right = stack.pop()
+            left = stack.pop()
+            stack.append((left[0], left[1] + 1, hash_pair(left[2], right[2])))
+
+    new_frontier: List[Optional[str]] = [None] * new_size.bit_length()
+    for _, level, node in stack:
+        if new_frontier[level] is not None:
+            return False
+        new_frontier[level] = node
+    if [level for _, level, _ in stack] != _frontier_levels(new_size):
+        return False
+    return root_from_frontier(new_frontier, new_size) == new_root
@@ -0,0 +1,154 @@
+"""
+Terminal MCP Adapter - Output Buffers
+
+Bounded byte buffers for command output, so that memory per request or
+session stays fixed no matter how much a command writes.
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+
+class CappedOutput:
+    """Incremental capture of a byte stream, keeping at most ``limit`` bytes.
+
+    The first ``limit - tail_bytes`` bytes (head) and the last ``tail_bytes``
+    bytes (tail) are kept in preallocated buffers. Everything in between is
+    discarded but still counted and hashed, so ``hexdigest()`` and
+    ``total_bytes`` always describe the full stream.
+    """
+
+    def __init__(self, limit: int, tail_bytes: int = 0):
+        self.limit = max(0, limit)
+        self.tail_bytes = min(max(0, tail_bytes), self.limit)
+        self.total_bytes = 0
+
+        self._head = bytearray(self.limit - self.tail_bytes)
+        self._head_len = 0
+        self._tail = bytearray(self.tail_bytes)
+        self._tail_pos = 0  # Next write position in the tail ring
+        self._tail_len = 0
+        self._sha256 = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        """Feed the next chunk of the stream."""
+        if not chunk:
+            return
+        self._sha256.update(chunk)
+        self.total_bytes += len(chunk)
+
+        view = memoryview(chunk)
+        room = len(self._head) - self._head_len
+        if room:
+            n = min(room, len(view))
+            self._head[self._head_len:self._head_len + n] = view[:n]
+            self._head_len += n
+            view = view[n:]
+
+        if not view or not self.tail_bytes:
+            return
+
+        size = self.tail_bytes
+        if len(view) >= size:
+            self._tail[:] = view[-size:]
+            self._tail_pos = 0
+            self._tail_len = size
+            return
+
+        n = len(view)
+        first = min(n, size - self._tail_pos)
+        self._tail[self._tail_pos:self._tail_pos + first] = view[:first]
+        self._tail[:n - first] = view[first:]
+        self._tail_pos = (self._tail_pos + n) % size
+        self._tail_len = min(size, self._tail_len + n)
+
+    @property
+    def truncated(self) -> bool:
+        """True if part of the stream was discarded."""
+        return self.total_bytes > self.limit
+
+    def getvalue(self) -> bytes:
+        """Return the retained head followed by the retained tail."""
+        head = bytes(self._head[:self._head_len])
+        if self._tail_len < self.tail_bytes:
+            return head + bytes(self._tail[:self._tail_len])
+        return head + bytes(self._tail[self._tail_pos:]) + bytes(self._tail[:self._tail_pos])
+
+    def text(self) -> str:
+        """Return the retained bytes decoded as UTF-8 (invalid bytes replaced)."""
+        return self.getvalue().decode("utf-8", errors="replace")
+
+    def hexdigest(self) -> str:
+        """SHA-256 of the full stream, including discarded bytes."""
+        return self._sha256.hexdigest()
+
+
+class OutputRing:
+    """Fixed-capacity byte ring addressed by monotonic stream offsets.
+
+    Byte ``n`` of the stream is stored at ``n % capacity``; once more than
+    ``capacity`` bytes have been written the oldest are overwritten. A
+    reader keeps its own offset and gets back ``memoryview`` slices of the
+    ring (at most two, when the range wraps) without copying. Views are
+    only valid until the next ``write``. A reader that fell behind
+    ``start`` is told how many bytes it missed and resumes at the oldest
+    retained byte.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._buf = bytearray(self.capacity)
+        self._view = memoryview(self._buf)
+        self.end = 0  # Offset just past the newest byte (total bytes written)
+
+    @property
+    def start(self) -> int:
+        """Offset of the oldest byte still retained (= bytes evicted so far)."""
+        return max(0, self.end - self.capacity)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk, overwriting the oldest bytes if the ring is full."""
+        n = len(chunk)
+        if not n:
+            return
+        view = memoryview(chunk)
+        base = self.end
+        if n > self.capacity:
+            # Only the newest ``capacity`` bytes can survive this write
+            view = view[n - self.capacity:]
+            base = self.end + n - self.capacity
+        pos = base % self.capacity
+        first = min(len(view), self.capacity - pos)
+        self._buf[pos:pos + first] = view[:first]
+        self._buf[:len(view) - first] = view[first:]
+        self.end += n
+
+    def read(self, offset: int, max_bytes: Optional[int] = None) -> Tuple[List[memoryview], int, int]:
+        """Return ``(views, next_offset, dropped)`` for the bytes from ``offset``.
+
+        ``dropped`` is how many bytes between ``offset`` and ``start`` were
+        overwritten before this reader got to them.
+        """
+        dropped = 0
+        if offset < self.start:
+            dropped = self.start - offset
+            offset = self.start
+        offset = min(offset, self.end)
+        stop = self.end if max_bytes is None else min(self.end, offset + max(0, max_bytes))
+        n = stop - offset
+        if not n:
+            return [], stop, dropped
+        pos = offset % self.capacity
+        first = min(n, self.capacity - pos)
+        views = [self._view[pos:pos + first]]
+        if n > first:
+            views.append(self._view[:n - first])
+        return views, stop, dropped
+
+    def getvalue(self, offset: Optional[int] = None) -> bytes:
+        """Copy of the retained bytes from ``offset`` (default: all of them)."""
+        views, _, _ = self.read(self.start if offset is None else offset)
+        return b"".join(views)
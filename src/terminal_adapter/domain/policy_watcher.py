@@ -0,0 +1,174 @@
+"""
+Terminal MCP Adapter - Policy Manifest Hot Reload
+
+Watches the Supervisor-signed policy manifest and swaps in a freshly
+compiled CommandClassifier when it changes, without restarting the adapter.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .classifier import CommandClassifier, PolicyManifest
+
+logger = logging.getLogger("terminal-adapter.policy")
+
+
+def load_policy(
+    manifest_path: Optional[str],
+    supervisor_public_key: Optional[bytes],
+    require_manifest: bool = False,
+) -> Tuple[Optional[PolicyManifest], bool]:
+    """Load and verify a policy manifest.
+
+    Args:
+        manifest_path: Path to the signed manifest (may be unset)
+        supervisor_public_key: Raw Ed25519 key used to verify the signature
+        require_manifest: Treat a missing manifest file as a failure
+
+    Returns:
+        Tuple of (manifest, paranoid_mode). Any verification or load
+        failure yields paranoid_mode=True.
+    """
+    if not manifest_path or not os.path.exists(manifest_path):
+        if require_manifest:
+            logger.warning(f"Policy manifest {manifest_path} missing - entering Paranoid Mode")
+            return None, True
+        return None, False
+
+    try:
+        manifest = PolicyManifest.load(manifest_path)
+    except Exception as e:
+        logger.warning(f"Failed to load policy manifest: {e} - entering Paranoid Mode")
+        return None, True
+
+    if not supervisor_public_key:
+        logger.warning("No supervisor key to verify manifest - entering Paranoid Mode")
+        return manifest, True
+    if not manifest.verify_signature(supervisor_public_key):
+        logger.warning("Policy manifest signature invalid - entering Paranoid Mode")
+        return manifest, True
+
+    return manifest, False
+
+
+def build_classifier(
+    manifest_path: Optional[str],
+    supervisor_public_key: Optional[bytes],
+    cache_size: int = CommandClassifier.DEFAULT_CACHE_SIZE,
+    require_manifest: bool = False,
+) -> CommandClassifier:
+    """Load, verify and compile a manifest into a ready-to-use classifier."""
+    manifest, paranoid_mode = load_policy(manifest_path, supervisor_public_key, require_manifest)
+    return CommandClassifier(manifest=manifest, paranoid_mode=paranoid_mode, cache_size=cache_size)
+
+
+class ManifestWatcher:
+    """Polls the policy manifest and hot-swaps the classifier on change.
+
+    Changes are detected by mtime polling (inode, size and mtime), which
+    also catches atomic rename-into-place updates. Signature verification
+    and pattern compilation run in a worker thread; the finished classifier
+    is handed to ``on_reload`` on the event loop, so callers swap a single
+    reference and in-flight classifications keep using the old policy.
+    """
+
+    def __init__(
+        self,
+        manifest_path: str,
+        supervisor_public_key: Optional[bytes],
+        on_reload: Callable[[CommandClassifier], None],
+        cache_size: int = CommandClassifier.DEFAULT_CACHE_SIZE,
+        poll_interval: float = 2.0,
+    ):
+        self.manifest_path = manifest_path
+        self.supervisor_public_key = supervisor_public_key
+        self.on_reload = on_reload
+        self.cache_size = cache_size
+        self.poll_interval = poll_interval
+        self._stamp = self._stat()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.reload_count = 0
+        self.reload_failures = 0
+        self.last_reload_seconds: Optional[float] = None
+        self.last_reload_at: Optional[datetime] = None
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    async def check(self) -> bool:
+        """Poll once and reload if the manifest changed.
+
+        Returns:
+            True if a new classifier was swapped in
+        """
+        stamp = self._stat()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        await self.reload()
+        return True
+
+    async def reload(self) -> CommandClassifier:
+        """Rebuild the classifier from disk and swap it in."""
+        start = time.perf_counter()
+        classifier = await asyncio.to_thread(
+            build_classifier,
+            self.manifest_path,
+            self.supervisor_public_key,
+            self.cache_size,
+            True,
+        )
+        self.on_reload(classifier)
+
+        self.last_reload_seconds = time.perf_counter() - start
+        self.last_reload_at = datetime.now(timezone.utc)
+        self.reload_count += 1
+        if classifier.paranoid_mode:
+            self.reload_failures += 1
+
+        logger.info(
+            f"Reloaded policy manifest in {self.last_reload_seconds * 1000:.1f}ms "
+            f"(paranoid={classifier.paranoid_mode})"
+        )
+        return classifier
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return reload counters and latency."""
+        return {
+            "manifest_path": self.manifest_path,
+            "reload_count": self.reload_count,
+            "reload_failures": self.reload_failures,
+            "last_reload_seconds": self.last_reload_seconds,
+            "last_reload_at": self.last_reload_at.isoformat() if self.last_reload_at else None,
+        }
+
+    async def start(self) -> None:
+        """Start the background polling task."""
+        async def _watch_loop():
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                try:
+                    await self.check()
+                except Exception as e:
+                    logger.error(f"Policy manifest reload failed: {e}")
+
+        self._task = asyncio.create_task(_watch_loop())
+
+    async def stop(self) -> None:
+        """Stop the background polling task."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
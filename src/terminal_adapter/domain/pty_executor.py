@@ -7,18 +7,26 @@ supporting stdin writing and real-time output streaming.
 
 import os
 import pty
-import select
+import fcntl
+import codecs
 import signal
+import struct
+import termios
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Callable, Tuple
+from typing import Dict, Any, Optional, List, Callable, Set, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 import uuid
 
+from .output_buffers import OutputRing
+
 logger = logging.getLogger("terminal-adapter.pty")
 
+# Default per-session output retention (TALOS_PTY_BUFFER_BYTES)
+DEFAULT_OUTPUT_CAPACITY = 1024 * 1024
+
 
 class SessionState(Enum):
     """State of an interactive session."""
@@ -42,8 +50,74 @@ class InteractiveSession:
     args: List[str] = field(default_factory=list)
     cwd: str = ""
     exit_code: Optional[int] = None
-    stdout_buffer: str = ""
     stderr_buffer: str = ""
+    # PTY output (stdout and stderr interleaved) and this session's read position
+    output: OutputRing = field(default_factory=lambda: OutputRing(DEFAULT_OUTPUT_CAPACITY))
+    read_offset: int = 0
+    dropped_bytes: int = 0  # Output overwritten before read_output got to it
+    _decoder: codecs.IncrementalDecoder = field(
+        default_factory=lambda: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        repr=False,
+    )
+    # Set (and replaced) whenever output arrives or the session ends
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    
+    def notify(self) -> None:
+        """Wake everyone waiting on this session's output or state."""
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+    
+    async def wait_until(self, predicate: Callable[[], bool], timeout: Optional[float]) -> bool:
+        """Wait up to ``timeout`` seconds (None: forever) for ``predicate``.
+        
+        Re-checked only when the session notifies, so waiting costs no
+        timer wakeups. Returns the predicate's final value.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not predicate():
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return predicate()
+        return True
+    
+    def read(self, max_bytes: Optional[int] = None) -> List[memoryview]:
+        """Consume unread output as zero-copy slices of the ring.
+        
+        If the ring wrapped past the read position, the lost bytes are
+        added to ``dropped_bytes`` and reading resumes at the oldest
+        retained byte.
+        """
+        views, self.read_offset, dropped = self.output.read(self.read_offset, max_bytes)
+        if dropped:
+            self.dropped_bytes += dropped
+            self._decoder.reset()  # Don't stitch characters across the gap
+        return views
+    
+    def read_text(self, max_bytes: Optional[int] = None) -> str:
+        """Consume unread output decoded as UTF-8."""
+        return "".join(self._decoder.decode(view) for view in self.read(max_bytes))
+    
+    @property
+    def unread_bytes(self) -> int:
+        return self.output.end - max(self.read_offset, self.output.start)
+    
+    @property
+    def stdout_buffer(self) -> str:
+        """Unread output as text (without consuming it)."""
+        views, _, _ = self.output.read(self.read_offset)
+        return b"".join(views).decode("utf-8", errors="replace")
+    
+    @stdout_buffer.setter
+    def stdout_buffer(self, text: str) -> None:
+        # Replace the unread output: skip what is there, then append ``text``
+        self.read_offset = self.output.end
+        self.output.write(text.encode("utf-8"))
+        self.notify()
     
     def is_alive(self) -> bool:
         """Check if the session process is still running."""
@@ -56,6 +130,101 @@ class InteractiveSession:
             return False
 
 
+@dataclass
+class OutputChunk:
+    """What a subscriber read: text, the stream offset after it, and any gap."""
+    text: str
+    offset: int  # Resume point (SSE event id); excludes undecoded partial characters
+    dropped: int = 0  # Bytes overwritten before this subscriber read them
+    complete: bool = False  # Session finished and everything was read
+
+
+class OutputSubscriber:
+    """One client's cursor into a session's output ring.
+    
+    Subscribers never consume output for anyone else, so any number of
+    them can follow the same session. They only read what the PTY reader
+    already stored and never hold it up; one that falls more than the
+    ring's capacity behind loses the oldest bytes and is told how many.
+    """
+    
+    def __init__(self, executor: "PTYExecutor", session: InteractiveSession, offset: int):
+        self.executor = executor
+        self.session = session
+        self.offset = offset
+        self.dropped_bytes = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    
+    def read_bytes(self, max_bytes: Optional[int] = None) -> Tuple[List[memoryview], int]:
+        """Read new raw output as zero-copy slices of the ring.
+        
+        Returns (views, dropped): the slices, and how many bytes were
+        overwritten since the last read. The slices are only valid until
+        the ring is next written to; copy them before yielding control.
+        """
+        views, self.offset, dropped = self.session.output.read(self.offset, max_bytes)
+        if dropped:
+            self.dropped_bytes += dropped
+            self._decoder.reset()  # Don't stitch characters across the gap
+        return views, dropped
+    
+    def read(self, max_bytes: Optional[int] = None) -> OutputChunk:
+        """Read whatever is new since the last call, without waiting."""
+        views, dropped = self.read_bytes(max_bytes)
+        text = "".join(self._decoder.decode(view) for view in views)
+        pending = len(self._decoder.getstate()[0])
+        complete = self.finished and self.offset >= self.session.output.end
+        return OutputChunk(text, self.offset - pending, dropped, complete)
+    
+    @property
+    def finished(self) -> bool:
+        """The session ended and its PTY was read to EOF."""
+        return self.executor._is_session_finished(self.session)
+    
+    @property
+    def unread_bytes(self) -> int:
+        """Bytes written since this subscriber's cursor, lost ones included."""
+        return self.session.output.end - self.offset
+    
+    async def wait(
+        self,
+        flush_interval: float = 0.0,
+        flush_bytes: int = 0,
+        idle_timeout: Optional[float] = None,
+    ) -> bool:
+        """Wait for output to read, coalescing small writes.
+        
+        Waits until output arrives or the session finishes, then up to
+        ``flush_interval`` seconds more for at least ``flush_bytes`` to
+        accumulate, so a burst of tiny PTY writes goes out as one chunk.
+        Returns False if nothing happened within ``idle_timeout`` seconds.
+        """
+        if not await self.session.wait_until(
+            lambda: self.unread_bytes > 0 or self.finished, idle_timeout
+        ):
+            return False
+        if flush_interval > 0 and self.unread_bytes < flush_bytes:
+            await self.session.wait_until(
+                lambda: self.unread_bytes >= flush_bytes or self.finished, flush_interval
+            )
+        return True
+    
+    async def next(
+        self,
+        flush_interval: float = 0.0,
+        flush_bytes: int = 0,
+        idle_timeout: Optional[float] = None,
+    ) -> Optional[OutputChunk]:
+        """``wait`` and then ``read``; None if the wait timed out."""
+        if not await self.wait(flush_interval, flush_bytes, idle_timeout):
+            return None
+        return self.read()
+    
+    def close(self) -> None:
+        """Stop following the session."""
+        self.executor.unsubscribe(self)
+
+
 class PTYExecutor:
     """PTY-based command executor for interactive sessions.
     
@@ -64,12 +233,31 @@ class PTYExecutor:
     - Supports stdin writing via write_input
     - Non-blocking output reading for streaming
     - Signal handling for abort
+    
+    Each session's master fd is non-blocking and registered with the
+    event loop (``loop.add_reader``), so output is read the moment it is
+    readable and idle sessions cost no CPU. When the child side closes,
+    the process is reaped through a pidfd where the platform has one.
     """
     
-    def __init__(self, project_root: str):
+    READ_CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, project_root: str, output_capacity: Optional[int] = None):
         self.project_root = project_root
+        # Bytes of output kept per session; a slow reader loses the oldest
+        self.output_capacity = output_capacity or int(
+            os.getenv("TALOS_PTY_BUFFER_BYTES", str(DEFAULT_OUTPUT_CAPACITY))
+        )
         self.sessions: Dict[str, InteractiveSession] = {}
-        self._read_tasks: Dict[str, asyncio.Task] = {}
+        # session_id -> loop the master fd is registered with
+        self._readers: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._decoders: Dict[str, codecs.IncrementalDecoder] = {}
+        self._cleanup_tasks: Dict[str, asyncio.Task] = {}
+        self._subscribers: Dict[str, Set[OutputSubscriber]] = {}
+        
+        # Metrics
+        self.reads = 0
+        self.bytes_read = 0
 
     @staticmethod
     def _is_session_active(session: InteractiveSession) -> bool:
@@ -79,6 +267,15 @@ class PTYExecutor:
             SessionState.WAITING_INPUT,
         }
     
+    def _is_session_finished(self, session: InteractiveSession) -> bool:
+        # An aborted session may still be flushing output until EOF, and
+        # the exit code is only known once cleanup has reaped the child
+        return (
+            not self._is_session_active(session)
+            and session.session_id not in self._readers
+            and session.session_id not in self._cleanup_tasks
+        )
+    
     async def start_session(
         self,
         command: str,
@@ -94,7 +291,8 @@ class PTYExecutor:
             args: Command arguments
             cwd: Working directory
             env: Environment overrides
-            on_output: Callback for stdout chunks (session_id, chunk)
+            on_output: Callback for stdout chunks (session_id, chunk), called
+                on the event loop as soon as output is read; must not block
             
         Returns:
             InteractiveSession with master_fd for I/O
@@ -103,6 +301,7 @@ class PTYExecutor:
             command=command,
             args=args,
             cwd=cwd,
+            output=OutputRing(self.output_capacity),
         )
         
         # Build safe environment
@@ -138,59 +337,70 @@ class PTYExecutor:
             
             self.sessions[session.session_id] = session
             
-            # Start background read task
-            if on_output:
-                task = asyncio.create_task(
-                    self._read_output_loop(session, on_output)
-                )
-                self._read_tasks[session.session_id] = task
+            # Read output whenever the master fd becomes readable
+            self._watch(session, on_output)
             
             logger.info(f"Started session {session.session_id}: {command} (pid={pid})")
             return session
     
-    async def _read_output_loop(
+    def _watch(
         self,
         session: InteractiveSession,
-        on_output: Callable[[str, str], None]
+        on_output: Optional[Callable[[str, str], None]],
     ) -> None:
-        """Background task to read PTY output and invoke callback."""
-        loop = asyncio.get_event_loop()
-        
+        """Register the session's master fd with the event loop."""
+        loop = asyncio.get_running_loop()
+        os.set_blocking(session.master_fd, False)
+        self._decoders[session.session_id] = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        loop.add_reader(session.master_fd, self._on_readable, session, on_output)
+        self._readers[session.session_id] = loop
+    
+    def _unwatch(self, session: InteractiveSession) -> None:
+        loop = self._readers.pop(session.session_id, None)
+        if loop is not None and session.master_fd >= 0:
+            loop.remove_reader(session.master_fd)
+    
+    def _on_readable(
+        self,
+        session: InteractiveSession,
+        on_output: Optional[Callable[[str, str], None]],
+    ) -> None:
+        """Read what is available from the PTY without blocking."""
         try:
-            while session.is_alive():
-                # Check for readable data
-                readable, _, _ = select.select([session.master_fd], [], [], 0.1)
-                
-                if readable:
-                    try:
-                        chunk = os.read(session.master_fd, 4096)
-                        if chunk:
-                            text = chunk.decode("utf-8", errors="replace")
-                            session.stdout_buffer += text
-                            
-                            # Run callback in event loop
-                            await loop.run_in_executor(
-                                None,
-                                on_output,
-                                session.session_id,
-                                text
-                            )
-                    except OSError:
-                        break
-                
-                await asyncio.sleep(0.01)
-        except Exception as e:
-            logger.error(f"Read loop error for {session.session_id}: {e}")
-        finally:
+            chunk = os.read(session.master_fd, self.READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""  # EIO: the child side of the PTY is closed
+        
+        decoder = self._decoders[session.session_id]
+        if not chunk:
             # Session ended
-            await self._cleanup_session(session)
+            self._unwatch(session)
+            self._cleanup_tasks[session.session_id] = asyncio.ensure_future(
+                self._cleanup_session(session)
+            )
+            text = decoder.decode(b"", final=True)
+        else:
+            self.reads += 1
+            self.bytes_read += len(chunk)
+            session.output.write(chunk)
+            text = decoder.decode(chunk) if on_output else ""
+        session.notify()
+        
+        # Empty if the chunk ended inside a multi-byte character
+        if text and on_output:
+            try:
+                on_output(session.session_id, text)
+            except Exception as e:
+                logger.error(f"Output callback error for {session.session_id}: {e}")
     
-    async def write_input(self, session_id: str, data: str) -> bool:
+    async def write_input(self, session_id: str, data: Union[str, bytes]) -> bool:
         """Write stdin data to a running session.
         
         Args:
             session_id: Target session ID
-            data: Data to write (include newlines if needed)
+            data: Text (sent as UTF-8) or raw bytes; include newlines if needed
             
         Returns:
             True if written successfully
@@ -199,14 +409,49 @@ class PTYExecutor:
         if not session or not self._is_session_active(session):
             return False
         
+        payload = data.encode("utf-8") if isinstance(data, str) else data
         try:
-            os.write(session.master_fd, data.encode("utf-8"))
+            # The master fd is non-blocking: when the PTY's input queue is
+            # full, wait for room instead of dropping the rest
+            while payload:
+                try:
+                    written = os.write(session.master_fd, payload)
+                except BlockingIOError:
+                    await self._writable(session.master_fd)
+                    continue
+                payload = memoryview(payload)[written:]
             logger.debug(f"Wrote {len(data)} bytes to session {session_id}")
             return True
         except OSError as e:
             logger.error(f"Write error for {session_id}: {e}")
             return False
     
+    async def _writable(self, fd: int) -> None:
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_writer(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_writer(fd)
+    
+    async def resize_session(self, session_id: str, rows: int, cols: int) -> bool:
+        """Set a session's terminal size; the kernel signals SIGWINCH.
+        
+        Returns:
+            True if the size was applied
+        """
+        session = self.sessions.get(session_id)
+        if not session or not self._is_session_active(session):
+            return False
+        
+        try:
+            fcntl.ioctl(session.master_fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+            return True
+        except OSError as e:
+            logger.error(f"Resize error for {session_id}: {e}")
+            return False
+    
     async def abort_session(self, session_id: str, force: bool = False) -> bool:
         """Abort a running session.
         
@@ -226,6 +471,7 @@ class PTYExecutor:
         try:
             os.kill(session.pid, sig)
             session.state = SessionState.ABORTED
+            session.notify()
             logger.info(f"Aborted session {session_id} with signal {sig.name}")
             return True
         except ProcessLookupError:
@@ -263,33 +509,72 @@ class PTYExecutor:
             return "", True
         
         # Wait for output or completion
-        start = asyncio.get_event_loop().time()
-        timeout = timeout_ms / 1000
-        
-        while asyncio.get_event_loop().time() - start < timeout:
-            if not self._is_session_active(session):
-                break
-            if session.stdout_buffer:
-                break
-            await asyncio.sleep(0.05)
+        await session.wait_until(
+            lambda: session.unread_bytes > 0 or not self._is_session_active(session),
+            timeout_ms / 1000,
+        )
         
         # Get buffered output
-        output = session.stdout_buffer
-        session.stdout_buffer = ""
+        output = session.read_text()
         
         return output, not self._is_session_active(session)
     
+    def subscribe(self, session_id: str, offset: Optional[int] = None) -> Optional[OutputSubscriber]:
+        """Follow a session's output with an independent cursor.
+        
+        ``offset`` resumes from a previous chunk's ``offset`` (e.g. an SSE
+        ``Last-Event-ID``); by default the subscriber starts at the oldest
+        output still retained. Returns None for unknown sessions.
+        """
+        session = self.sessions.get(session_id)
+        if not session:
+            return None
+        start = session.output.start if offset is None else max(0, min(offset, session.output.end))
+        subscriber = OutputSubscriber(self, session, start)
+        self._subscribers.setdefault(session_id, set()).add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: OutputSubscriber) -> None:
+        """Remove a subscriber; a no-op if it is already gone."""
+        subscribers = self._subscribers.get(subscriber.session.session_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.session.session_id]
+    
+    async def _reap(self, pid: int) -> Optional[int]:
+        """Wait for a child to exit without blocking the event loop."""
+        try:
+            reaped, status = os.waitpid(pid, os.WNOHANG)
+            if reaped == 0:
+                pidfd_open = getattr(os, "pidfd_open", None)
+                if pidfd_open is None:
+                    reaped, status = await asyncio.to_thread(os.waitpid, pid, 0)
+                else:
+                    # The pidfd becomes readable when the process exits
+                    loop = asyncio.get_running_loop()
+                    exited = loop.create_future()
+                    pidfd = pidfd_open(pid)
+                    try:
+                        loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+                        try:
+                            await exited
+                        finally:
+                            loop.remove_reader(pidfd)
+                    finally:
+                        os.close(pidfd)
+                    reaped, status = os.waitpid(pid, 0)
+        except (ChildProcessError, ProcessLookupError):
+            return None
+        if os.WIFEXITED(status):
+            return os.WEXITSTATUS(status)
+        if os.WIFSIGNALED(status):
+            return -os.WTERMSIG(status)
+        return None
+    
     async def _cleanup_session(self, session: InteractiveSession) -> None:
         """Clean up a finished session."""
-        # Get exit code
-        try:
-            _, status = os.waitpid(session.pid, os.WNOHANG)
-            if os.WIFEXITED(status):
-                session.exit_code = os.WEXITSTATUS(status)
-            elif os.WIFSIGNALED(status):
-                session.exit_code = -os.WTERMSIG(status)
-        except ChildProcessError:
-            pass
+        self._unwatch(session)
         
         # Close master FD
         if session.master_fd >= 0:
@@ -298,10 +583,16 @@ class PTYExecutor:
             except OSError:
                 pass
             session.master_fd = -1
+        self._decoders.pop(session.session_id, None)
+        
+        # Get exit code
+        session.exit_code = await self._reap(session.pid)
         
         # Update state
         if session.state == SessionState.RUNNING:
             session.state = SessionState.COMPLETED
+        self._cleanup_tasks.pop(session.session_id, None)
+        session.notify()
         
         logger.info(f"Session {session.session_id} completed with exit code {session.exit_code}")
     
@@ -310,5 +601,27 @@ class PTYExecutor:
         for session_id in list(self.sessions.keys()):
             await self.abort_session(session_id, force=True)
         
-        for task in self._read_tasks.values():
-            task.cancel()
+        for session in list(self.sessions.values()):
+            if session.session_id in self._readers:
+                self._unwatch(session)
+                self._cleanup_tasks[session.session_id] = asyncio.ensure_future(
+                    self._cleanup_session(session)
+                )
+        if self._cleanup_tasks:
+            await asyncio.wait(list(self._cleanup_tasks.values()), timeout=5)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Return session and read counters."""
+        return {
+            "sessions": len(self.sessions),
+            "watched": len(self._readers),
+            "reads": self.reads,
+            "bytes_read": self.bytes_read,
+            "buffer_capacity": self.output_capacity,
+            "buffered_bytes": sum(len(s.output) for s in self.sessions.values()),
+            "dropped_bytes": sum(s.dropped_bytes for s in self.sessions.values()),
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            "subscriber_dropped_bytes": sum(
+                sub.dropped_bytes for subs in self._subscribers.values() for sub in subs
+            ),
+        }
@@ -6,97 +6,196 @@ for crash recovery, as specified in the Terminal MCP Adapter spec.
 """
 
 import os
-import json
+import time
+import random
+import struct
 import hashlib
 import asyncio
-from typing import Dict, Optional, List, Callable, Any
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, List, Callable, Any, Iterable, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
 
 from .classifier import TerminalSession, TerminalAction, RiskLevel
+from .merkle import MerkleTree
+from .anchor_outbox import AnchorEvent, AnchorOutbox
+from .wal import DEFAULT_SEGMENT_BYTES, GroupCommitWriter, SegmentedLog
 
 logger = logging.getLogger("terminal-adapter.session")
 
 
-@dataclass
-class WALEntry:
-    """Write-Ahead Log entry for crash recovery."""
-    sequence: int
-    action_id: str
-    session_id: str
-    timestamp: str
-    command: str
-    args: List[str]
-    cwd: str
-    risk_level: str
+# WAL entry payload: fixed header followed by the UTF-8 string fields
+# (action_id, command, cwd, stdout_hash, stderr_hash, *args) joined by NUL,
+# which cannot occur in argv, paths or hex digests. Timestamps are stored
+# as wall-clock fields plus UTC offset so ``isoformat()`` (and hence the
+# action hash) round-trips exactly.
+_ENTRY_HEADER = struct.Struct(
+    "<HBBBBBI"  # year, month, day, hour, minute, second, microsecond
+    "iBBiH"     # utc_offset_s, risk, has_exit, exit_code, nargs
+)
+_NAIVE = -0x80000000
+_RISK_LEVELS = tuple(RiskLevel)
+_RISK_CODES = {level: code for code, level in enumerate(_RISK_LEVELS)}
+
+
+@lru_cache(maxsize=64)
+def _tz(offset_seconds: int) -> Optional[timezone]:
+    if offset_seconds == _NAIVE:
+        return None
+    return timezone.utc if offset_seconds == 0 else timezone(timedelta(seconds=offset_seconds))
+
+
+def pack_action(action: TerminalAction) -> bytes:
+    """Encode an action as a WAL entry payload."""
+    fields = [
+        action.action_id, action.command, action.cwd,
+        action.stdout_hash, action.stderr_hash, *action.args,
+    ]
+    text = "\0".join(fields)
+    if text.count("\0") != len(fields) - 1:
+        raise ValueError("WAL entry fields must not contain NUL characters")
+    
+    ts = action.timestamp
+    offset = ts.utcoffset()
+    header = _ENTRY_HEADER.pack(
+        ts.year, ts.month, ts.day, ts.hour, ts.minute, ts.second, ts.microsecond,
+        _NAIVE if offset is None else offset // timedelta(seconds=1),
+        _RISK_CODES[action.risk_level],
+        action.exit_code is not None,
+        action.exit_code or 0,
+        len(action.args),
+    )
+    return header + text.encode()
+
+
+def unpack_action(session_id: str, payload: bytes) -> TerminalAction:
+    """Decode a WAL entry payload produced by ``pack_action``."""
+    (year, month, day, hour, minute, second, microsecond,
+     utc_offset, risk, has_exit, exit_code, nargs) = _ENTRY_HEADER.unpack_from(payload)
+    fields = payload[_ENTRY_HEADER.size:].decode().split("\0")
+    if len(fields) != 5 + nargs:
+        raise ValueError(f"Expected {5 + nargs} fields, found {len(fields)}")
+    
+    # Positional (field order) construction: keyword arguments cost ~40%
+    # more on the recovery hot path
+    return TerminalAction(
+        fields[0],                     # action_id
+        session_id,
+        datetime(year, month, day, hour, minute, second, microsecond, _tz(utc_offset)),
+        fields[1],                     # command
+        fields[5:],                    # args
+        fields[2],                     # cwd
+        _RISK_LEVELS[risk],
+        exit_code if has_exit else None,
+        fields[3],                     # stdout_hash
+        fields[4],                     # stderr_hash
+    )
+
+
+def decode_entries(session_id: str, entries: Iterable[Tuple[int, bytes]]) -> List[TerminalAction]:
+    """Decode a session's ``(sequence, payload)`` WAL entries, skipping bad ones."""
+    actions = []
+    for sequence, payload in entries:
+        try:
+            actions.append(unpack_action(session_id, payload))
+        except (struct.error, IndexError, ValueError) as e:
+            logger.warning(f"Skipping undecodable WAL entry {sequence} for {session_id}: {e}")
+    return actions
+
+
+def rebuild_session(
+    project_root: str,
+    session_id: str,
+    entries: Iterable[Tuple[int, bytes]],
+) -> Tuple[TerminalSession, Dict[str, int]]:
+    """Rebuild a session, with its hash tree, and leaf index from WAL entries.
+    
+    Each action is hashed once, straight into the session's tree.
+    """
+    session = TerminalSession(session_id=session_id, project_root=project_root)
+    session.merkle_tree()
+    leaf_index: Dict[str, int] = {}
+    for action in decode_entries(session_id, entries):
+        session.add_action(action)
+        leaf_index[action.action_id] = len(session.actions) - 1
+    return session, leaf_index
+
+
+def _rebuild_batch(
+    project_root: str,
+    batch: List[Tuple[str, List[Tuple[int, bytes]]]],
+) -> List[Tuple[TerminalSession, Dict[str, int]]]:
+    # Module level so it can run in a ProcessPoolExecutor
+    return [rebuild_session(project_root, session_id, entries) for session_id, entries in batch]
 
 
 class WriteAheadLog:
-    """Encrypted Write-Ahead Log for session durability.
+    """Per-session view of the shared, segmented Write-Ahead Log.
     
     Actions are written to WAL before updating the in-memory tree,
     ensuring we can recover the session state after a crash.
+    
+    Records live in a ``SegmentedLog`` shared by every session; appends
+    and checkpoints go through its group-commit writer when it has one,
+    otherwise they are written and fsynced inline.
     """
     
-    def __init__(self, session_id: str, wal_dir: str = "~/.talos/sessions"):
+    def __init__(self, session_id: str, log: SegmentedLog):
         self.session_id = session_id
-        self.wal_dir = os.path.expanduser(wal_dir)
-        self.wal_path = os.path.join(self.wal_dir, f"{session_id}.wal")
-        self.sequence = 0
-        
-        os.makedirs(self.wal_dir, exist_ok=True)
+        self.log = log
+        self.sequence = log.high_sequence(session_id) + 1
+    
+    def _encode(self, action: TerminalAction) -> Tuple[int, bytes]:
+        sequence = self.sequence
+        self.sequence += 1
+        return sequence, pack_action(action)
     
     def append(self, action: TerminalAction) -> None:
-        """Append an action to the WAL (sync write for durability)."""
-        entry = WALEntry(
-            sequence=self.sequence,
-            action_id=action.action_id,
-            session_id=action.session_id,
-            timestamp=action.timestamp.isoformat(),
-            command=action.command,
-            args=action.args,
-            cwd=action.cwd,
-            risk_level=action.risk_level.value
-        )
-        
-        with open(self.wal_path, 'a') as f:
-            f.write(json.dumps(asdict(entry)) + "\n")
-            f.flush()
-            os.fsync(f.fileno())  # Force write to disk
+        """Append an action to the WAL (sync write when the log has no writer)."""
+        sequence, payload = self._encode(action)
+        self.log.append(self.session_id, sequence, payload)
+    
+    def append_async(self, action: TerminalAction) -> "asyncio.Future[None]":
+        """Queue an action for group commit.
         
-        self.sequence += 1
+        The entry's position in the log is fixed when this returns; the
+        returned future resolves once it is durable.
+        """
+        sequence, payload = self._encode(action)
+        future = self.log.append(self.session_id, sequence, payload)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(None)
+        return future
+    
+    async def sync(self) -> None:
+        """Wait until every entry appended so far is durable."""
+        await self.log.sync()
     
     def recover(self) -> List[TerminalAction]:
-        """Recover actions from WAL after crash."""
-        actions = []
-        
-        if not os.path.exists(self.wal_path):
-            return actions
-        
-        with open(self.wal_path, 'r') as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                data = json.loads(line)
-                action = TerminalAction(
-                    action_id=data["action_id"],
-                    session_id=data["session_id"],
-                    timestamp=datetime.fromisoformat(data["timestamp"]),
-                    command=data["command"],
-                    args=data["args"],
-                    cwd=data["cwd"],
-                    risk_level=RiskLevel(data["risk_level"])
-                )
-                actions.append(action)
+        """Recover actions from WAL after crash.
         
+        Records that fail their CRC (e.g. a torn write) end the scan of
+        their segment during ``SegmentedLog.load`` and are never returned.
+        """
+        actions = decode_entries(self.session_id, self.log.records(self.session_id))
+        self.sequence = max(self.sequence, self.log.high_sequence(self.session_id) + 1)
         return actions
     
     def truncate(self) -> None:
-        """Truncate WAL after successful anchor (checkpoint)."""
-        if os.path.exists(self.wal_path):
-            os.truncate(self.wal_path, 0)
-        self.sequence = 0
+        """Checkpoint the whole WAL after successful anchor (index update only)."""
+        self.log.checkpoint(self.session_id, self.sequence - 1)
+    
+    async def checkpoint(self, through_sequence: int) -> None:
+        """Drop entries up to and including ``through_sequence``.
+        
+        Entries appended after the anchored snapshot stay live. Returns
+        once the checkpoint marker is durable.
+        """
+        future = self.log.checkpoint(self.session_id, through_sequence)
+        if future is not None:
+            await future
 
 
 class SessionManager:
@@ -104,33 +203,104 @@ class SessionManager:
     
     Features:
     - Ephemeral in-memory Merkle trees for action tracking
-    - Write-Ahead Log for crash recovery
-    - Periodic anchoring to global audit chain
+    - Persistent per-session hash trees for inclusion/consistency proofs
+    - Shared segmented Write-Ahead Log for crash recovery, group-committed
+      off the event loop
+    - Periodic anchoring to global audit chain with bounded concurrency,
+      batched submissions and jittered per-session deadlines
+    - Durable anchor outbox with backoff, circuit breaking and
+      at-least-once delivery of every anchored root
     - Session lifecycle management
+    - Parallel recovery of every logged session at startup
     """
     
     ANCHOR_INTERVAL = timedelta(minutes=10)
+    # Deadlines fall in the last ANCHOR_JITTER fraction of the interval, so
+    # sessions created (or recovered) together don't all come due at once
+    ANCHOR_JITTER = 0.25
+    ANCHOR_TICK_SECONDS = 60
+    RECOVERY_BATCH_SIZE = 64
+    # Backoff between failed startup recovery attempts (equal jitter)
+    RECOVERY_RETRY_BASE_SECONDS = 1.0
+    RECOVERY_RETRY_MAX_SECONDS = 60.0
     
     def __init__(
         self,
         project_root: str,
-        anchor_callback: Optional[Callable[[str, str], Any]] = None,
+        anchor_callback: Optional[Callable[..., Any]] = None,
+        anchor_batch_callback: Optional[Callable[[List[AnchorEvent]], Any]] = None,
+        anchor_concurrency: Optional[int] = None,
+        anchor_batch_size: Optional[int] = None,
         wal_dir: Optional[str] = None,
+        wal_commit_window_ms: Optional[float] = None,
+        wal_max_batch: Optional[int] = None,
+        wal_segment_bytes: Optional[int] = None,
     ):
         self.project_root = project_root
         self.anchor_callback = anchor_callback
+        self.anchor_batch_callback = anchor_batch_callback
+        self.anchor_concurrency = max(1, anchor_concurrency or int(os.getenv("TALOS_ANCHOR_CONCURRENCY", "8")))
+        self.anchor_batch_size = max(1, anchor_batch_size or int(os.getenv("TALOS_ANCHOR_BATCH_SIZE", "100")))
         self.wal_dir = wal_dir or os.getenv("TALOS_TERMINAL_SESSION_DIR", "~/.talos/sessions")
+        self.wal_writer = GroupCommitWriter(
+            commit_window_ms=(
+                wal_commit_window_ms if wal_commit_window_ms is not None
+                else float(os.getenv("TALOS_WAL_COMMIT_WINDOW_MS", "2"))
+            ),
+            max_batch=wal_max_batch or int(os.getenv("TALOS_WAL_MAX_BATCH", "256")),
+        )
+        self.wal_log = SegmentedLog(
+            self.wal_dir,
+            segment_bytes=wal_segment_bytes or int(
+                os.getenv("TALOS_WAL_SEGMENT_BYTES", str(DEFAULT_SEGMENT_BYTES))
+            ),
+            writer=self.wal_writer,
+        )
         self.sessions: Dict[str, TerminalSession] = {}
         self.wals: Dict[str, WriteAheadLog] = {}
+        
+        # Roots bound for the audit service go through a durable outbox
+        # stored next to the WAL; without callbacks anchoring is local only
+        self.outbox: Optional[AnchorOutbox] = None
+        if anchor_callback or anchor_batch_callback:
+            self.outbox = AnchorOutbox(
+                os.path.join(self.wal_log.directory, "outbox"),
+                send=self._send_anchor,
+                send_batch=anchor_batch_callback,
+                on_delivered=self._finish_anchor,
+                writer=self.wal_writer,
+                concurrency=self.anchor_concurrency,
+                batch_size=self.anchor_batch_size,
+            )
         self._anchor_task: Optional[asyncio.Task] = None
         self._last_anchor: Dict[str, datetime] = {}
+        self._next_anchor: Dict[str, datetime] = {}
+        
+        # Proof support: action_id -> leaf index in the session's hash
+        # tree, and the (tree_size, merkle_root) of every successful anchor
+        # per session
+        self._leaf_index: Dict[str, Dict[str, int]] = {}
+        self.anchor_history: Dict[str, List[Tuple[int, str]]] = {}
+        
+        # Startup recovery progress (see recover_all)
+        self.recovery: Dict[str, Any] = {
+            "state": "idle",
+            "sessions_total": 0,
+            "sessions_recovered": 0,
+            "actions_recovered": 0,
+            "seconds": None,
+            "error": None,
+            "attempts": 0,
+        }
     
     def create_session(self) -> TerminalSession:
         """Create a new terminal session."""
         session = TerminalSession(project_root=self.project_root)
+        session.merkle_tree()
         self.sessions[session.session_id] = session
-        self.wals[session.session_id] = WriteAheadLog(session.session_id, self.wal_dir)
+        self.wals[session.session_id] = WriteAheadLog(session.session_id, self.wal_log)
         self._last_anchor[session.session_id] = datetime.utcnow()
+        self._schedule_anchor(session.session_id)
         
         logger.info(f"Created session {session.session_id}")
         return session
@@ -152,7 +322,7 @@ class SessionManager:
             if s.is_active
         ]
     
-    def record_action(
+    async def record_action(
         self,
         session_id: str,
         command: str,
@@ -161,30 +331,46 @@ class SessionManager:
         risk_level: RiskLevel,
         exit_code: Optional[int] = None,
         stdout: str = "",
-        stderr: str = ""
+        stderr: str = "",
+        stdout_hash: Optional[str] = None,
+        stderr_hash: Optional[str] = None,
     ) -> str:
         """Record an action to a session.
         
+        ``stdout_hash``/``stderr_hash`` take precomputed digests (e.g. from
+        streamed capture) in place of hashing the ``stdout``/``stderr`` text.
+        
+        The entry is group-committed with concurrent appends, and the
+        action only enters the session (and its Merkle root) once it is
+        durable; if the commit fails the error propagates and the session
+        is left untouched. Durability futures resolve in log order, so
+        Merkle order still matches log order.
+        
         Returns the action's audit hash.
         """
         session = self.sessions.get(session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
+        if stdout_hash is None:
+            stdout_hash = hashlib.sha256(stdout.encode()).hexdigest()[:16] if stdout else ""
+        if stderr_hash is None:
+            stderr_hash = hashlib.sha256(stderr.encode()).hexdigest()[:16] if stderr else ""
+        
         action = TerminalAction(
             command=command,
             args=args,
             cwd=cwd,
             risk_level=risk_level,
             exit_code=exit_code,
-            stdout_hash=hashlib.sha256(stdout.encode()).hexdigest()[:16] if stdout else "",
-            stderr_hash=hashlib.sha256(stderr.encode()).hexdigest()[:16] if stderr else "",
+            stdout_hash=stdout_hash,
+            stderr_hash=stderr_hash,
         )
         
-        # 1. Write to WAL first (durability)
+        # 1. Write to WAL first and wait for group commit (durability)
         wal = self.wals.get(session_id)
         if wal:
-            wal.append(action)
+            await wal.append_async(action)
         
         # 2. Add to in-memory session tree
         audit_hash = session.add_action(action)
@@ -192,44 +378,159 @@ class SessionManager:
         logger.debug(f"Recorded action {action.action_id}: {command}")
         return audit_hash
     
+    def _schedule_anchor(
+        self,
+        session_id: str,
+        window: Optional[timedelta] = None,
+        jitter: Optional[float] = None,
+    ) -> None:
+        """Set a session's next anchor deadline.
+        
+        The deadline is a random point in the last ``jitter`` fraction of
+        ``window`` (default: ``ANCHOR_JITTER`` of ``ANCHOR_INTERVAL``).
+        """
+        window = window or self.ANCHOR_INTERVAL
+        spread = window * (self.ANCHOR_JITTER if jitter is None else jitter)
+        self._next_anchor[session_id] = datetime.utcnow() + window - spread * random.random()
+    
+    def _anchor_due(self, session_id: str) -> bool:
+        return datetime.utcnow() >= self._next_anchor.get(session_id, datetime.min)
+    
+    def _anchor_snapshot(self, session_id: str) -> Optional[AnchorEvent]:
+        """Capture the session's current root as an anchor event.
+        
+        The event's timestamp is that of the last action it covers (or the
+        session's creation), so the same ``(action_count, merkle_root)``
+        always yields the same event ID *and* the same event content.
+        """
+        session = self.sessions.get(session_id)
+        if not session:
+            return None
+        if session.actions:
+            as_of = session.actions[-1].timestamp
+        else:
+            as_of = session.created_at
+        if as_of.tzinfo is None:
+            as_of = as_of.replace(tzinfo=timezone.utc)
+        wal = self.wals.get(session_id)
+        return AnchorEvent(
+            session_id=session_id,
+            merkle_root=session.compute_merkle_root(),
+            action_count=len(session.actions),
+            through_sequence=wal.sequence - 1 if wal else -1,
+            created_at=as_of.timestamp(),
+        )
+    
+    def _anchored_state(self, event: AnchorEvent) -> Optional[str]:
+        """Whether this root was already anchored ("anchored") or is queued
+        ("pending"); None if it is new."""
+        state = (event.action_count, event.merkle_root)
+        history = self.anchor_history.get(event.session_id)
+        if history and history[-1] == state:
+            return "anchored"
+        pending = self.outbox.pending_tail(event.session_id) if self.outbox else None
+        if pending is not None and (pending.action_count, pending.merkle_root) == state:
+            return "pending"
+        return None
+    
+    async def _send_anchor(self, event: AnchorEvent) -> None:
+        # The event ID and timestamp are fixed at snapshot time, so
+        # retries resubmit the same event
+        await self.anchor_callback(event.session_id, event.merkle_root,
+                                   event_id=event.event_id, ts=event.ts)
+    
+    async def _finish_anchor(self, event: AnchorEvent) -> None:
+        """Checkpoint the WAL and record history once a root is anchored."""
+        # Entries appended while the root was in flight are kept
+        future = self.wal_log.checkpoint(event.session_id, event.through_sequence)
+        if future is not None:
+            await future
+        
+        self._last_anchor[event.session_id] = datetime.utcnow()
+        if event.session_id in self.sessions:
+            self.anchor_history.setdefault(event.session_id, []).append(
+                (event.action_count, event.merkle_root)
+            )
+        logger.info(f"Anchored session {event.session_id}: {event.merkle_root[:16]}...")
+    
     async def anchor_session(self, session_id: str, immediate: bool = False) -> Optional[str]:
         """Anchor a session's Merkle root to the global audit chain.
         
+        The root is queued in the outbox before it is submitted. If the
+        submission fails (or waits behind an earlier root of the same
+        session) it stays queued and is retried in the background.
+        
         Args:
             session_id: Session to anchor
-            immediate: If True, anchor even if interval hasn't elapsed
+            immediate: If True, anchor even if the session isn't due yet
             
         Returns:
-            The anchored Merkle root, or None if skipped
+            The anchored Merkle root, or None if skipped or still queued
         """
-        session = self.sessions.get(session_id)
-        if not session:
-            return None
-        
         # Check if we should anchor
-        last = self._last_anchor.get(session_id, datetime.min)
-        if not immediate and datetime.utcnow() - last < self.ANCHOR_INTERVAL:
+        if not immediate and not self._anchor_due(session_id):
             return None
         
-        merkle_root = session.compute_merkle_root()
-        
-        # Call anchor callback (e.g., to Talos Audit Service)
-        if self.anchor_callback:
-            try:
-                await self.anchor_callback(session_id, merkle_root)
-            except Exception as e:
-                logger.error(f"Anchor callback failed: {e}")
-                return None
+        event = self._anchor_snapshot(session_id)
+        if event is None:
+            return None
+        if self._anchored_state(event) == "anchored":
+            # Nothing changed since the last anchor; don't resubmit it
+            self._schedule_anchor(session_id)
+            return event.merkle_root
         
-        # Truncate WAL after successful anchor
+        # Only anchor a root whose actions are all durable
         wal = self.wals.get(session_id)
         if wal:
-            wal.truncate()
+            await wal.sync()
         
-        self._last_anchor[session_id] = datetime.utcnow()
-        logger.info(f"Anchored session {session_id}: {merkle_root[:16]}...")
+        self._schedule_anchor(session_id)
+        if self.outbox is None:
+            await self._finish_anchor(event)
+            return event.merkle_root
         
-        return merkle_root
+        event = await self.outbox.put(event)
+        if not await self.outbox.deliver([event]):
+            return None
+        return event.merkle_root
+    
+    async def anchor_due_sessions(self) -> int:
+        """Anchor every active session whose deadline has passed.
+        
+        All due roots are queued in the outbox under one durability
+        barrier and then submitted: in chunks of ``anchor_batch_size``
+        with an ``anchor_batch_callback``, otherwise one by one through
+        ``anchor_callback``. At most ``anchor_concurrency`` submissions are
+        in flight at once.
+        
+        Returns:
+            Number of sessions anchored
+        """
+        due = [
+            session_id for session_id, session in list(self.sessions.items())
+            if session.is_active and self._anchor_due(session_id)
+        ]
+        if not due:
+            return 0
+        
+        events = [event for event in map(self._anchor_snapshot, due) if event is not None]
+        for session_id in due:
+            self._schedule_anchor(session_id)
+        # Unchanged sessions are already anchored or waiting in the outbox
+        events = [event for event in events if self._anchored_state(event) is None]
+        if not events:
+            return 0
+        # One durability barrier covers every session in the shared log
+        await self.wal_log.sync()
+        
+        if self.outbox is None:
+            for event in events:
+                await self._finish_anchor(event)
+            return len(events)
+        
+        queued = [self.outbox.enqueue(event) for event in events]
+        await asyncio.gather(*(future for _, future in queued if future is not None))
+        return await self.outbox.deliver([event for event, _ in queued])
     
     async def close_session(self, session_id: str) -> Optional[str]:
         """Close a session and anchor its final state."""
@@ -245,37 +546,244 @@ class SessionManager:
         logger.info(f"Closed session {session_id}")
         return merkle_root
     
-    def recover_session(self, session_id: str) -> Optional[TerminalSession]:
-        """Recover a session from WAL after crash."""
-        wal = WriteAheadLog(session_id)
-        actions = wal.recover()
+    def _sync_tree(self, session: TerminalSession) -> MerkleTree:
+        """Return a session's hash tree, catching its leaf index up."""
+        tree = session.merkle_tree()
+        index = self._leaf_index.get(session.session_id)
+        if index is None or len(index) > tree.size:
+            index = self._leaf_index[session.session_id] = {}
+        for position in range(len(index), tree.size):
+            index[session.actions[position].action_id] = position
+        return tree
+    
+    def inclusion_proof(self, session_id: str, action_id: str) -> Optional[Dict[str, Any]]:
+        """Build an inclusion proof for an action against the current root.
         
-        if not actions:
+        Returns None if the session or action is unknown. Verify with
+        ``merkle.verify_inclusion``.
+        """
+        session = self.sessions.get(session_id)
+        if not session:
             return None
+        tree = self._sync_tree(session)
+        leaf_index = self._leaf_index[session_id].get(action_id)
+        if leaf_index is None:
+            return None
+        
+        return {
+            "session_id": session_id,
+            "action_id": action_id,
+            "leaf_index": leaf_index,
+            "leaf_hash": tree.levels[0][leaf_index],
+            "tree_size": tree.size,
+            "merkle_root": tree.root(),
+            "proof": tree.inclusion_proof(leaf_index),
+        }
+    
+    def consistency_proof(
+        self,
+        session_id: str,
+        first_root: str,
+        second_root: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Build a consistency proof between two anchored roots of a session.
         
-        session = TerminalSession(session_id=session_id)
-        for action in actions:
-            session.actions.append(action)
+        ``second_root`` defaults to the latest anchored root. Returns None
+        if the session is unknown; raises ValueError if either root was
+        never anchored or the roots are out of order. Verify with
+        ``merkle.verify_consistency``.
+        """
+        session = self.sessions.get(session_id)
+        if not session:
+            return None
+        tree = self._sync_tree(session)
+        anchors = self.anchor_history.get(session_id, [])
+        sizes = {root: size for size, root in reversed(anchors)}
         
-        self.sessions[session_id] = session
-        self.wals[session_id] = wal
+        if second_root is None and anchors:
+            second_root = anchors[-1][1]
+        if first_root not in sizes or second_root not in sizes:
+            raise ValueError("Root was not anchored for this session")
+        first_size, second_size = sizes[first_root], sizes[second_root]
+        if first_size > second_size:
+            raise ValueError("first_root must precede second_root")
         
-        logger.info(f"Recovered session {session_id} with {len(actions)} actions")
+        return {
+            "session_id": session_id,
+            "first_size": first_size,
+            "first_root": first_root,
+            "second_size": second_size,
+            "second_root": second_root,
+            "proof": tree.consistency_proof(first_size, second_size),
+        }
+    
+    def _register_recovered(
+        self,
+        session: TerminalSession,
+        leaf_index: Dict[str, int],
+    ) -> None:
+        self.sessions[session.session_id] = session
+        self.wals[session.session_id] = WriteAheadLog(session.session_id, self.wal_log)
+        self._leaf_index[session.session_id] = leaf_index
+        # Unanchored work is waiting: spread deadlines over the next two ticks
+        self._schedule_anchor(
+            session.session_id, timedelta(seconds=self.ANCHOR_TICK_SECONDS * 2), jitter=1.0
+        )
+    
+    def recover_session(self, session_id: str) -> Optional[TerminalSession]:
+        """Recover a session from WAL after crash."""
+        session, leaf_index = rebuild_session(
+            self.project_root, session_id, self.wal_log.records(session_id)
+        )
+        if not session.actions:
+            return None
+        
+        self._register_recovered(session, leaf_index)
+        logger.info(f"Recovered session {session_id} with {len(session.actions)} actions")
         return session
     
+    async def recover_all(
+        self,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> int:
+        """Recover every session with live WAL entries.
+        
+        The log is scanned once off the event loop; sessions are then
+        decoded and their Merkle state rebuilt in batches on ``executor``
+        (a thread pool of ``max_workers`` by default; a
+        ``ProcessPoolExecutor`` also works). Each batch is registered as it
+        completes and progress is published in ``self.recovery``. Recovered
+        sessions come due for anchoring at staggered points over the next
+        two anchor loop ticks. Sessions already registered are left alone.
+        
+        Returns:
+            Number of sessions recovered
+        """
+        progress = self.recovery
+        progress.update(state="running", sessions_recovered=0, actions_recovered=0,
+                        seconds=None, error=None)
+        start = time.perf_counter()
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="talos-recovery")
+        
+        def _submit_batches() -> List[Any]:
+            self.wal_log.load()
+            progress["sessions_total"] = len(self.wal_log.sessions())
+            futures, batch = [], []
+            for session_id, entries in self.wal_log.iter_sessions():
+                if session_id in self.sessions:
+                    progress["sessions_total"] -= 1
+                    continue
+                batch.append((session_id, entries))
+                if len(batch) >= self.RECOVERY_BATCH_SIZE:
+                    futures.append(executor.submit(_rebuild_batch, self.project_root, batch))
+                    batch = []
+            if batch:
+                futures.append(executor.submit(_rebuild_batch, self.project_root, batch))
+            return futures
+        
+        try:
+            futures = await asyncio.to_thread(_submit_batches)
+            for completed in asyncio.as_completed([asyncio.wrap_future(f) for f in futures]):
+                for session, leaf_index in await completed:
+                    if not session.actions or session.session_id in self.sessions:
+                        continue
+                    self._register_recovered(session, leaf_index)
+                    progress["sessions_recovered"] += 1
+                    progress["actions_recovered"] += len(session.actions)
+        except BaseException as e:
+            progress.update(state="failed", error=str(e) or type(e).__name__)
+            raise
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+            progress["seconds"] = time.perf_counter() - start
+        
+        progress["state"] = "complete"
+        logger.info(
+            f"Recovered {progress['sessions_recovered']} sessions "
+            f"({progress['actions_recovered']} actions) in {progress['seconds'] * 1000:.1f}ms"
+        )
+        return progress["sessions_recovered"]
+    
+    async def recover_with_retry(
+        self,
+        max_workers: Optional[int] = None,
+        executor_factory: Optional[Callable[[], Optional[Executor]]] = None,
+    ) -> int:
+        """Run ``recover_all`` until it succeeds.
+        
+        Failed attempts are logged and retried with exponential backoff
+        and jitter (``RECOVERY_RETRY_BASE_SECONDS`` up to
+        ``RECOVERY_RETRY_MAX_SECONDS``). Meanwhile ``self.recovery`` shows
+        state "failed" with the last error and the attempt count, and
+        ``ready`` stays False. ``executor_factory`` supplies a fresh
+        executor per attempt; each is shut down afterwards.
+        
+        Returns:
+            Number of sessions recovered by the successful attempt
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.recovery["attempts"] = attempt
+            executor = executor_factory() if executor_factory else None
+            try:
+                return await self.recover_all(max_workers=max_workers, executor=executor)
+            except Exception as e:
+                delay = min(self.RECOVERY_RETRY_MAX_SECONDS,
+                            self.RECOVERY_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+                delay = delay / 2 + random.uniform(0, delay / 2)
+                logger.error(f"Session recovery attempt {attempt} failed, retrying in {delay:.1f}s: {e}")
+            finally:
+                if executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            await asyncio.sleep(delay)
+    
+    @property
+    def ready(self) -> bool:
+        """False while startup recovery is running or after it failed."""
+        return self.recovery["state"] not in ("running", "failed")
+    
     async def start_anchor_loop(self) -> None:
         """Start periodic anchoring background task."""
         async def _anchor_loop():
             while True:
-                await asyncio.sleep(60)  # Check every minute
-                for session_id in list(self.sessions.keys()):
-                    if self.sessions.get(session_id, TerminalSession()).is_active:
-                        await self.anchor_session(session_id)
+                await asyncio.sleep(self.ANCHOR_TICK_SECONDS)
+                try:
+                    await self.anchor_due_sessions()
+                except Exception as e:
+                    logger.error(f"Anchoring pass failed: {e}")
+                try:
+                    await self.wal_log.compact()
+                except Exception as e:
+                    logger.error(f"WAL compaction failed: {e}")
         
         self._anchor_task = asyncio.create_task(_anchor_loop())
+        if self.outbox:
+            await self.outbox.start()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Return session and WAL counters."""
+        return {
+            "sessions": len(self.sessions),
+            "wal": self.wal_writer.metrics(),
+            "wal_log": self.wal_log.metrics(),
+            "recovery": dict(self.recovery),
+            "anchor_outbox": self.outbox.metrics() if self.outbox else None,
+        }
+    
+    async def close(self) -> None:
+        """Stop anchoring and flush the WAL writer."""
+        await self.stop_anchor_loop()
+        await self.wal_writer.close()
     
     async def stop_anchor_loop(self) -> None:
-        """Stop the anchor loop."""
+        """Stop the anchor loop and outbox retries."""
+        if self.outbox:
+            await self.outbox.stop()
         if self._anchor_task:
             self._anchor_task.cancel()
             try:
@@ -6,22 +6,27 @@ HIGH_RISK command escalation and Supervisor approval flow.
 """
 
 import json
+import base64
+import asyncio
 import hashlib
 import logging
 import os
+import time
 import uuid
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 import httpx
 
 logger = logging.getLogger("terminal-adapter.tga")
 
 
-from .crypto import sign_json, verify_json_signature, canonical_json
+from .crypto import KEYRING, sign_json, verify_json_signature, canonical_json
 from .classifier import RiskLevel
+from .http_pool import PooledHTTPClient
 
 
 class SupervisorDecision(str, Enum):
@@ -51,6 +56,13 @@ class ActionRequest:
     digest: str = ""
     signature: str = ""
     
+    # Who is asking: the calling principal, its session and capability
+    # scope. Kept local (not sent to TGA); approvals are only reused, and
+    # identical requests only coalesced, for the same requester.
+    principal: str = ""
+    session_id: str = ""
+    scope: str = ""
+    
     def __post_init__(self):
         if not self.action_request_id:
             self.action_request_id = str(uuid.uuid4())
@@ -106,6 +118,75 @@ class ActionRequest:
         }
 
 
+@dataclass
+class ActionPlan:
+    """Several ActionRequests submitted for approval in one envelope.
+    
+    Every request shares the plan's ``plan_id`` and ``trace_id``. The
+    envelope digest covers the requests' digests in order, so the
+    signature binds the whole plan, step order included.
+    """
+    agent_id: str
+    action_requests: List[ActionRequest]
+    intent: str = ""
+    
+    # Auto-generated
+    plan_id: str = ""
+    trace_id: str = ""
+    ts: str = ""
+    digest: str = ""
+    signature: str = ""
+    
+    def __post_init__(self):
+        if not self.plan_id:
+            self.plan_id = str(uuid.uuid4())
+        if not self.trace_id:
+            self.trace_id = str(uuid.uuid4())
+        if not self.ts:
+            self.ts = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        for action_request in self.action_requests:
+            action_request.plan_id = self.plan_id
+            action_request.trace_id = self.trace_id
+        if not self.digest:
+            self.digest = self._compute_digest()
+    
+    def _compute_digest(self) -> str:
+        """Compute SHA-256 digest of the ordered request digests using JCS."""
+        digests = [r.digest for r in self.action_requests]
+        return hashlib.sha256(canonical_json(digests)).hexdigest()
+    
+    def sign(self, private_key: bytes) -> str:
+        """Sign the plan envelope using Ed25519 and JCS.
+        
+        Returns the hex-encoded signature.
+        """
+        data = {
+            "agent_id": self.agent_id,
+            "plan_id": self.plan_id,
+            "trace_id": self.trace_id,
+            "ts": self.ts,
+            "intent": self.intent,
+            "action_request_ids": [r.action_request_id for r in self.action_requests],
+            "digest": self.digest,
+        }
+        sig_bytes = sign_json(data, private_key)
+        self.signature = sig_bytes.hex()
+        return self.signature
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dict."""
+        return {
+            "agent_id": self.agent_id,
+            "plan_id": self.plan_id,
+            "trace_id": self.trace_id,
+            "ts": self.ts,
+            "intent": self.intent,
+            "action_requests": [r.to_dict() for r in self.action_requests],
+            "digest": self.digest,
+            "signature": self.signature,
+        }
+
+
 @dataclass
 class SupervisorResponse:
     """Response from TGA Supervisor."""
@@ -113,6 +194,182 @@ class SupervisorResponse:
     action_request_id: str
     rationale: Optional[str] = None
     minted_capability: Optional[str] = None
+    ttl_seconds: Optional[float] = None  # How long the decision may be reused
+
+
+def _capability_claims(token: Optional[str]) -> Dict[str, Any]:
+    """Unverified claims of a JSON capability or JWT ({} if unreadable)."""
+    if not token:
+        return {}
+    try:
+        if token.startswith("ey"):
+            payload = token.split(".")[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        else:
+            claims = json.loads(token)
+            claims = claims.get("data", claims)
+    except (ValueError, TypeError, AttributeError, IndexError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def capability_scope(token: Optional[str]) -> Optional[str]:
+    """Return the ``scope`` a capability grants, if it names one.
+    
+    Not verified here; only used to keep cached approvals apart.
+    """
+    scope = _capability_claims(token).get("scope")
+    return str(scope) if scope is not None else None
+
+
+def capability_expiry(token: Optional[str]) -> Optional[float]:
+    """Return a capability's expiry as a Unix timestamp, if it carries one.
+    
+    Understands JSON capabilities (``{"data": {...}, "signature": ...}``)
+    and JWTs, reading ``exp`` (seconds) or ``expires_at`` (ISO-8601).
+    The signature is not checked here; the expiry is only ever used to
+    shorten how long an approval is cached.
+    """
+    claims = _capability_claims(token)
+    try:
+        if "exp" in claims:
+            return float(claims["exp"])
+        if "expires_at" in claims:
+            return datetime.fromisoformat(claims["expires_at"].replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        pass
+    return None
+
+
+# Approval cache key: (agent_id, proposal digest, risk level, principal,
+# session_id, capability scope)
+ApprovalKey = Tuple[str, str, RiskLevel, str, str, str]
+
+
+class ApprovalCache:
+    """Bounded LRU of Supervisor approvals keyed on the request and its requester.
+    
+    The key is ``(agent_id, digest, risk_level)`` plus the requesting
+    ``principal``, ``session_id`` and capability ``scope``, so one caller's
+    approval is never reused for another caller sending the same command.
+    
+    Only APPROVED decisions for ``risk_levels`` are stored. Each entry
+    expires after ``ttl_seconds``, or sooner if the Supervisor response
+    carries a shorter ``ttl_seconds`` or its minted capability expires
+    first. A ``ttl_seconds`` of 0 in the response opts that decision out
+    of caching.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 300.0,
+        risk_levels: FrozenSet[RiskLevel] = frozenset({RiskLevel.WRITE}),
+    ):
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self.risk_levels = frozenset(risk_levels)
+        # key -> (monotonic deadline, response)
+        self._entries: "OrderedDict[ApprovalKey, Tuple[float, SupervisorResponse]]" = OrderedDict()
+        
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.revocations = 0
+    
+    @staticmethod
+    def key(action_request: ActionRequest) -> ApprovalKey:
+        """Cache key for a request."""
+        return (
+            action_request.agent_id,
+            action_request.digest,
+            action_request.risk_level,
+            action_request.principal,
+            action_request.session_id,
+            action_request.scope,
+        )
+    
+    def get(self, action_request: ActionRequest) -> Optional[SupervisorResponse]:
+        """Return a live cached approval for the request, if any."""
+        if action_request.risk_level not in self.risk_levels:
+            return None
+        key = self.key(action_request)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return replace(entry[1], action_request_id=action_request.action_request_id)
+    
+    def put(self, action_request: ActionRequest, response: SupervisorResponse) -> bool:
+        """Cache an approval; returns whether it was stored."""
+        if (
+            response.decision != SupervisorDecision.APPROVED
+            or action_request.risk_level not in self.risk_levels
+        ):
+            return False
+        ttl = self.ttl_seconds
+        if response.ttl_seconds is not None:
+            ttl = min(ttl, response.ttl_seconds)
+        expiry = capability_expiry(response.minted_capability)
+        if expiry is not None:
+            ttl = min(ttl, expiry - time.time())
+        if ttl <= 0:
+            return False
+        
+        key = self.key(action_request)
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        self.stores += 1
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+    
+    def revoke(
+        self,
+        digest: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        principal: Optional[str] = None,
+    ) -> int:
+        """Drop cached approvals matching ``digest``, ``agent_id`` and/or ``principal``.
+        
+        With none given, everything is dropped. Returns the number of
+        entries removed.
+        """
+        doomed = [
+            key for key in self._entries
+            if (digest is None or key[1] == digest)
+            and (agent_id is None or key[0] == agent_id)
+            and (principal is None or key[3] == principal)
+        ]
+        for key in doomed:
+            del self._entries[key]
+        self.revocations += len(doomed)
+        return len(doomed)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Return hit-rate and eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "revocations": self.revocations,
+            "size": len(self._entries),
+            "capacity": self.max_size,
+        }
 
 
 class TGAClient:
@@ -122,28 +379,113 @@ class TGAClient:
     - Building ActionRequests for terminal operations
     - Submitting HIGH_RISK commands for Supervisor approval
     - Processing Supervisor decisions
+    
+    One instance is meant to live as long as the adapter: its pooled
+    client keeps connections alive (and multiplexes them over HTTP/2 when
+    available) across approvals. Call ``close()`` on shutdown.
+    
+    With an ``approval_cache``, repeated identical approved actions are
+    answered locally until the approval expires or is revoked. With
+    ``single_flight``, concurrent requests for the same proposal share one
+    Supervisor round trip.
+    
+    ``request_plan_approval`` submits a whole plan to
+    ``/action-requests/batch`` in one call. If TGA answers 404, 405 or 501
+    there, batching is switched off for the client's lifetime and the
+    plan's requests are submitted individually, concurrently. With a
+    ``signing_key`` (the adapter's raw Ed25519 private key), each plan
+    envelope is signed before it is posted.
     """
     
+    LATENCY_WINDOW = 1024
+    
+    # Responses that mean "this TGA has no batch endpoint"
+    _NO_BATCH = {404, 405, 501}
+    
     def __init__(
         self,
         tga_url: Optional[str] = None,
         agent_id: Optional[str] = None,
         supervisor_public_key: Optional[bytes] = None,
-        timeout_seconds: int = 30
+        timeout_seconds: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        approval_cache: Optional[ApprovalCache] = None,
+        single_flight: bool = True,
+        signing_key: Optional[bytes] = None,
     ):
         self.tga_url = tga_url or os.getenv("TALOS_TGA_URL", "http://localhost:8080")
         self.agent_id = agent_id or os.getenv("TALOS_AGENT_ID", "did:key:anonymous")
         self.supervisor_public_key = supervisor_public_key
-        self.timeout = timeout_seconds
-        self._client: Optional[httpx.AsyncClient] = None
+        self.signing_key = signing_key
+        self.timeout = timeout_seconds or float(os.getenv("TALOS_TGA_TIMEOUT_SECONDS", "30"))
+        self.max_connections = max_connections or int(os.getenv("TALOS_TGA_MAX_CONNECTIONS", "32"))
+        self.max_keepalive_connections = max_keepalive_connections or int(
+            os.getenv("TALOS_TGA_MAX_KEEPALIVE", str(self.max_connections))
+        )
+        self.http2 = http2
+        self._transport = transport
+        self._client: Optional[PooledHTTPClient] = None
+        self.approval_cache = approval_cache
+        self.single_flight = single_flight
+        # None = not yet known; probed on the first plan
+        self.batch_supported: Optional[bool] = None
+        self._in_flight: Dict[ApprovalKey, "asyncio.Task[SupervisorResponse]"] = {}
+        
+        # Recent approval round-trip times (seconds) for p50/p99
+        self._latencies: deque = deque(maxlen=self.LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.plans = 0
+    
+    def _http(self) -> PooledHTTPClient:
+        if self._client is None:
+            self._client = PooledHTTPClient(
+                timeout=self.timeout,
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                http2=self.http2,
+                transport=self._transport,
+            )
+        return self._client
     
     async def __aenter__(self):
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._http()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the connection pool."""
         if self._client:
             await self._client.aclose()
+            self._client = None
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Return approval latency percentiles and connection pool counters."""
+        latencies = sorted(self._latencies)
+        
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+        
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "plans": self.plans,
+            "batch_supported": self.batch_supported,
+            "in_flight": len(self._in_flight),
+            "latency_p50_ms": percentile(0.50),
+            "latency_p99_ms": percentile(0.99),
+            "pool": self._client.metrics() if self._client else None,
+            "approval_cache": self.approval_cache.metrics() if self.approval_cache else None,
+        }
     
     def build_action_request(
         self,
@@ -151,7 +493,10 @@ class TGAClient:
         args: List[str],
         cwd: str,
         risk_level: RiskLevel,
-        intent: Optional[str] = None
+        intent: Optional[str] = None,
+        principal: Optional[str] = None,
+        session_id: Optional[str] = None,
+        scope: Optional[str] = None,
     ) -> ActionRequest:
         """Build an ActionRequest for a terminal command.
         
@@ -161,6 +506,9 @@ class TGAClient:
             cwd: Working directory
             risk_level: Risk classification
             intent: Human-readable description (auto-generated if not provided)
+            principal: Calling principal (X-Talos-Principal)
+            session_id: Session the command will run in, if already known
+            scope: Scope of the caller's capability
             
         Returns:
             ActionRequest ready for Supervisor submission
@@ -193,16 +541,170 @@ class TGAClient:
             intent=intent,
             resources=resources,
             proposal=proposal,
+            principal=principal or "",
+            session_id=session_id or "",
+            scope=scope or "",
         )
     
-    async def request_approval(self, action_request: ActionRequest) -> SupervisorResponse:
+    def build_plan(
+        self,
+        action_requests: List[ActionRequest],
+        intent: Optional[str] = None,
+    ) -> ActionPlan:
+        """Bundle ActionRequests (from ``build_action_request``) into a plan.
+        
+        The requests are re-stamped with the plan's ``plan_id`` and
+        ``trace_id``.
+        """
+        if not intent:
+            intent = f"Execute terminal plan of {len(action_requests)} steps"
+        return ActionPlan(agent_id=self.agent_id, action_requests=action_requests, intent=intent)
+    
+    async def request_plan_approval(
+        self,
+        plan: ActionPlan,
+        timeout: Optional[float] = None,
+    ) -> List[SupervisorResponse]:
+        """Submit a plan for Supervisor approval in a single call.
+        
+        Requests answered by the approval cache are left out of the
+        submission. Returns one response per request, in plan order; a
+        request the Supervisor did not decide on is REJECTED.
+        
+        Raises:
+            TGAError: If communication with TGA fails
+            TimeoutError: If Supervisor doesn't respond in time
+        """
+        decisions: Dict[str, SupervisorResponse] = {}
+        pending = []
+        for action_request in plan.action_requests:
+            cached = self.approval_cache.get(action_request) if self.approval_cache else None
+            if cached is not None:
+                decisions[action_request.action_request_id] = cached
+            else:
+                pending.append(action_request)
+        
+        if pending and self.batch_supported is not False:
+            envelope = plan
+            if len(pending) < len(plan.action_requests):
+                # Re-digested over the uncached steps; the original signature no longer applies
+                envelope = replace(plan, action_requests=pending, digest="", signature="")
+            batch = await self._submit_plan(envelope, timeout)
+            if batch is not None:
+                decisions.update(batch)
+                pending = []
+        
+        if pending:
+            responses = await asyncio.gather(
+                *(self.request_approval(r, timeout) for r in pending)
+            )
+            decisions.update((r.action_request_id, r) for r in responses)
+        
+        return [
+            decisions.get(r.action_request_id) or SupervisorResponse(
+                decision=SupervisorDecision.REJECTED,
+                action_request_id=r.action_request_id,
+                rationale="No decision returned for this step",
+            )
+            for r in plan.action_requests
+        ]
+    
+    async def _submit_plan(
+        self,
+        plan: ActionPlan,
+        timeout: Optional[float],
+    ) -> Optional[Dict[str, SupervisorResponse]]:
+        """POST a plan envelope; returns None if TGA has no batch endpoint.
+        
+        The envelope is signed with ``signing_key`` first, if one is set.
+        """
+        if self.signing_key and not plan.signature:
+            plan.sign(self.signing_key)
+        client = self._http()
+        start = time.perf_counter()
+        
+        try:
+            response = await client.post(
+                f"{self.tga_url}/action-requests/batch",
+                json=plan.to_dict(),
+                headers={
+                    "Content-Type": "application/json",
+                    "X-Talos-Principal": self.agent_id,
+                },
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+        except httpx.TimeoutException:
+            self.errors += 1
+            raise TimeoutError("Supervisor approval timed out")
+        except httpx.RequestError as e:
+            self.errors += 1
+            raise TGAError(f"Failed to communicate with TGA: {e}")
+        self._latencies.append(time.perf_counter() - start)
+        self.requests += 1
+        
+        if response.status_code in self._NO_BATCH and self.batch_supported is None:
+            logger.info("TGA has no batch endpoint; submitting plan steps individually")
+            self.batch_supported = False
+            return None
+        self.batch_supported = True
+        self.plans += 1
+        
+        if response.status_code == 403:
+            rationale = response.json().get("detail", "Rejected by policy")
+            return {
+                r.action_request_id: SupervisorResponse(
+                    decision=SupervisorDecision.REJECTED,
+                    action_request_id=r.action_request_id,
+                    rationale=rationale,
+                )
+                for r in plan.action_requests
+            }
+        if response.status_code != 200:
+            raise TGAError(f"TGA returned {response.status_code}: {response.text}")
+        
+        by_id = {r.action_request_id: r for r in plan.action_requests}
+        decisions = {}
+        for data in response.json().get("decisions", []):
+            action_request = by_id.get(data.get("action_request_id"))
+            if action_request is None:
+                continue
+            decision = SupervisorResponse(
+                decision=SupervisorDecision(data.get("decision", "rejected")),
+                action_request_id=action_request.action_request_id,
+                rationale=data.get("rationale"),
+                minted_capability=data.get("minted_capability"),
+                ttl_seconds=data.get("ttl_seconds"),
+            )
+            if self.approval_cache is not None:
+                self.approval_cache.put(action_request, decision)
+            decisions[action_request.action_request_id] = decision
+        return decisions
+    
+    async def request_approval(
+        self,
+        action_request: ActionRequest,
+        timeout: Optional[float] = None,
+        coalesce: bool = True,
+    ) -> SupervisorResponse:
         """Submit an ActionRequest to TGA for Supervisor approval.
         
         This is a BLOCKING call that waits for Supervisor decision.
         For HIGH_RISK commands, the Supervisor may require human approval.
         
+        While a request with the same ``ApprovalCache.key`` (agent_id,
+        digest, risk_level, principal, session_id and scope) is in flight,
+        further callers wait for it and get its decision (or error) under
+        their own ``action_request_id``; the first caller's
+        timeout applies. Cancelling one caller does not cancel the shared
+        request.
+        
         Args:
             action_request: The action to approve
+            timeout: Seconds to wait for this request (defaults to the
+                client's timeout)
+            coalesce: Set False when the caller follows up on its own
+                ``action_request_id`` (polling, callbacks); a coalesced
+                follower's id is never sent to TGA
             
         Returns:
             SupervisorResponse with decision and optional capability
@@ -211,41 +713,165 @@ class TGAClient:
             TGAError: If communication with TGA fails
             TimeoutError: If Supervisor doesn't respond in time
         """
-        if not self._client:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
+        if self.approval_cache is not None:
+            cached = self.approval_cache.get(action_request)
+            if cached is not None:
+                return cached
+        
+        if not (self.single_flight and coalesce):
+            return await self._approve(action_request, timeout)
+        
+        key = ApprovalCache.key(action_request)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._approve(action_request, timeout))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        
+        response = await asyncio.shield(task)
+        return replace(response, action_request_id=action_request.action_request_id)
+    
+    def _forget(self, key: ApprovalKey, task: "asyncio.Task[SupervisorResponse]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved, even if every caller went away
+    
+    async def _approve(
+        self,
+        action_request: ActionRequest,
+        timeout: Optional[float],
+    ) -> SupervisorResponse:
+        response = await self._submit(action_request, timeout)
+        if self.approval_cache is not None:
+            self.approval_cache.put(action_request, response)
+        return response
+    
+    async def _submit(
+        self,
+        action_request: ActionRequest,
+        timeout: Optional[float],
+    ) -> SupervisorResponse:
+        client = self._http()
+        start = time.perf_counter()
         
         try:
-            response = await self._client.post(
+            response = await client.post(
                 f"{self.tga_url}/action-requests",
                 json=action_request.to_dict(),
                 headers={
                     "Content-Type": "application/json",
                     "X-Talos-Principal": self.agent_id,
-                }
+                },
+                timeout=timeout if timeout is not None else self.timeout,
             )
+            self._latencies.append(time.perf_counter() - start)
+            self.requests += 1
             
-            if response.status_code == 200:
-                data = response.json()
-                return SupervisorResponse(
-                    decision=SupervisorDecision(data.get("decision", "rejected")),
-                    action_request_id=action_request.action_request_id,
-                    rationale=data.get("rationale"),
-                    minted_capability=data.get("minted_capability"),
-                )
-            elif response.status_code == 403:
-                return SupervisorResponse(
-                    decision=SupervisorDecision.REJECTED,
-                    action_request_id=action_request.action_request_id,
-                    rationale=response.json().get("detail", "Rejected by policy"),
-                )
-            else:
-                raise TGAError(f"TGA returned {response.status_code}: {response.text}")
+            return self._decision(response, action_request.action_request_id)
                 
         except httpx.TimeoutException:
+            self.errors += 1
             raise TimeoutError("Supervisor approval timed out")
         except httpx.RequestError as e:
+            self.errors += 1
+            raise TGAError(f"Failed to communicate with TGA: {e}")
+    
+    async def get_decision(
+        self,
+        action_request_id: str,
+        timeout: Optional[float] = None,
+    ) -> SupervisorResponse:
+        """Poll the Supervisor's decision on a previously submitted request.
+        
+        Returns an ESCALATE response while the decision is still pending.
+        
+        Raises:
+            TGAError: If the request is unknown or TGA cannot be reached
+            TimeoutError: If TGA doesn't answer in time
+        """
+        client = self._http()
+        try:
+            response = await client.get(
+                f"{self.tga_url}/action-requests/{action_request_id}",
+                headers={"X-Talos-Principal": self.agent_id},
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+            self.requests += 1
+            return self._decision(response, action_request_id)
+        except httpx.TimeoutException:
+            self.errors += 1
+            raise TimeoutError("Supervisor decision poll timed out")
+        except httpx.RequestError as e:
+            self.errors += 1
             raise TGAError(f"Failed to communicate with TGA: {e}")
     
+    @staticmethod
+    def _decision(response: httpx.Response, action_request_id: str) -> SupervisorResponse:
+        """Map a TGA response to a Supervisor decision.
+        
+        200 carries the decision, 202 means the Supervisor has not decided
+        yet (ESCALATE), 403 is a policy rejection.
+        """
+        if response.status_code == 200:
+            data = response.json()
+            return SupervisorResponse(
+                decision=SupervisorDecision(data.get("decision", "rejected")),
+                action_request_id=action_request_id,
+                rationale=data.get("rationale"),
+                minted_capability=data.get("minted_capability"),
+                ttl_seconds=data.get("ttl_seconds"),
+            )
+        elif response.status_code == 202:
+            return SupervisorResponse(
+                decision=SupervisorDecision.ESCALATE,
+                action_request_id=action_request_id,
+            )
+        elif response.status_code == 403:
+            return SupervisorResponse(
+                decision=SupervisorDecision.REJECTED,
+                action_request_id=action_request_id,
+                rationale=response.json().get("detail", "Rejected by policy"),
+            )
+        else:
+            raise TGAError(f"TGA returned {response.status_code}: {response.text}")
+    
+    def verify_decision(self, payload: Dict[str, Any]) -> SupervisorResponse:
+        """Turn a Supervisor decision callback into a SupervisorResponse.
+        
+        The payload is ``{"data": {...}, "signature": <hex>}`` with
+        ``data`` holding ``action_request_id`` and ``decision`` (plus
+        optional ``rationale``, ``minted_capability``, ``ttl_seconds``),
+        signed by the Supervisor over its canonical JSON. Unsigned
+        callbacks are never trusted, so this requires the Supervisor
+        public key.
+        
+        Raises:
+            TGAError: If the key is missing or the signature or payload is invalid
+        """
+        if not self.supervisor_public_key:
+            raise TGAError("No Supervisor public key configured to verify decisions")
+        try:
+            data = payload["data"]
+            signature = bytes.fromhex(payload["signature"])
+            valid = verify_json_signature(data, signature, self.supervisor_public_key)
+        except (KeyError, TypeError, ValueError) as e:
+            raise TGAError(f"Malformed decision callback: {e}")
+        if not valid:
+            raise TGAError("Invalid Supervisor signature on decision callback")
+        try:
+            return SupervisorResponse(
+                decision=SupervisorDecision(data["decision"]),
+                action_request_id=data["action_request_id"],
+                rationale=data.get("rationale"),
+                minted_capability=data.get("minted_capability"),
+                ttl_seconds=data.get("ttl_seconds"),
+            )
+        except (KeyError, ValueError) as e:
+            raise TGAError(f"Malformed decision callback: {e}")
+    
     async def check_capability(
         self,
         scope: str,
@@ -271,21 +897,38 @@ class TGAClient:
         if not capability_token:
             return False
             
-        # If we have a supervisor public key, verify the capability
-        if self.supervisor_public_key:
+        # Default to False for WRITE/HIGH_RISK if no valid token
+        return self.verify_capabilities([capability_token])[0]
+    
+    def verify_capabilities(self, capability_tokens: Sequence[Optional[str]]) -> List[bool]:
+        """Verify the Supervisor signatures on many capability tokens at once.
+        
+        Tokens are JSON strings of the form ``{data: ..., signature: ...}``.
+        The Supervisor key is resolved once for the batch, and payloads
+        seen before reuse their cached canonical encoding. Anything
+        malformed, or every token when no Supervisor key is configured,
+        is False.
+        """
+        results = [False] * len(capability_tokens)
+        if not self.supervisor_public_key:
+            return results
+        
+        positions, items = [], []
+        for i, token in enumerate(capability_tokens):
+            if not token:
+                continue
             try:
                 # Assuming capability_token is JSON string if not starting with 'ey' (JWT)
-                # If it's a JSON string, it should have {data: ..., signature: ...}
-                cap_data = json.loads(capability_token)
+                cap_data = json.loads(token)
                 if "signature" in cap_data and "data" in cap_data:
-                    sig = bytes.fromhex(cap_data["signature"])
-                    return verify_json_signature(cap_data["data"], sig, self.supervisor_public_key)
+                    items.append((cap_data["data"], bytes.fromhex(cap_data["signature"])))
+                    positions.append(i)
             except Exception as e:
                 logger.error(f"Capability verification failed: {e}")
-                return False
-                
-        # Default to False for WRITE/HIGH_RISK if no valid token
-        return False
+        
+        for i, valid in zip(positions, KEYRING.verify_many(items, self.supervisor_public_key)):
+            results[i] = valid
+        return results
 
 
 class TGAError(Exception):
@@ -0,0 +1,741 @@
+"""
+Terminal MCP Adapter - WAL Storage
+
+A segmented, append-only log shared by every session, plus a dedicated
+writer thread that coalesces appends from all sessions into batched writes
+and ``fdatasync`` calls, so a slow disk never stalls the asyncio event loop
+and durability cost is shared by every append that lands in the same
+commit window.
+"""
+
+import os
+import mmap
+import time
+import zlib
+import queue
+import struct
+import asyncio
+import logging
+import functools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from contextlib import ExitStack
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("terminal-adapter.wal")
+
+# fdatasync skips the metadata flush where the platform supports it
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+_STOP = object()
+
+
+def _resolve(future: asyncio.Future, error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+class GroupCommitWriter:
+    """Background writer that batches appends into grouped fdatasync calls.
+
+    Operations are applied strictly in submission order. After picking up
+    an operation, if others are already queued, the thread keeps collecting
+    for up to ``commit_window_ms`` (or ``max_batch`` operations), writes everything,
+    syncs each touched file once and then resolves the callers' futures on
+    their event loops. File handles stay open, bounded by ``max_open_files``.
+
+    A file whose write or sync fails is poisoned: every later append to it
+    fails too (until it is removed), so nothing is acknowledged behind a
+    torn record that recovery would stop at.
+    """
+
+    def __init__(
+        self,
+        commit_window_ms: float = 2.0,
+        max_batch: int = 256,
+        max_open_files: int = 256,
+    ):
+        self.commit_window = max(0.0, commit_window_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self.max_open_files = max(1, max_open_files)
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._files: "OrderedDict[str, BinaryIO]" = OrderedDict()
+        self._failed: Dict[str, BaseException] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.batches = 0
+        self.entries = 0
+        self.syncs = 0
+        self.max_batch_seen = 0
+
+    # ------------------------------------------------------------------
+    # Event loop side
+    # ------------------------------------------------------------------
+
+    def _submit(self, op: Tuple[Any, ...]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="talos-wal-writer", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(op + (loop, future))
+        return future
+
+    def append(self, path: str, data: bytes) -> asyncio.Future:
+        """Queue ``data`` for appending to ``path``.
+
+        Returns a future that resolves once the bytes are on stable storage.
+        Appending ``b""`` acts as a durability barrier for ``path``.
+        """
+        return self._submit(("append", path, data))
+
+    def remove(self, path: str) -> asyncio.Future:
+        """Queue deletion of ``path``, ordered after all earlier appends."""
+        return self._submit(("remove", path, None))
+
+    async def close(self) -> None:
+        """Flush queued operations, stop the thread and close all files."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        await asyncio.to_thread(thread.join)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return batching counters."""
+        return {
+            "batches": self.batches,
+            "entries": self.entries,
+            "syncs": self.syncs,
+            "avg_batch_size": self.entries / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "open_files": len(self._files),
+        }
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            op = self._queue.get()
+            if op is _STOP:
+                break
+            batch = [op]
+            # Only linger for the commit window when other appends are
+            # already queued; a lone writer commits immediately.
+            linger = self.commit_window if not self._queue.empty() else 0.0
+            deadline = time.monotonic() + linger
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    op = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is _STOP:
+                    stopping = True
+                    break
+                batch.append(op)
+            self._commit(batch)
+
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def _open(self, path: str) -> BinaryIO:
+        f = self._files.get(path)
+        if f is not None:
+            self._files.move_to_end(path)
+            return f
+        f = open(path, "ab")
+        self._files[path] = f
+        if len(self._files) > self.max_open_files:
+            # The evicted file may hold unsynced writes from this batch
+            evicted, oldest = self._files.popitem(last=False)
+            try:
+                oldest.flush()
+                _fdatasync(oldest.fileno())
+                self.syncs += 1
+            except Exception as e:
+                logger.error(f"WAL sync failed for {evicted}: {e}")
+                self._failed[evicted] = e
+            finally:
+                oldest.close()
+        return f
+
+    def _commit(self, batch: List[Tuple[Any, ...]]) -> None:
+        dirty: Dict[str, BinaryIO] = {}
+        pending: List[Tuple[str, asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+        for kind, path, payload, loop, future in batch:
+            if kind == "append":
+                failed = self._failed.get(path)
+                if failed is not None:
+                    self._notify(loop, future, OSError(f"WAL file {path} failed earlier: {failed}"))
+                    continue
+                try:
+                    f = self._open(path)
+                    if payload:
+                        f.write(payload)
+                    dirty[path] = f
+                    pending.append((path, loop, future))
+                except Exception as e:
+                    logger.error(f"WAL write failed for {path}: {e}")
+                    self._failed[path] = e
+                    self._notify(loop, future, e)
+            else:
+                # Everything queued before the removal must hit disk first
+                self._sync(dirty, pending)
+                try:
+                    self._remove(path)
+                    self._notify(loop, future, None)
+                except Exception as e:
+                    self._notify(loop, future, e)
+
+        self._sync(dirty, pending)
+        self.batches += 1
+        self.entries += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+
+    def _sync(
+        self,
+        dirty: Dict[str, BinaryIO],
+        pending: List[Tuple[str, asyncio.AbstractEventLoop, asyncio.Future]],
+    ) -> None:
+        for path, f in dirty.items():
+            if f.closed:
+                continue  # Synced when its handle was evicted
+            try:
+                f.flush()
+                _fdatasync(f.fileno())
+                self.syncs += 1
+            except Exception as e:
+                logger.error(f"WAL sync failed for {path}: {e}")
+                self._failed[path] = e
+        # Only appends to a file that failed are failed
+        for path, loop, future in pending:
+            self._notify(loop, future, self._failed.get(path))
+        dirty.clear()
+        pending.clear()
+
+    def _remove(self, path: str) -> None:
+        self._failed.pop(path, None)
+        f = self._files.pop(path, None)
+        if f is not None:
+            f.close()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _notify(
+        loop: asyncio.AbstractEventLoop,
+        future: asyncio.Future,
+        error: Optional[BaseException],
+    ) -> None:
+        try:
+            loop.call_soon_threadsafe(_resolve, future, error)
+        except RuntimeError:
+            pass  # Caller's loop is closed; nobody is waiting any more
+
+
+# ----------------------------------------------------------------------
+# Segmented log
+# ----------------------------------------------------------------------
+
+# Record framing: crc32 | body length | kind | session_id length | sequence,
+# followed by the session_id and the payload. The CRC covers everything
+# after itself.
+_CRC = struct.Struct("<I")
+_HEADER = struct.Struct("<IBBQ")
+_PREFIX = _CRC.size + _HEADER.size
+
+RECORD_ENTRY = 1
+RECORD_CHECKPOINT = 2
+
+SEGMENT_SUFFIX = ".seg"
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+def encode_record(kind: int, session_id: str, sequence: int, payload: bytes) -> bytes:
+    """Frame one log record."""
+    sid = session_id.encode()
+    if len(sid) > 255:
+        raise ValueError("session_id too long for WAL record")
+    body = _HEADER.pack(len(sid) + len(payload), kind, len(sid), sequence) + sid + payload
+    return _CRC.pack(zlib.crc32(body)) + body
+
+
+def scan_records(data: Any, end: Optional[int] = None) -> Iterator[Tuple[int, int, int, str, int, int]]:
+    """Yield ``(offset, size, kind, session_id, sequence, payload_offset)``.
+
+    ``data`` is any buffer (bytes, mmap), scanned up to ``end``. Scanning
+    stops at the first truncated or corrupt record, so a torn tail after a
+    crash simply ends the iteration.
+    """
+    view = memoryview(data)
+    try:
+        offset = 0
+        end = len(view) if end is None else min(end, len(view))
+        while offset + _PREFIX <= end:
+            (crc,) = _CRC.unpack_from(view, offset)
+            length, kind, sid_len, sequence = _HEADER.unpack_from(view, offset + _CRC.size)
+            size = _PREFIX + length
+            if sid_len > length or offset + size > end:
+                return
+            if zlib.crc32(view[offset + _CRC.size:offset + size]) != crc:
+                return
+            sid_end = offset + _PREFIX + sid_len
+            yield offset, size, kind, str(view[offset + _PREFIX:sid_end], "utf-8"), sequence, sid_end
+            offset += size
+    finally:
+        view.release()
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@dataclass
+class Segment:
+    """Bookkeeping for one segment file."""
+    segment_id: int
+    path: str
+    size: int = 0
+    live_records: int = 0
+    live_bytes: int = 0
+
+
+# Location of a record within the log: (segment_id, offset, length). A plain
+# tuple because millions are built while rebuilding the index on startup.
+RecordRef = Tuple[int, int, int]
+
+
+class SegmentedLog:
+    """Append-only log shared by all sessions, split into fixed-size segments.
+
+    Every record carries its ``session_id``, a per-session sequence number
+    and a CRC. An in-memory index maps each session to the locations of its
+    live records, so checkpointing a session after an anchor only updates
+    the index and appends a small checkpoint marker. Sealed segments are
+    deleted once none of their records are live, and ``compact()`` copies
+    the survivors out of mostly-dead segments.
+
+    With a ``GroupCommitWriter`` attached, writes are queued to the writer
+    thread; otherwise they are written and fsynced inline. The directory is
+    scanned (via ``mmap``) lazily on first use, stopping at the first torn
+    or corrupt record in each segment; new appends always go to a fresh
+    segment. A failed write seals the active segment, so later records go
+    to a fresh one instead of landing behind a possibly torn record.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        writer: Optional[GroupCommitWriter] = None,
+    ):
+        self.directory = os.path.expanduser(directory)
+        self.segment_bytes = max(1, segment_bytes)
+        self.writer = writer
+        self.segments: Dict[int, Segment] = {}
+        self._active: Optional[Segment] = None
+        self._index: Dict[str, Dict[int, RecordRef]] = {}
+        self._checkpoints: Dict[str, Tuple[int, RecordRef]] = {}
+        self._high: Dict[str, int] = {}
+        self._loaded = False
+
+        # Metrics
+        self.compactions = 0
+        self.segments_removed = 0
+        self.recovered_records = 0
+        self.recovered_bytes = 0
+        self.discarded_bytes = 0
+        self.recovery_seconds: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, f"{segment_id:08d}{SEGMENT_SUFFIX}")
+
+    def _segment_ids(self) -> List[int]:
+        ids = []
+        for name in os.listdir(self.directory):
+            stem, suffix = os.path.splitext(name)
+            if suffix == SEGMENT_SUFFIX and stem.isdigit():
+                ids.append(int(stem))
+        return sorted(ids)
+
+    def load(self) -> None:
+        """Scan existing segments and rebuild the index (once).
+
+        All or nothing: if the scan fails partway, the partial state is
+        discarded and the next call rescans from scratch.
+        """
+        if self._loaded:
+            return
+        try:
+            self._load()
+        except BaseException:
+            self.segments = {}
+            self._active = None
+            self._index = {}
+            self._checkpoints = {}
+            self._high = {}
+            self.recovered_records = self.recovered_bytes = self.discarded_bytes = 0
+            raise
+        self._loaded = True
+
+    def _load(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        start = time.perf_counter()
+        for segment_id in self._segment_ids():
+            segment = Segment(segment_id, self._path(segment_id))
+            self.segments[segment_id] = segment
+            with open(segment.path, "rb") as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self._scan_segment(segment, mm)
+            self.recovered_bytes += segment.size
+            if segment.size < file_size:
+                self.discarded_bytes += file_size - segment.size
+                logger.warning(
+                    f"Stopped at corrupt or torn record in WAL segment {segment.path}: "
+                    f"recovered {segment.size} of {file_size} bytes"
+                )
+
+        for session_id, (through, _) in list(self._checkpoints.items()):
+            self._drop_through(session_id, through)
+        # Compaction copies may land out of sequence order
+        for session_id, refs in self._index.items():
+            self._index[session_id] = dict(sorted(refs.items()))
+        for segment in list(self.segments.values()):
+            if segment.live_records == 0:
+                self._remove(segment, inline=True)
+
+        self.recovery_seconds = time.perf_counter() - start
+        if self.recovered_records:
+            logger.info(
+                f"Recovered {self.recovered_records} WAL records ({self.recovered_bytes} bytes) "
+                f"in {self.recovery_seconds * 1000:.1f}ms"
+            )
+
+    def _scan_segment(self, segment: Segment, data: Any) -> None:
+        # Hot path on startup: the common entry case is inlined
+        segment_id = segment.segment_id
+        index = self._index
+        high = self._high
+        live_records = live_bytes = records = 0
+        for offset, size, kind, session_id, sequence, _ in scan_records(data):
+            ref = (segment_id, offset, size)
+            segment.size = offset + size
+            records += 1
+            if kind == RECORD_CHECKPOINT:
+                self._set_checkpoint(session_id, sequence, ref)
+                continue
+            refs = index.get(session_id)
+            if refs is None:
+                refs = index[session_id] = {}
+            old = refs.get(sequence)
+            if old is not None:
+                self._release(old)
+            refs[sequence] = ref
+            live_records += 1
+            live_bytes += size
+            if sequence > high.get(session_id, -1):
+                high[session_id] = sequence
+        segment.live_records += live_records
+        segment.live_bytes += live_bytes
+        self.recovered_records += records
+
+    # ------------------------------------------------------------------
+    # Index bookkeeping
+    # ------------------------------------------------------------------
+
+    def _retain(self, ref: RecordRef) -> None:
+        segment = self.segments[ref[0]]
+        segment.live_records += 1
+        segment.live_bytes += ref[2]
+
+    def _release(self, ref: RecordRef) -> None:
+        segment = self.segments.get(ref[0])
+        if segment is not None:
+            segment.live_records -= 1
+            segment.live_bytes -= ref[2]
+
+    def _add_ref(self, session_id: str, sequence: int, ref: RecordRef) -> None:
+        refs = self._index.setdefault(session_id, {})
+        old = refs.get(sequence)
+        if old is not None:
+            self._release(old)
+        refs[sequence] = ref
+        self._retain(ref)
+        self._high[session_id] = max(self._high.get(session_id, -1), sequence)
+
+    def _set_checkpoint(self, session_id: str, through: int, ref: RecordRef) -> None:
+        # Only the latest marker per session is live
+        current = self._checkpoints.get(session_id)
+        if current is not None:
+            if current[0] > through:
+                return
+            self._release(current[1])
+        self._checkpoints[session_id] = (through, ref)
+        self._retain(ref)
+        self._high[session_id] = max(self._high.get(session_id, -1), through)
+
+    def _drop_through(self, session_id: str, through: int) -> None:
+        refs = self._index.get(session_id)
+        if not refs:
+            return
+        for sequence in list(refs):
+            if sequence > through:
+                break
+            self._release(refs.pop(sequence))
+        if not refs:
+            del self._index[session_id]
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _roll(self) -> Segment:
+        sealed = self._active
+        segment_id = max(self.segments) + 1 if self.segments else 0
+        self._active = self.segments[segment_id] = Segment(segment_id, self._path(segment_id))
+        if sealed is not None and sealed.live_records == 0:
+            self._remove(sealed)
+        return self._active
+
+    def _seal(self, segment: Segment) -> None:
+        if self._active is segment:
+            self._active = None
+            logger.warning(f"Sealed WAL segment {segment.path} after a failed write")
+
+    def _write_done(self, segment: Segment, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self._seal(segment)
+
+    def _write(self, record: bytes) -> Tuple[RecordRef, Optional[asyncio.Future]]:
+        segment = self._active
+        if segment is None or (segment.size and segment.size + len(record) > self.segment_bytes):
+            segment = self._roll()
+        ref = (segment.segment_id, segment.size, len(record))
+        segment.size += len(record)
+
+        if self.writer is not None:
+            future = self.writer.append(segment.path, record)
+            future.add_done_callback(functools.partial(self._write_done, segment))
+            return ref, future
+        try:
+            with open(segment.path, "ab") as f:
+                f.write(record)
+                f.flush()
+                _fdatasync(f.fileno())
+        except BaseException:
+            self._seal(segment)
+            raise
+        return ref, None
+
+    def _remove(self, segment: Segment, inline: bool = False) -> Optional[asyncio.Future]:
+        self.segments.pop(segment.segment_id, None)
+        self.segments_removed += 1
+        if self.writer is not None and not inline:
+            return self.writer.remove(segment.path)
+        try:
+            os.remove(segment.path)
+        except FileNotFoundError:
+            pass
+        return None
+
+    def _remove_dead(self) -> None:
+        for segment in list(self.segments.values()):
+            if segment is not self._active and segment.live_records == 0:
+                self._remove(segment)
+
+    def append(self, session_id: str, sequence: int, payload: bytes) -> Optional[asyncio.Future]:
+        """Append an entry for ``session_id``.
+
+        The record's position is fixed when this returns. With a writer
+        attached, returns a future that resolves once it is durable;
+        otherwise the record is already durable and None is returned.
+        """
+        self.load()
+        ref, future = self._write(encode_record(RECORD_ENTRY, session_id, sequence, payload))
+        self._add_ref(session_id, sequence, ref)
+        if future is not None:
+            future.add_done_callback(functools.partial(self._append_done, session_id, sequence, ref))
+        return future
+
+    def _append_done(self, session_id: str, sequence: int, ref: RecordRef, future: asyncio.Future) -> None:
+        # A failed entry never made it into the log; don't index it
+        if future.cancelled() or future.exception() is None:
+            return
+        refs = self._index.get(session_id)
+        if refs is not None and refs.get(sequence) == ref:
+            self._release(refs.pop(sequence))
+            if not refs:
+                del self._index[session_id]
+
+    def checkpoint(self, session_id: str, through_sequence: int) -> Optional[asyncio.Future]:
+        """Drop a session's entries up to and including ``through_sequence``.
+
+        An index update plus a checkpoint marker, so the entries stay dead
+        after a restart. Segments left with no live records are deleted.
+        Returns a future for the marker's durability, as for ``append``.
+        """
+        self.load()
+        current = self._checkpoints.get(session_id)
+        if through_sequence < 0 or (current is not None and current[0] >= through_sequence):
+            return None
+        self._drop_through(session_id, through_sequence)
+        ref, future = self._write(encode_record(RECORD_CHECKPOINT, session_id, through_sequence, b""))
+        self._set_checkpoint(session_id, through_sequence, ref)
+        self._remove_dead()
+        return future
+
+    async def sync(self) -> None:
+        """Wait until every record appended so far is durable."""
+        if self.writer is not None and self._active is not None:
+            await self.writer.append(self._active.path, b"")
+
+    async def compact(self, max_live_ratio: float = 0.5) -> int:
+        """Rewrite sealed segments whose live bytes fall below ``max_live_ratio``.
+
+        Live records are copied to the active segment and the old segment
+        is deleted. Checkpoint markers are dropped once they sit in the
+        oldest segment, since nothing older remains for them to cancel.
+
+        Returns:
+            Number of segments compacted
+        """
+        self.load()
+        compacted = 0
+        for segment in sorted(self.segments.values(), key=lambda s: s.segment_id):
+            if segment is self._active or segment.segment_id not in self.segments:
+                continue
+            if segment.live_bytes >= segment.size * max_live_ratio:
+                continue
+            await self._compact_segment(segment)
+            compacted += 1
+        return compacted
+
+    async def _compact_segment(self, segment: Segment) -> None:
+        if self.writer is not None:
+            await self.writer.append(segment.path, b"")
+        data = await asyncio.to_thread(_read_file, segment.path)
+        oldest = segment.segment_id == min(self.segments)
+
+        pending = []
+        for offset, size, kind, session_id, sequence, _ in scan_records(data[:segment.size]):
+            ref = (segment.segment_id, offset, size)
+            if kind == RECORD_CHECKPOINT:
+                current = self._checkpoints.get(session_id)
+                if current is None or current[1] != ref:
+                    continue
+                if oldest:
+                    self._release(ref)
+                    del self._checkpoints[session_id]
+                    continue
+                new_ref, future = self._write(data[offset:offset + size])
+                self._set_checkpoint(session_id, sequence, new_ref)
+            else:
+                if self._index.get(session_id, {}).get(sequence) != ref:
+                    continue
+                new_ref, future = self._write(data[offset:offset + size])
+                self._add_ref(session_id, sequence, new_ref)
+            if future is not None:
+                pending.append(future)
+
+        removed = self._remove(segment)
+        if removed is not None:
+            pending.append(removed)
+        if pending:
+            await asyncio.gather(*pending)
+        self.compactions += 1
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def sessions(self) -> List[str]:
+        """Sessions that have live entries."""
+        self.load()
+        return list(self._index)
+
+    def high_sequence(self, session_id: str) -> int:
+        """Highest sequence seen for a session (entries or checkpoints), or -1."""
+        self.load()
+        return self._high.get(session_id, -1)
+
+    def _iter_payloads(
+        self, sessions: Iterable[Tuple[str, Dict[int, RecordRef]]]
+    ) -> Iterator[Tuple[str, List[Tuple[int, bytes]]]]:
+        # Records were CRC-checked when the index was built, so payloads are
+        # sliced straight out of one mapping per segment.
+        with ExitStack() as stack:
+            maps: Dict[int, mmap.mmap] = {}
+            for session_id, refs in sessions:
+                skip = _PREFIX + len(session_id.encode())
+                entries = []
+                for sequence, (segment_id, offset, length) in refs.items():
+                    mm = maps.get(segment_id)
+                    if mm is None:
+                        f = stack.enter_context(open(self.segments[segment_id].path, "rb"))
+                        mm = maps[segment_id] = stack.enter_context(
+                            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        )
+                    entries.append((sequence, mm[offset + skip:offset + length]))
+                yield session_id, entries
+
+    def records(self, session_id: str) -> List[Tuple[int, bytes]]:
+        """Read a session's live entries as ``(sequence, payload)`` in order.
+
+        Reads from disk, so call after ``sync()`` if appends are in flight.
+        """
+        self.load()
+        for _, entries in self._iter_payloads([(session_id, self._index.get(session_id, {}))]):
+            return entries
+        return []
+
+    def iter_sessions(self) -> Iterator[Tuple[str, List[Tuple[int, bytes]]]]:
+        """Yield ``(session_id, records)`` for every session with live entries.
+
+        Maps each segment once for the whole pass, so it is much cheaper
+        than per-session ``records()`` calls when recovering many sessions.
+        Do not append while iterating.
+        """
+        self.load()
+        yield from self._iter_payloads(list(self._index.items()))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return segment and index counters."""
+        return {
+            "segments": len(self.segments),
+            "bytes": sum(s.size for s in self.segments.values()),
+            "live_bytes": sum(s.live_bytes for s in self.segments.values()),
+            "sessions": len(self._index),
+            "compactions": self.compactions,
+            "segments_removed": self.segments_removed,
+            "recovered_records": self.recovered_records,
+            "recovered_bytes": self.recovered_bytes,
+            "discarded_bytes": self.discarded_bytes,
+            "recovery_seconds": self.recovery_seconds,
+        }
@@ -9,56 +9,89 @@ MCP Server implementing the Terminal Adapter specification with:
 """
 
 import os
+import json
+import struct
 import asyncio
 import logging
-import json
-import uuid
-import hashlib
-from datetime import datetime, timezone
-from typing import Dict, Optional, List
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum
+from typing import Any, Dict, Optional, List
 from contextlib import asynccontextmanager
 
-import httpx
-from fastapi import FastAPI, HTTPException, Body, Header
+from fastapi import FastAPI, HTTPException, Body, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
 from terminal_adapter.domain import (
     RiskLevel,
-    PolicyManifest,
     CommandClassifier,
+    ManifestWatcher,
+    build_classifier,
     SessionManager,
+    AuditClient,
     TGAClient,
+    ApprovalCache,
+    ApprovalTracker,
+    ApprovalBacklogError,
     SupervisorDecision,
     TGAError,
     PTYExecutor,
+    CappedOutput,
 )
+from terminal_adapter.domain.crypto import crypto_metrics
+from terminal_adapter.domain.tga_client import capability_scope
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("terminal-adapter")
 
+# Output capture limits for terminal:execute. At most MAX_OUTPUT_BYTES of
+# each stream is kept (the last OUTPUT_TAIL_BYTES of them from the end of
+# the stream); the rest is discarded but still hashed.
+MAX_OUTPUT_BYTES = int(os.getenv("TALOS_MAX_OUTPUT_BYTES", "100000"))
+OUTPUT_TAIL_BYTES = int(os.getenv("TALOS_OUTPUT_TAIL_BYTES", "0"))
+_READ_CHUNK_SIZE = 64 * 1024
+
+# terminal:stream coalescing: after output arrives, wait up to
+# STREAM_FLUSH_MS for STREAM_FLUSH_BYTES to accumulate before sending.
+# Idle streams get a comment line every STREAM_HEARTBEAT_SECONDS.
+STREAM_FLUSH_MS = float(os.getenv("TALOS_STREAM_FLUSH_MS", "5"))
+STREAM_FLUSH_BYTES = int(os.getenv("TALOS_STREAM_FLUSH_BYTES", "16384"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("TALOS_STREAM_HEARTBEAT_SECONDS", "15"))
+# terminal:attach sends output unbatched by default so keystrokes echo at once
+ATTACH_FLUSH_MS = float(os.getenv("TALOS_ATTACH_FLUSH_MS", "0"))
+
 
 # ============================================================================
 # Request/Response Models (based on talos-contracts schemas)
 # ============================================================================
 
-class TerminalExecuteRequest(BaseModel):
-    """Request to execute a terminal command."""
+class TerminalPlanStep(BaseModel):
+    """A single command of a plan."""
     command: str = Field(..., description="Binary to execute")
     args: List[str] = Field(default_factory=list, description="Command arguments")
     cwd: Optional[str] = Field(None, description="Working directory")
     env: Optional[Dict[str, str]] = Field(None, description="Environment overrides")
     timeout_ms: int = Field(30000, ge=1000, le=300000, description="Timeout in ms")
+
+
+class TerminalExecuteRequest(TerminalPlanStep):
+    """Request to execute a terminal command."""
     session_id: Optional[str] = Field(None, description="Reuse existing session")
     risk_level: Optional[str] = Field(None, description="Declared risk level")
     idempotency_key: Optional[str] = Field(None, description="For write operations")
+    async_approval: Optional[bool] = Field(
+        None, description="Return a pending ticket instead of waiting for Supervisor approval"
+    )
 
 
 class TerminalExecuteResponse(BaseModel):
     """Response from terminal execution."""
     session_id: str
+    status: str = "completed"  # "pending" when a ticket was issued
+    ticket_id: Optional[str] = None
     exit_code: Optional[int] = None
     stdout: str = ""
     stderr: str = ""
@@ -67,6 +100,81 @@ class TerminalExecuteResponse(BaseModel):
     input_required: bool = False
 
 
+class TerminalExecutePlanRequest(BaseModel):
+    """Request to approve and execute a multi-step plan in one session."""
+    steps: List[TerminalPlanStep] = Field(..., min_length=1, max_length=100, description="Steps, in order")
+    session_id: Optional[str] = Field(None, description="Reuse existing session")
+    intent: Optional[str] = Field(None, description="Plan description for the Supervisor")
+    continue_on_error: bool = Field(
+        False, description="Keep going after a rejected, failed or non-zero-exit step"
+    )
+
+
+class TerminalPlanStepResult(BaseModel):
+    """Decision and outcome of one plan step."""
+    index: int
+    command: str
+    args: List[str]
+    risk_level: str
+    decision: str  # "not_required", "approved" or "rejected"
+    rationale: Optional[str] = None
+    status: str  # "completed", "rejected", "failed" or "skipped"
+    exit_code: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    truncated: bool = False
+    audit_hash: str = ""
+    error: Optional[str] = None
+
+
+class TerminalExecutePlanResponse(BaseModel):
+    """Per-step results of a plan, in order."""
+    session_id: str
+    plan_id: Optional[str] = None  # Set when any step needed Supervisor approval
+    results: List[TerminalPlanStepResult]
+
+
+class TerminalCommand(BaseModel):
+    """A command to classify."""
+    command: str = Field(..., description="Binary to execute")
+    args: List[str] = Field(default_factory=list, description="Command arguments")
+
+
+class TerminalResultResponse(BaseModel):
+    """State of an asynchronously approved command."""
+    ticket_id: str
+    action_request_id: str
+    session_id: str
+    risk_level: str
+    status: str
+    created_at: float
+    updated_at: float
+    rationale: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[TerminalExecuteResponse] = None
+
+
+class TerminalClassifyBatchRequest(BaseModel):
+    """Request to classify a batch of commands without executing them."""
+    commands: List[TerminalCommand] = Field(..., max_length=1000, description="Commands to classify")
+
+
+class TerminalClassification(BaseModel):
+    """Classification of a single command."""
+    command: str
+    args: List[str]
+    risk_level: str
+    is_blocked: bool
+    block_reason: Optional[str] = None
+    matched_pattern: Optional[str] = None
+
+
+class TerminalClassifyBatchResponse(BaseModel):
+    """Per-command classifications, in request order."""
+    results: List[TerminalClassification]
+    paranoid_mode: bool
+
+
 class TerminalWriteInputRequest(BaseModel):
     """Request to write stdin to a running session."""
     session_id: str
@@ -80,6 +188,27 @@ class TerminalAnchorResponse(BaseModel):
     action_count: int
 
 
+class TerminalInclusionProofResponse(BaseModel):
+    """Merkle inclusion proof for a single audited action."""
+    session_id: str
+    action_id: str
+    leaf_index: int
+    leaf_hash: str
+    tree_size: int
+    merkle_root: str
+    proof: List[str]
+
+
+class TerminalConsistencyProofResponse(BaseModel):
+    """Merkle consistency proof between two anchored roots of a session."""
+    session_id: str
+    first_size: int
+    first_root: str
+    second_size: int
+    second_root: str
+    proof: List[str]
+
+
 class SessionInfo(BaseModel):
     """Session information."""
     session_id: str
@@ -96,8 +225,12 @@ class AppState:
     """Global application state."""
     classifier: Optional[CommandClassifier] = None
     session_manager: Optional[SessionManager] = None
+    audit_client: Optional[AuditClient] = None
     tga_client: Optional[TGAClient] = None
+    approval_tracker: Optional[ApprovalTracker] = None
     pty_executor: Optional[PTYExecutor] = None
+    manifest_watcher: Optional[ManifestWatcher] = None
+    recovery_task: Optional[asyncio.Task] = None
     project_root: str = ""
     paranoid_mode: bool = False
     supervisor_public_key: Optional[bytes] = None
@@ -139,6 +272,35 @@ def load_supervisor_key() -> Optional[bytes]:
         return None
 
 
+def load_agent_signing_key() -> Optional[bytes]:
+    """Load the adapter's Ed25519 signing key from a PEM environment variable."""
+    pem_key = os.getenv("TALOS_AGENT_SIGNING_KEY")
+    if not pem_key:
+        return None
+    
+    try:
+        # If it's a file path, read it
+        if os.path.exists(pem_key):
+            with open(pem_key, "rb") as f:
+                pem_data = f.read()
+        else:
+            pem_data = pem_key.encode()
+
+        private_key = serialization.load_pem_private_key(pem_data, password=None)
+        if not isinstance(private_key, ed25519.Ed25519PrivateKey):
+            logger.error("Key is not an Ed25519 private key")
+            return None
+        
+        return private_key.private_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PrivateFormat.Raw,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+    except Exception as e:
+        logger.error(f"Failed to load agent signing key: {e}")
+        return None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application startup and shutdown."""
@@ -150,73 +312,83 @@ async def lifespan(app: FastAPI):
     state.project_root = project_root
     state.supervisor_public_key = load_supervisor_key()
     
-    # Load policy manifest if available
-    manifest = None
-    if manifest_path and os.path.exists(manifest_path):
-        try:
-            manifest = PolicyManifest.load(manifest_path)
-            if state.supervisor_public_key:
-                if not manifest.verify_signature(state.supervisor_public_key):
-                    logger.warning("Policy manifest signature invalid - entering Paranoid Mode")
-                    state.paranoid_mode = True
-            else:
-                logger.warning("No supervisor key to verify manifest - entering Paranoid Mode")
-                state.paranoid_mode = True
-        except Exception as e:
-            logger.warning(f"Failed to load policy manifest: {e} - entering Paranoid Mode")
-            state.paranoid_mode = True
-    
-    # Initialize classifier
-    state.classifier = CommandClassifier(manifest=manifest, paranoid_mode=state.paranoid_mode)
-    
-    # Initialize session manager with anchor callback
-    async def anchor_to_audit(session_id: str, merkle_root: str):
-        """Callback to anchor session to Talos Audit Service."""
-        event_id = str(uuid.uuid4())
-        ts = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        
-        # Build event payload matching audit service's Event model
-        event_data = {
-            "schema_id": "talos.audit_event",
-            "schema_version": "v1",
-            "event_id": event_id,
-            "ts": ts,
-            "request_id": session_id,
-            "surface_id": "terminal-adapter",
-            "outcome": "success",
-            "principal": {"id": "terminal-adapter"},
-            "http": {},
-            "meta": {"session_id": session_id},
-            "hashes": {"merkle_root": merkle_root},
-        }
+    # Load policy manifest if available and compile the classifier
+    cache_size = int(os.getenv("TALOS_CLASSIFIER_CACHE_SIZE", CommandClassifier.DEFAULT_CACHE_SIZE))
+    state.classifier = build_classifier(manifest_path, state.supervisor_public_key, cache_size)
+    state.paranoid_mode = state.classifier.paranoid_mode
+    
+    # Watch the manifest for changes and hot-swap the classifier
+    reload_interval = float(os.getenv("TALOS_POLICY_RELOAD_INTERVAL", "2"))
+    if manifest_path and reload_interval > 0:
+        def swap_classifier(classifier: CommandClassifier) -> None:
+            state.classifier = classifier
+            state.paranoid_mode = classifier.paranoid_mode
         
-        # Compute event_hash (matching Event.__str__ hashing)
-        # Exclude event_hash itself and hashes
-        hash_data = {k: v for k, v in event_data.items() if k not in ["event_hash", "hashes"]}
-        canonical = json.dumps(hash_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-        event_hash = hashlib.sha256(canonical.encode()).hexdigest()
-        event_data["event_hash"] = event_hash
-
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(f"{audit_url}/events", json=event_data)
-                if response.status_code == 201 or response.status_code == 200:
-                    logger.info(f"Successfully anchored {session_id}: {merkle_root[:16]}")
-                else:
-                    logger.error(f"Failed to anchor {session_id} to audit service: {response.status_code} {response.text}")
-        except Exception as e:
-            logger.error(f"Error anchoring {session_id} to audit service: {e}")
+        state.manifest_watcher = ManifestWatcher(
+            manifest_path=manifest_path,
+            supervisor_public_key=state.supervisor_public_key,
+            on_reload=swap_classifier,
+            cache_size=cache_size,
+            poll_interval=reload_interval,
+        )
+        await state.manifest_watcher.start()
+    
+    # Anchor session roots to the Talos Audit Service over one pooled client,
+    # batching roots into a single submission when the service supports it
+    batch_mode = os.getenv("TALOS_AUDIT_BATCH", "auto")
+    state.audit_client = AuditClient(
+        audit_url=audit_url,
+        max_connections=int(os.getenv("TALOS_AUDIT_MAX_CONNECTIONS", "16")),
+        batch=None if batch_mode == "auto" else batch_mode == "on",
+    )
     
     state.session_manager = SessionManager(
         project_root=project_root,
-        anchor_callback=anchor_to_audit
+        anchor_callback=state.audit_client.anchor,
+        anchor_batch_callback=state.audit_client.anchor_batch if batch_mode != "off" else None,
     )
     
-    # Start periodic anchoring
-    await state.session_manager.start_anchor_loop()
+    # Replay the WAL in the background; /tools/* answers 503 and /ready
+    # reports progress until every logged session is registered. Anchoring
+    # starts afterwards so it never appends while the log is being read.
+    recovery_workers = int(os.getenv("TALOS_RECOVERY_WORKERS", "0")) or None
+    use_processes = os.getenv("TALOS_RECOVERY_EXECUTOR", "thread") == "process"
+    
+    async def recover_sessions(manager: SessionManager) -> None:
+        # A failed attempt is retried with backoff; /ready shows the error
+        await manager.recover_with_retry(
+            max_workers=recovery_workers,
+            executor_factory=(
+                (lambda: ProcessPoolExecutor(max_workers=recovery_workers)) if use_processes else None
+            ),
+        )
+        # Start periodic anchoring
+        await manager.start_anchor_loop()
+    
+    state.recovery_task = asyncio.create_task(recover_sessions(state.session_manager))
+    
+    # One pooled TGA client for the adapter's lifetime (keep-alive, HTTP/2
+    # when available); pool size and timeout come from TALOS_TGA_* settings.
+    # Caching approvals is opt-in (TALOS_APPROVAL_CACHE_SIZE > 0).
+    approval_cache = None
+    approval_cache_size = int(os.getenv("TALOS_APPROVAL_CACHE_SIZE", "0"))
+    if approval_cache_size > 0:
+        approval_cache = ApprovalCache(
+            max_size=approval_cache_size,
+            ttl_seconds=float(os.getenv("TALOS_APPROVAL_CACHE_TTL_SECONDS", "300")),
+            risk_levels=frozenset(
+                RiskLevel(level.strip())
+                for level in os.getenv("TALOS_APPROVAL_CACHE_RISK_LEVELS", "WRITE").split(",")
+            ),
+        )
+    state.tga_client = TGAClient(
+        supervisor_public_key=state.supervisor_public_key,
+        approval_cache=approval_cache,
+        signing_key=load_agent_signing_key(),
+    )
     
-    # Initialize TGA client
-    state.tga_client = TGAClient(supervisor_public_key=state.supervisor_public_key)
+    # Follows Supervisor decisions for commands executed with async approval
+    state.approval_tracker = ApprovalTracker(state.tga_client)
     
     # Initialize PTY executor for interactive sessions
     state.pty_executor = PTYExecutor(project_root=project_root)
@@ -226,11 +398,30 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    if state.manifest_watcher:
+        await state.manifest_watcher.stop()
+    
+    if state.approval_tracker:
+        await state.approval_tracker.close()
+    
     if state.pty_executor:
         await state.pty_executor.cleanup_all()
     
+    if state.recovery_task:
+        state.recovery_task.cancel()
+        try:
+            await state.recovery_task
+        except asyncio.CancelledError:
+            pass
+    
     if state.session_manager:
-        await state.session_manager.stop_anchor_loop()
+        await state.session_manager.close()
+    
+    if state.audit_client:
+        await state.audit_client.close()
+    
+    if state.tga_client:
+        await state.tga_client.close()
     
     logger.info("Terminal Adapter stopped")
 
@@ -261,6 +452,55 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until startup session recovery has completed."""
+    if not state.session_manager:
+        return JSONResponse(status_code=503, content={"ready": False, "recovery": None})
+    return JSONResponse(
+        status_code=200 if state.session_manager.ready else 503,
+        content={"ready": state.session_manager.ready, "recovery": state.session_manager.recovery},
+    )
+
+
+def _recovery_detail(recovery: Dict[str, Any]) -> str:
+    detail = f"Session recovery {recovery['state']}"
+    if recovery["state"] == "failed":
+        detail += f" (attempt {recovery['attempts']}, retrying): {recovery['error']}"
+    return detail
+
+
+@app.middleware("http")
+async def require_recovered_sessions(request: Request, call_next):
+    """Hold tool traffic back until recovered sessions are registered."""
+    if (
+        request.url.path.startswith("/tools/")
+        and state.session_manager
+        and not state.session_manager.ready
+    ):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": _recovery_detail(state.session_manager.recovery)},
+            headers={"Retry-After": "1"},
+        )
+    return await call_next(request)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Operational counters for the adapter's hot paths."""
+    return {
+        "classifier": state.classifier.cache_info() if state.classifier else None,
+        "policy": state.manifest_watcher.metrics() if state.manifest_watcher else None,
+        "sessions": state.session_manager.metrics() if state.session_manager else None,
+        "audit": state.audit_client.metrics() if state.audit_client else None,
+        "tga": state.tga_client.metrics() if state.tga_client else None,
+        "approvals": state.approval_tracker.metrics() if state.approval_tracker else None,
+        "crypto": crypto_metrics(),
+        "pty": state.pty_executor.metrics() if state.pty_executor else None,
+    }
+
+
 # ============================================================================
 # Core Terminal Tools
 # ============================================================================
@@ -278,6 +518,11 @@ async def terminal_execute(
     - READ: Execute immediately (bypass Supervisor)
     - WRITE: Block until Supervisor approval
     - HIGH_RISK: Halt and escalate to Supervisor
+    
+    With ``async_approval`` (default: TALOS_ASYNC_APPROVAL), WRITE and
+    HIGH_RISK commands return a ``pending`` ticket at once instead of
+    blocking; the command runs when the Supervisor approves and its result
+    is collected with ``terminal:result`` or ``terminal:result_stream``.
     """
     if not state.classifier or not state.session_manager:
         raise HTTPException(status_code=503, detail="Adapter not initialized")
@@ -300,9 +545,13 @@ async def terminal_execute(
             detail=f"Working directory must be under project root: {state.project_root}"
         )
     
-    # 3. Handle based on risk level
-    if classification.risk_level == RiskLevel.HIGH_RISK:
-        # Escalate to Supervisor
+    # 3. HIGH_RISK escalates to the Supervisor. In v1, WRITE also blocks
+    # for Supervisor (per spec constraint); for now, we allow in dev mode
+    risk_level = classification.risk_level
+    action_request = None
+    if risk_level == RiskLevel.HIGH_RISK or (
+        risk_level == RiskLevel.WRITE and os.getenv("TALOS_ENV") != "dev"
+    ):
         if not state.tga_client:
             raise HTTPException(status_code=503, detail="TGA client not initialized")
         
@@ -310,52 +559,35 @@ async def terminal_execute(
             command=request.command,
             args=request.args,
             cwd=cwd,
-            risk_level=RiskLevel.HIGH_RISK,
+            risk_level=risk_level,
+            principal=x_talos_principal,
+            session_id=request.session_id,
+            scope=capability_scope(x_talos_capability),
         )
-        
+    
+    async_approval = request.async_approval
+    if async_approval is None:
+        async_approval = os.getenv("TALOS_ASYNC_APPROVAL", "0").lower() in ("1", "true", "on")
+    
+    if action_request and not async_approval:
         try:
-            async with TGAClient() as tga:
-                response = await tga.request_approval(action_request)
-                
+            response = await state.tga_client.request_approval(action_request)
+            
+            if response.decision == SupervisorDecision.ESCALATE:
+                # TGA answered 202: still undecided. Without a ticket to
+                # follow up on, this stays the upstream error it always was
+                raise TGAError("TGA returned 202: Supervisor has not decided (use async_approval)")
             if response.decision != SupervisorDecision.APPROVED:
                 raise HTTPException(
                     status_code=403,
-                    detail=f"Supervisor rejected HIGH_RISK command: {response.rationale or 'No reason given'}"
+                    detail=f"Supervisor rejected {risk_level.value} command: {response.rationale or 'No reason given'}"
                 )
-            logger.info(f"Supervisor approved HIGH_RISK command: {request.command}")
+            logger.info(f"Supervisor approved {risk_level.value} command: {request.command}")
         except TGAError as e:
             raise HTTPException(status_code=502, detail=f"TGA error: {e}")
         except TimeoutError:
             raise HTTPException(status_code=408, detail="Supervisor approval timed out")
     
-    if classification.risk_level == RiskLevel.WRITE:
-        # In v1, WRITE also blocks for Supervisor (per spec constraint)
-        # For now, we allow in dev mode
-        if os.getenv("TALOS_ENV") != "dev":
-            if not state.tga_client:
-                raise HTTPException(status_code=503, detail="TGA client not initialized")
-            
-            action_request = state.tga_client.build_action_request(
-                command=request.command,
-                args=request.args,
-                cwd=cwd,
-                risk_level=RiskLevel.WRITE,
-            )
-            
-            try:
-                async with TGAClient() as tga:
-                    response = await tga.request_approval(action_request)
-                    
-                if response.decision != SupervisorDecision.APPROVED:
-                    raise HTTPException(
-                        status_code=403,
-                        detail=f"Supervisor rejected WRITE command: {response.rationale or 'No reason given'}"
-                    )
-            except TGAError as e:
-                raise HTTPException(status_code=502, detail=f"TGA error: {e}")
-            except TimeoutError:
-                raise HTTPException(status_code=408, detail="Supervisor approval timed out")
-    
     # 4. Get or create session
     if request.session_id:
         session = state.session_manager.get_session(request.session_id)
@@ -364,48 +596,285 @@ async def terminal_execute(
     else:
         session = state.session_manager.create_session()
     
-    # 5. Execute command
-    try:
-        stdout, stderr, exit_code = await _execute_command(
-            command=request.command,
-            args=request.args,
-            cwd=cwd,
-            env=request.env,
-            timeout_ms=request.timeout_ms
+    # 5. Hand back a ticket; the command runs once the Supervisor approves
+    if action_request and async_approval:
+        if not state.approval_tracker:
+            raise HTTPException(status_code=503, detail="Approval tracker not initialized")
+        
+        async def run_approved() -> Dict[str, Any]:
+            try:
+                response = await _run_and_record(request, session.session_id, cwd, risk_level)
+            except asyncio.TimeoutError:
+                raise RuntimeError("Command timed out")
+            return response.model_dump()
+        
+        try:
+            ticket = state.approval_tracker.submit(action_request, session.session_id, run_approved)
+        except ApprovalBacklogError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+        
+        return TerminalExecuteResponse(
+            session_id=session.session_id,
+            status=ticket.status.value,
+            ticket_id=ticket.ticket_id,
         )
+    
+    # 6. Execute command
+    try:
+        return await _run_and_record(request, session.session_id, cwd, risk_level)
     except asyncio.TimeoutError:
         raise HTTPException(status_code=408, detail="Command timed out")
     except Exception as e:
         logger.error(f"Execution failed: {e}")
         raise HTTPException(status_code=500, detail=f"Execution error: {str(e)}")
+
+
+async def _run_and_record(
+    request: TerminalPlanStep,
+    session_id: str,
+    cwd: str,
+    risk_level: RiskLevel,
+) -> TerminalExecuteResponse:
+    """Run an approved command and record it to its session."""
+    stdout, stderr, exit_code = await _execute_command(
+        command=request.command,
+        args=request.args,
+        cwd=cwd,
+        env=request.env,
+        timeout_ms=request.timeout_ms
+    )
     
-    # 6. Record action to session (WAL + Merkle tree)
-    audit_hash = state.session_manager.record_action(
-        session_id=session.session_id,
+    # Record action to session (WAL + Merkle tree); hashes cover the full streams
+    audit_hash = await state.session_manager.record_action(
+        session_id=session_id,
         command=request.command,
         args=request.args,
         cwd=cwd,
-        risk_level=classification.risk_level,
+        risk_level=risk_level,
         exit_code=exit_code,
-        stdout=stdout,
-        stderr=stderr
+        stdout_hash=stdout.hexdigest()[:16] if stdout.total_bytes else "",
+        stderr_hash=stderr.hexdigest()[:16] if stderr.total_bytes else "",
     )
     
-    # 7. Check if output is truncated
-    MAX_OUTPUT = 100_000  # 100KB
-    truncated = len(stdout) > MAX_OUTPUT or len(stderr) > MAX_OUTPUT
-    
+    # Output was capped during capture
     return TerminalExecuteResponse(
-        session_id=session.session_id,
+        session_id=session_id,
         exit_code=exit_code,
-        stdout=stdout[:MAX_OUTPUT] if truncated else stdout,
-        stderr=stderr[:MAX_OUTPUT] if truncated else stderr,
-        truncated=truncated,
+        stdout=stdout.text(),
+        stderr=stderr.text(),
+        truncated=stdout.truncated or stderr.truncated,
         audit_hash=audit_hash,
         input_required=False
     )
 
 
+@app.post("/tools/terminal:execute_plan", response_model=TerminalExecutePlanResponse)
+async def terminal_execute_plan(
+    request: TerminalExecutePlanRequest = Body(...),
+    x_talos_principal: Optional[str] = Header(None, alias="X-Talos-Principal"),
+    x_talos_capability: Optional[str] = Header(None, alias="X-Talos-Capability"),
+):
+    """
+    Approve and execute a multi-step plan within one session.
+    
+    Every step is classified and checked first; a blocked step or a
+    working directory outside the project refuses the whole plan. Steps
+    that need the Supervisor are submitted together as one signed plan
+    envelope in a single call, then the steps run in order. By default
+    the plan stops at the first rejected, failed or non-zero-exit step and
+    the rest are reported as skipped.
+    """
+    classifier = state.classifier
+    if not classifier or not state.session_manager:
+        raise HTTPException(status_code=503, detail="Adapter not initialized")
+    
+    # 1. Classify every step against one policy snapshot
+    classifications = classifier.classify_many([(s.command, s.args) for s in request.steps])
+    
+    cwds = []
+    for index, (step, classification) in enumerate(zip(request.steps, classifications)):
+        if classification.is_blocked:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Step {index} blocked: {classification.block_reason}"
+            )
+        # 2. Validate working directory (must be under project root)
+        cwd = step.cwd or state.project_root
+        if not os.path.abspath(cwd).startswith(os.path.abspath(state.project_root)):
+            raise HTTPException(
+                status_code=403,
+                detail=f"Step {index} working directory must be under project root: {state.project_root}"
+            )
+        cwds.append(cwd)
+    
+    # 3. Ask the Supervisor about every step that needs approval at once
+    needs_approval = [
+        i for i, c in enumerate(classifications)
+        if c.risk_level == RiskLevel.HIGH_RISK
+        or (c.risk_level == RiskLevel.WRITE and os.getenv("TALOS_ENV") != "dev")
+    ]
+    decisions: Dict[int, Any] = {}
+    plan_id = None
+    if needs_approval:
+        if not state.tga_client:
+            raise HTTPException(status_code=503, detail="TGA client not initialized")
+        
+        plan = state.tga_client.build_plan(
+            [
+                state.tga_client.build_action_request(
+                    command=request.steps[i].command,
+                    args=request.steps[i].args,
+                    cwd=cwds[i],
+                    risk_level=classifications[i].risk_level,
+                    principal=x_talos_principal,
+                    session_id=request.session_id,
+                    scope=capability_scope(x_talos_capability),
+                )
+                for i in needs_approval
+            ],
+            intent=request.intent,
+        )
+        plan_id = plan.plan_id
+        try:
+            responses = await state.tga_client.request_plan_approval(plan)
+        except TGAError as e:
+            raise HTTPException(status_code=502, detail=f"TGA error: {e}")
+        except TimeoutError:
+            raise HTTPException(status_code=408, detail="Supervisor approval timed out")
+        decisions = dict(zip(needs_approval, responses))
+    
+    # 4. Get or create session
+    if request.session_id:
+        session = state.session_manager.get_session(request.session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+    else:
+        session = state.session_manager.create_session()
+    
+    # 5. Run the steps in order
+    results = []
+    halted = False
+    for index, (step, classification) in enumerate(zip(request.steps, classifications)):
+        response = decisions.get(index)
+        result = TerminalPlanStepResult(
+            index=index,
+            command=step.command,
+            args=step.args,
+            risk_level=classification.risk_level.value,
+            decision=response.decision.value if response else "not_required",
+            rationale=response.rationale if response else None,
+            status="skipped",
+        )
+        results.append(result)
+        if halted:
+            continue
+        
+        if response and response.decision != SupervisorDecision.APPROVED:
+            result.status = "rejected"
+        else:
+            try:
+                executed = await _run_and_record(step, session.session_id, cwds[index], classification.risk_level)
+            except asyncio.TimeoutError:
+                result.status, result.error = "failed", "Command timed out"
+            except Exception as e:
+                logger.error(f"Plan step {index} failed: {e}")
+                result.status, result.error = "failed", f"Execution error: {str(e)}"
+            else:
+                result.status = "completed"
+                result.exit_code = executed.exit_code
+                result.stdout = executed.stdout
+                result.stderr = executed.stderr
+                result.truncated = executed.truncated
+                result.audit_hash = executed.audit_hash
+        
+        if not request.continue_on_error and (result.status != "completed" or result.exit_code):
+            halted = True
+    
+    return TerminalExecutePlanResponse(
+        session_id=session.session_id,
+        plan_id=plan_id,
+        results=results,
+    )
+
+
+@app.get("/tools/terminal:result", response_model=TerminalResultResponse)
+async def terminal_result(ticket_id: str, wait_ms: int = 0):
+    """Fetch the state and, once completed, the result of a pending ticket.
+    
+    With ``wait_ms`` the call long-polls until the ticket finishes or the
+    wait elapses.
+    """
+    if not state.approval_tracker:
+        raise HTTPException(status_code=503, detail="Approval tracker not initialized")
+    
+    wait_ms = max(0, min(wait_ms, 60000))
+    ticket = await state.approval_tracker.wait(ticket_id, wait_ms / 1000)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    return TerminalResultResponse(**ticket.to_dict())
+
+
+@app.get("/tools/terminal:result_stream")
+async def terminal_result_stream(ticket_id: str):
+    """Stream a ticket's status changes using Server-Sent Events (SSE).
+    
+    Emits a ``status`` event with the ticket on every change and a final
+    ``complete`` event once it is completed, rejected or failed.
+    """
+    if not state.approval_tracker:
+        raise HTTPException(status_code=503, detail="Approval tracker not initialized")
+    
+    if not state.approval_tracker.get(ticket_id):
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    async def stream_generator():
+        """Generate SSE events from ticket updates."""
+        async for ticket in state.approval_tracker.updates(ticket_id):
+            yield f"event: status\ndata: {json.dumps(ticket.to_dict())}\n\n"
+        yield "event: complete\ndata: {}\n\n"
+    
+    return StreamingResponse(
+        stream_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
+
+
+@app.post("/tools/terminal:classify_batch", response_model=TerminalClassifyBatchResponse)
+async def terminal_classify_batch(request: TerminalClassifyBatchRequest = Body(...)):
+    """
+    Classify a batch of commands without executing anything.
+    
+    Lets planning agents pre-flight a whole plan against policy in a
+    single round trip.
+    """
+    # Snapshot so the whole batch sees one policy even across a hot reload
+    classifier = state.classifier
+    if not classifier:
+        raise HTTPException(status_code=503, detail="Adapter not initialized")
+    
+    results = classifier.classify_many([(c.command, c.args) for c in request.commands])
+    
+    return TerminalClassifyBatchResponse(
+        results=[
+            TerminalClassification(
+                command=r.command,
+                args=list(r.args),
+                risk_level=r.risk_level.value,
+                is_blocked=r.is_blocked,
+                block_reason=r.block_reason,
+                matched_pattern=r.matched_pattern,
+            )
+            for r in results
+        ],
+        paranoid_mode=classifier.paranoid_mode,
+    )
+
+
 @app.get("/tools/terminal:list_sessions", response_model=List[SessionInfo])
 async def terminal_list_sessions():
     """List all active terminal sessions."""
@@ -455,6 +924,85 @@ async def terminal_anchor_session(session_id: str):
     )
 
 
+@app.get("/tools/terminal:inclusion_proof", response_model=TerminalInclusionProofResponse)
+async def terminal_inclusion_proof(session_id: str, action_id: str):
+    """Prove that an action is part of a session's Merkle tree.
+    
+    Verify offline with ``terminal_adapter.domain.merkle.verify_inclusion``.
+    """
+    if not state.session_manager:
+        raise HTTPException(status_code=503, detail="Adapter not initialized")
+    
+    proof = state.session_manager.inclusion_proof(session_id, action_id)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Session or action not found")
+    
+    return TerminalInclusionProofResponse(**proof)
+
+
+@app.get("/tools/terminal:consistency_proof", response_model=TerminalConsistencyProofResponse)
+async def terminal_consistency_proof(
+    session_id: str,
+    first_root: str,
+    second_root: Optional[str] = None,
+):
+    """Prove that a later anchored root extends an earlier one.
+    
+    ``second_root`` defaults to the session's latest anchored root. Verify
+    offline with ``terminal_adapter.domain.merkle.verify_consistency``.
+    """
+    if not state.session_manager:
+        raise HTTPException(status_code=503, detail="Adapter not initialized")
+    
+    try:
+        proof = state.session_manager.consistency_proof(session_id, first_root, second_root)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    return TerminalConsistencyProofResponse(**proof)
+
+
+@app.post("/approvals/revoke")
+async def revoke_approvals(
+    digest: Optional[str] = None,
+    agent_id: Optional[str] = None,
+    principal: Optional[str] = None,
+):
+    """Drop cached Supervisor approvals (all of them if no filter is given).
+    
+    Subsequent matching actions go back to the Supervisor.
+    """
+    if not state.tga_client:
+        raise HTTPException(status_code=503, detail="TGA client not initialized")
+    
+    cache = state.tga_client.approval_cache
+    revoked = cache.revoke(digest=digest, agent_id=agent_id, principal=principal) if cache else 0
+    return {"revoked": revoked}
+
+
+@app.post("/approvals/callback")
+async def approval_callback(payload: Dict[str, Any] = Body(...)):
+    """Receive a signed Supervisor decision for a pending ticket.
+    
+    Body: ``{"data": {"action_request_id", "decision", ...}, "signature"}``
+    signed with the Supervisor key. Saves the ticket waiting for its next
+    poll.
+    """
+    if not state.tga_client or not state.approval_tracker:
+        raise HTTPException(status_code=503, detail="Approval tracker not initialized")
+    
+    try:
+        response = state.tga_client.verify_decision(payload)
+    except TGAError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    
+    if not state.approval_tracker.resolve(response):
+        raise HTTPException(status_code=404, detail="No ticket is waiting on that action request")
+    return {"accepted": True, "action_request_id": response.action_request_id}
+
+
 @app.post("/tools/terminal:abort")
 async def terminal_abort(session_id: str, force: bool = False):
     """Abort a running command in a session."""
@@ -472,39 +1020,69 @@ async def terminal_abort(session_id: str, force: bool = False):
     return {"success": True, "session_id": session_id, "state": "aborted"}
 
 
+def _sse_data(text: str) -> str:
+    """Frame text as SSE ``data:`` lines; CR, LF and CRLF all end a line."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "".join(f"data: {line}\n" for line in lines)
+
+
 @app.get("/tools/terminal:stream")
-async def terminal_stream(session_id: str):
+async def terminal_stream(
+    session_id: str,
+    overrun: str = "skip",
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """Stream real-time output from a session using Server-Sent Events (SSE).
     
-    Returns a text/event-stream response with output chunks.
-    """
-    from fastapi.responses import StreamingResponse
+    Every client follows the session with its own cursor, so any number of
+    streams see the full output. Each chunk carries its byte offset as the
+    event ``id``; reconnecting with ``Last-Event-ID`` resumes from there.
+    A client that falls behind by more than the session's output buffer
+    gets a ``dropped`` event with the number of bytes lost, and with
+    ``overrun=close`` the stream ends there instead of skipping ahead.
     
+    Events are pushed as soon as the PTY reader stores output, with small
+    writes coalesced (``TALOS_STREAM_FLUSH_MS`` / ``TALOS_STREAM_FLUSH_BYTES``);
+    idle streams get a ``: heartbeat`` comment every
+    ``TALOS_STREAM_HEARTBEAT_SECONDS``.
+    """
     if not state.pty_executor:
         raise HTTPException(status_code=503, detail="PTY executor not initialized")
+    if overrun not in ("skip", "close"):
+        raise HTTPException(status_code=400, detail="overrun must be 'skip' or 'close'")
     
-    session = await state.pty_executor.get_session(session_id)
-    if not session:
+    offset = None
+    if last_event_id:
+        try:
+            offset = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be an output offset")
+    
+    subscriber = state.pty_executor.subscribe(session_id, offset)
+    if not subscriber:
         raise HTTPException(status_code=404, detail="Session not found")
     
     async def stream_generator():
-        """Generate SSE events from session output."""
-        while True:
-            # Read accumulated output
-            output, is_complete = await state.pty_executor.read_output(
-                session_id, 
-                timeout_ms=5000
-            )
-            
-            if output:
-                # SSE format: data: <content>\n\n
-                yield f"data: {output}\n\n"
-            
-            if is_complete:
-                yield "event: complete\ndata: {}\n\n"
-                break
-            
-            await asyncio.sleep(0.05)
+        """Generate SSE events from this client's cursor."""
+        try:
+            while True:
+                chunk = await subscriber.next(
+                    STREAM_FLUSH_MS / 1000, STREAM_FLUSH_BYTES, STREAM_HEARTBEAT_SECONDS
+                )
+                if chunk is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                if chunk.dropped:
+                    yield f"event: dropped\nid: {chunk.offset}\ndata: {chunk.dropped}\n\n"
+                    if overrun == "close":
+                        break
+                if chunk.text:
+                    yield f"id: {chunk.offset}\n{_sse_data(chunk.text)}\n"
+                if chunk.complete:
+                    yield "event: complete\ndata: {}\n\n"
+                    break
+        finally:
+            subscriber.close()
     
     return StreamingResponse(
         stream_generator(),
@@ -516,6 +1094,92 @@ async def terminal_stream(session_id: str):
     )
 
 
+class AttachFrame(IntEnum):
+    """First byte of every ``terminal:attach`` binary frame."""
+    STDIN = 0x00    # client -> server: raw bytes for the PTY
+    STDOUT = 0x01   # server -> client: raw PTY output
+    RESIZE = 0x02   # client -> server: rows, cols as big-endian uint16
+    ABORT = 0x03    # client -> server: optional 0x01 byte to force SIGKILL
+    EXIT = 0x04     # server -> client: JSON {"exit_code", "state"}, then close
+    DROPPED = 0x05  # server -> client: bytes lost, big-endian uint64
+
+
+@app.websocket("/tools/terminal:attach")
+async def terminal_attach(websocket: WebSocket, session_id: str, offset: Optional[int] = None):
+    """Drive an interactive session over one WebSocket.
+    
+    Stdin, output, resize and abort travel as binary frames (see
+    ``AttachFrame``): a type byte followed by the payload, with terminal
+    bytes passed through untouched. Output starts at the oldest retained
+    byte, or at ``offset``, and follows the same per-client cursor as
+    ``terminal:stream``. The server closes with 1000 after the EXIT frame
+    and with 1003 on text or unknown frames.
+    """
+    if state.session_manager and not state.session_manager.ready:
+        await websocket.close(code=1013, reason="Session recovery in progress")
+        return
+    if not state.pty_executor:
+        await websocket.close(code=1011, reason="PTY executor not initialized")
+        return
+    
+    subscriber = state.pty_executor.subscribe(session_id, offset)
+    if not subscriber:
+        await websocket.close(code=1008, reason="Session not found")
+        return
+    await websocket.accept()
+    
+    async def send_output():
+        while True:
+            await subscriber.wait(ATTACH_FLUSH_MS / 1000, STREAM_FLUSH_BYTES)
+            views, dropped = subscriber.read_bytes(_READ_CHUNK_SIZE)
+            # The views are only valid until the PTY reader next writes to
+            # the ring, so copy them out before awaiting anything
+            output = b"".join([bytes([AttachFrame.STDOUT]), *views]) if views else None
+            if dropped:
+                await websocket.send_bytes(bytes([AttachFrame.DROPPED]) + struct.pack("!Q", dropped))
+            if output:
+                await websocket.send_bytes(output)
+            elif subscriber.finished:
+                session = subscriber.session
+                exit_info = {"exit_code": session.exit_code, "state": session.state.value}
+                await websocket.send_bytes(bytes([AttachFrame.EXIT]) + json.dumps(exit_info).encode())
+                await websocket.close(code=1000)
+                return
+    
+    async def receive_input():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            frame = message.get("bytes")
+            if not frame:
+                await websocket.close(code=1003, reason="Binary frames only")
+                return
+            kind, payload = frame[0], frame[1:]
+            if kind == AttachFrame.STDIN:
+                await state.pty_executor.write_input(session_id, payload)
+            elif kind == AttachFrame.RESIZE and len(payload) == 4:
+                await state.pty_executor.resize_session(session_id, *struct.unpack("!HH", payload))
+            elif kind == AttachFrame.ABORT:
+                await state.pty_executor.abort_session(session_id, force=payload[:1] == b"\x01")
+            else:
+                await websocket.close(code=1003, reason=f"Unsupported frame 0x{kind:02x}")
+                return
+    
+    tasks = {asyncio.create_task(send_output()), asyncio.create_task(receive_input())}
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error and not isinstance(error, WebSocketDisconnect):
+                logger.error(f"Attach to session {session_id} failed: {error}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        subscriber.close()
+
+
 # ============================================================================
 # Command Execution
 # ============================================================================
@@ -526,10 +1190,12 @@ async def _execute_command(
     cwd: str,
     env: Optional[Dict[str, str]],
     timeout_ms: int
-) -> tuple[str, str, int]:
+) -> tuple[CappedOutput, CappedOutput, int]:
     """Execute a command in a sandboxed subprocess.
     
-    Uses subprocess with strict environment controls.
+    Uses subprocess with strict environment controls. stdout and stderr
+    are read in chunks into size-capped buffers, so memory per request is
+    bounded regardless of how much the command writes.
     """
     # Build environment (inherit minimal, add overrides)
     safe_env = {
@@ -557,20 +1223,31 @@ async def _execute_command(
         env=safe_env,
     )
     
+    stdout = CappedOutput(MAX_OUTPUT_BYTES, OUTPUT_TAIL_BYTES)
+    stderr = CappedOutput(MAX_OUTPUT_BYTES, OUTPUT_TAIL_BYTES)
+    
+    async def _drain(stream: asyncio.StreamReader, capture: CappedOutput) -> None:
+        while True:
+            chunk = await stream.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            capture.write(chunk)
+    
     try:
-        stdout_bytes, stderr_bytes = await asyncio.wait_for(
-            proc.communicate(),
+        await asyncio.wait_for(
+            asyncio.gather(
+                _drain(proc.stdout, stdout),
+                _drain(proc.stderr, stderr),
+                proc.wait(),
+            ),
             timeout=timeout_ms / 1000
         )
     except asyncio.TimeoutError:
         proc.kill()
+        await proc.wait()
         raise
     
-    return (
-        stdout_bytes.decode("utf-8", errors="replace"),
-        stderr_bytes.decode("utf-8", errors="replace"),
-        proc.returncode or 0
-    )
+    return stdout, stderr, proc.returncode or 0
 
 
 # ============================================================================
@@ -0,0 +1,242 @@
+"""Tests for the anchoring scheduler and pooled audit client."""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from terminal_adapter.domain import (
+    AnchorEvent,
+    AnchorOutbox,
+    AuditClient,
+    AuditError,
+    CircuitBreaker,
+    RiskLevel,
+    SessionManager,
+)
+
+
+def _audit_client(handler) -> AuditClient:
+    return AuditClient(audit_url="http://audit", transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_anchor_due_sessions_bounds_concurrency(tmp_path):
+    in_flight = peak = 0
+
+    async def slow_anchor(session_id, merkle_root, **_):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path),
+                             anchor_callback=slow_anchor, anchor_concurrency=3)
+    sessions = [manager.create_session() for _ in range(10)]
+    assert await manager.anchor_due_sessions() == 0  # Nothing due yet
+
+    for session in sessions:
+        manager._next_anchor[session.session_id] = datetime.min
+    assert await manager.anchor_due_sessions() == 10
+    assert peak == 3
+    assert all(manager._next_anchor[s.session_id] > datetime.utcnow() for s in sessions)
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_anchor_due_sessions_batches_roots(tmp_path):
+    batches = []
+
+    async def anchor_batch(roots):
+        batches.append(roots)
+
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path),
+                             anchor_batch_callback=anchor_batch, anchor_batch_size=4)
+    sessions = [manager.create_session() for _ in range(10)]
+    for session in sessions:
+        await manager.record_action(session.session_id, "ls", [], str(tmp_path), RiskLevel.READ)
+        manager._next_anchor[session.session_id] = datetime.min
+
+    assert await manager.anchor_due_sessions() == 10
+    assert [len(b) for b in batches] == [4, 4, 2]
+    roots = {e.session_id: e.merkle_root for batch in batches for e in batch}
+    assert roots == {s.session_id: s.compute_merkle_root() for s in sessions}
+    # Anchored entries were checkpointed out of the WAL
+    assert manager.wal_log.sessions() == []
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_anchor_deadlines_are_spread(tmp_path):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    created = datetime.utcnow()
+    for _ in range(50):
+        manager.create_session()
+
+    deadlines = sorted(manager._next_anchor.values())
+    interval = manager.ANCHOR_INTERVAL
+    assert deadlines[0] >= created + interval * (1 - manager.ANCHOR_JITTER)
+    assert deadlines[-1] <= datetime.utcnow() + interval
+    assert deadlines[-1] - deadlines[0] > timedelta(seconds=30)
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_audit_client_falls_back_without_batch_endpoint():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/events/batch":
+            return httpx.Response(404)
+        return httpx.Response(201, json={})
+
+    client = _audit_client(handler)
+    await client.anchor_batch([AnchorEvent("s1", "r1", 1, 0), AnchorEvent("s2", "r2", 1, 0)])
+    await client.anchor_batch([AnchorEvent("s3", "r3", 1, 0)])
+
+    assert client.batch_supported is False
+    assert paths.count("/events/batch") == 1
+    assert paths.count("/events") == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_audit_client_submits_one_batch_request():
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={})
+
+    client = _audit_client(handler)
+    events = [AnchorEvent("s1", "r1", 1, 0), AnchorEvent("s2", "r2", 1, 0)]
+    await client.anchor_batch(events)
+
+    (body,) = bodies
+    assert [e["hashes"]["merkle_root"] for e in body["events"]] == ["r1", "r2"]
+    assert [e["event_id"] for e in body["events"]] == [e.event_id for e in events]
+    assert client.metrics()["batches"] == 1
+
+    await client.close()
+
+    client = _audit_client(lambda request: httpx.Response(500))
+    with pytest.raises(AuditError):
+        await client.anchor("s1", "r1")
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_anchor_is_retried_from_durable_outbox(tmp_path):
+    submitted = []
+    fail = True
+
+    async def flaky_anchor(session_id, merkle_root, event_id=None, ts=None):
+        submitted.append((event_id, ts))
+        if fail:
+            raise AuditError("audit service down")
+
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path),
+                             anchor_callback=flaky_anchor)
+    session = manager.create_session()
+    await manager.record_action(session.session_id, "ls", [], str(tmp_path), RiskLevel.READ)
+    assert await manager.anchor_session(session.session_id, immediate=True) is None
+    assert manager.metrics()["anchor_outbox"]["depth"] == 1
+    await manager.close()
+
+    # After a restart the root is still queued and its WAL entries kept
+    fail = False
+    restarted = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path),
+                               anchor_callback=flaky_anchor)
+    await restarted.recover_all()
+    assert await restarted.outbox.flush() == 1
+
+    (first, retry) = submitted
+    assert first == retry  # Same event ID and timestamp on retry
+    assert restarted.outbox.metrics()["depth"] == 0
+    assert restarted.anchor_history[session.session_id] == [(1, session.compute_merkle_root())]
+    assert restarted.wal_log.sessions() == []
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_session_is_not_anchored_again(tmp_path):
+    submitted = []
+
+    async def anchor(session_id, merkle_root, event_id=None, ts=None):
+        submitted.append((event_id, ts, merkle_root))
+
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path),
+                             anchor_callback=anchor)
+    session = manager.create_session()
+    await manager.record_action(session.session_id, "ls", [], str(tmp_path), RiskLevel.READ)
+    root = await manager.anchor_session(session.session_id, immediate=True)
+    await asyncio.sleep(0.01)
+
+    assert await manager.anchor_session(session.session_id, immediate=True) == root
+    manager._next_anchor[session.session_id] = datetime.min
+    assert await manager.anchor_due_sessions() == 0
+    assert len(submitted) == 1
+    assert manager._next_anchor[session.session_id] > datetime.utcnow()
+
+    # A new action is a new event; its ID and timestamp come from the content
+    await manager.record_action(session.session_id, "pwd", [], str(tmp_path), RiskLevel.READ)
+    snapshot = manager._anchor_snapshot(session.session_id)
+    await asyncio.sleep(0.01)
+    again = manager._anchor_snapshot(session.session_id)
+    assert (snapshot.event_id, snapshot.ts) == (again.event_id, again.ts)
+    await manager.anchor_session(session.session_id, immediate=True)
+    assert submitted[-1] == (snapshot.event_id, snapshot.ts, snapshot.merkle_root)
+    assert len({event_id for event_id, _, _ in submitted}) == 2
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_outbox_backs_off_and_breaks_circuit(tmp_path):
+    calls = 0
+
+    async def send(event):
+        nonlocal calls
+        calls += 1
+        raise AuditError("down")
+
+    outbox = AnchorOutbox(str(tmp_path), send=send, base_backoff=0, max_backoff=0,
+                          breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for n in range(3):
+        await outbox.put(AnchorEvent(f"s{n}", "root", 1, 0))
+
+    assert await outbox.flush() == 0
+    assert calls == 2  # Third submission rejected by the open breaker
+    metrics = outbox.metrics()
+    assert metrics["breaker"] == CircuitBreaker.OPEN
+    assert metrics["depth"] == 3
+    assert metrics["max_attempts"] == 1
+
+    assert await outbox.flush() == 0
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_outbox_age_counts_from_enqueue(tmp_path):
+    idle_since = time.time() - 3600
+    outbox = AnchorOutbox(str(tmp_path), send=None)
+    await outbox.put(AnchorEvent("idle", "root", 1, 0, created_at=idle_since))
+    assert outbox.metrics()["oldest_age_seconds"] < 60
+    await outbox.log.sync()
+
+    reloaded = AnchorOutbox(str(tmp_path), send=None)
+    event = reloaded.pending_tail("idle")
+    assert event.created_at == idle_since
+    assert reloaded.metrics()["oldest_age_seconds"] < 60
+
+
+def test_outbox_backoff_grows_with_jitter(tmp_path):
+    outbox = AnchorOutbox(str(tmp_path), send=None, base_backoff=1, max_backoff=8)
+    for attempts, cap in ((1, 1), (2, 2), (3, 4), (4, 8), (10, 8)):
+        delays = {outbox._backoff(attempts) for _ in range(20)}
+        assert all(cap / 2 <= d <= cap for d in delays)
+        assert len(delays) > 1
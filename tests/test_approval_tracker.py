@@ -0,0 +1,264 @@
+"""Tests for asynchronous Supervisor approval tickets."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from terminal_adapter.domain import (
+    ApprovalBacklogError,
+    ApprovalTracker,
+    CommandClassifier,
+    RiskLevel,
+    SessionManager,
+    TGAClient,
+    TGAError,
+    TicketStatus,
+)
+from terminal_adapter.domain.crypto import generate_keypair, sign_json
+
+
+def _respond(spec):
+    status, *kwargs = spec
+    return httpx.Response(status, **(kwargs[0] if kwargs else {}))
+
+
+def _tracker(submit, polls=(), **kwargs):
+    """Tracker over a TGA that answers the submission with ``submit`` and
+    each decision poll from ``polls`` (the last one repeating)."""
+    calls = {"submit": 0, "poll": 0}
+
+    def handler(request):
+        if request.method == "POST":
+            calls["submit"] += 1
+            return _respond(submit)
+        calls["poll"] += 1
+        return _respond(polls[min(calls["poll"], len(polls)) - 1])
+
+    tga = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler), **kwargs.pop("tga", {}))
+    tracker = ApprovalTracker(tga, poll_base_seconds=0.01, poll_max_seconds=0.02, **kwargs)
+    return tracker, tga, calls
+
+
+def _runner(result=None):
+    runs = []
+
+    async def run():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return result or {"exit_code": 0}
+
+    return run, runs
+
+
+@pytest.mark.asyncio
+async def test_escalated_request_is_polled_until_approved():
+    tracker, tga, calls = _tracker(
+        (202,), [(202,), (202,), (200, {"json": {"decision": "approved", "rationale": "ok"}})]
+    )
+    run, runs = _runner({"exit_code": 0, "stdout": "done"})
+    request = tga.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+
+    ticket = tracker.submit(request, "session-1", run)
+    assert ticket.status == TicketStatus.PENDING
+
+    ticket = await tracker.wait(ticket.ticket_id, timeout=5)
+    assert ticket.status == TicketStatus.COMPLETED
+    assert ticket.result == {"exit_code": 0, "stdout": "done"}
+    assert ticket.rationale == "ok"
+    assert calls == {"submit": 1, "poll": 3}
+    assert ticket.polls == 3
+    assert runs == [1]
+    assert tracker.metrics()["outcomes"]["completed"] == 1
+    await tracker.close()
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_ticket_never_runs():
+    tracker, tga, calls = _tracker((200, {"json": {"decision": "rejected", "rationale": "no"}}))
+    run, runs = _runner()
+    request = tga.build_action_request("npm", ["install"], "/repo", RiskLevel.WRITE)
+
+    ticket = await tracker.wait(tracker.submit(request, "session-1", run).ticket_id, timeout=5)
+    assert ticket.status == TicketStatus.REJECTED
+    assert ticket.rationale == "no"
+    assert calls["poll"] == 0
+    assert runs == []
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_signed_callback_overtakes_polling():
+    private_key, public_key = generate_keypair()
+    tracker, tga, calls = _tracker(
+        (202,), [(202,)], tga={"supervisor_public_key": public_key}
+    )
+    run, runs = _runner()
+    request = tga.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+    ticket = tracker.submit(request, "session-1", run)
+    await asyncio.sleep(0.05)
+    assert ticket.status == TicketStatus.PENDING
+
+    data = {"action_request_id": request.action_request_id, "decision": "approved"}
+    with pytest.raises(TGAError):
+        tga.verify_decision({"data": data, "signature": "00" * 64})
+    response = tga.verify_decision({"data": data, "signature": sign_json(data, private_key).hex()})
+    assert tracker.resolve(response)
+    assert not tracker.resolve(response)
+
+    ticket = await tracker.wait(ticket.ticket_id, timeout=5)
+    assert ticket.status == TicketStatus.COMPLETED
+    assert runs == [1]
+    assert tracker.metrics()["callbacks"] == 1
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_undecided_ticket_fails_at_deadline():
+    tracker, tga, _ = _tracker((202,), [(202,)], deadline_seconds=0.1)
+    run, runs = _runner()
+    request = tga.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+
+    ticket = await tracker.wait(tracker.submit(request, "session-1", run).ticket_id, timeout=5)
+    assert ticket.status == TicketStatus.FAILED
+    assert ticket.error == "Supervisor approval timed out"
+    assert runs == []
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_updates_follow_every_status_change():
+    tracker, tga, _ = _tracker((202,), [(200, {"json": {"decision": "approved"}})])
+    run, _ = _runner()
+    request = tga.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+    ticket = tracker.submit(request, "session-1", run)
+
+    seen = [t.status async for t in tracker.updates(ticket.ticket_id)]
+    assert seen[0] == TicketStatus.PENDING
+    assert seen[-1] == TicketStatus.COMPLETED
+    assert TicketStatus.RUNNING in seen
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_pending_backlog_is_bounded():
+    tracker, tga, _ = _tracker((202,), [(202,)], max_tickets=2)
+    run, _ = _runner()
+
+    for _ in range(2):
+        request = tga.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+        tracker.submit(request, "session-1", run)
+    with pytest.raises(ApprovalBacklogError):
+        request = tga.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+        tracker.submit(request, "session-1", run)
+    await tracker.close()
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_execute_returns_pending_ticket(tmp_path):
+    from terminal_adapter.main import (
+        TerminalExecuteRequest,
+        state,
+        terminal_execute,
+        terminal_result,
+    )
+
+    tracker, tga, _ = _tracker((200, {"json": {"decision": "approved"}}))
+    state.classifier = CommandClassifier()
+    state.project_root = str(tmp_path)
+    state.session_manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path / "wal"))
+    state.tga_client = tga
+    state.approval_tracker = tracker
+    try:
+        response = await terminal_execute(
+            TerminalExecuteRequest(command="mkdir", args=["./out"], cwd=str(tmp_path), async_approval=True),
+            None,
+            None,
+        )
+        assert response.status == "pending"
+        assert response.exit_code is None
+
+        result = await terminal_result(response.ticket_id, wait_ms=5000)
+        assert result.status == "completed"
+        assert result.result.exit_code == 0
+        assert result.result.session_id == response.session_id
+        assert (tmp_path / "out").is_dir()
+        assert len(state.session_manager.get_session(response.session_id).actions) == 1
+    finally:
+        await tracker.close()
+        await tga.close()
+        await state.session_manager.close()
+        state.session_manager = state.tga_client = state.approval_tracker = None
+
+
+@pytest.mark.asyncio
+async def test_identical_tickets_are_tracked_under_their_own_ids():
+    submitted = set()
+
+    def handler(request):
+        if request.method == "POST":
+            submitted.add(json.loads(request.content)["action_request_id"])
+            return httpx.Response(202)
+        if request.url.path.rsplit("/", 1)[-1] not in submitted:
+            return httpx.Response(404, json={"detail": "unknown action request"})
+        return httpx.Response(200, json={"decision": "approved"})
+
+    tga = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler))
+    tracker = ApprovalTracker(tga, poll_base_seconds=0.01, poll_max_seconds=0.02, deadline_seconds=5)
+    run, runs = _runner()
+    tickets = [
+        tracker.submit(tga.build_action_request("npm", ["install"], "/repo", RiskLevel.WRITE), "s", run)
+        for _ in range(2)
+    ]
+
+    for ticket in tickets:
+        assert (await tracker.wait(ticket.ticket_id, timeout=5)).status == TicketStatus.COMPLETED
+    assert submitted == {t.action_request_id for t in tickets}
+    assert tga.coalesced == 0
+    assert runs == [1, 1]
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_repeated_poll_errors_fail_ticket_before_deadline():
+    tracker, tga, calls = _tracker(
+        (202,), [(404, {"json": {"detail": "unknown action request"}})], max_poll_errors=3
+    )
+    run, runs = _runner()
+    request = tga.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+
+    ticket = await tracker.wait(tracker.submit(request, "session-1", run).ticket_id, timeout=5)
+    assert ticket.status == TicketStatus.FAILED
+    assert ticket.error.startswith("TGA error")
+    assert calls["poll"] == 3
+    assert runs == []
+    await tga.close()
+
+
+@pytest.mark.asyncio
+async def test_blocking_execute_reports_undecided_as_upstream_error(tmp_path):
+    from fastapi import HTTPException
+
+    from terminal_adapter.main import TerminalExecuteRequest, state, terminal_execute
+
+    _, tga, _ = _tracker((202,))
+    state.classifier = CommandClassifier()
+    state.project_root = str(tmp_path)
+    state.session_manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path / "wal"))
+    state.tga_client = tga
+    try:
+        with pytest.raises(HTTPException) as raised:
+            await terminal_execute(
+                TerminalExecuteRequest(command="rm", args=["./out"], cwd=str(tmp_path), async_approval=False),
+                None,
+                None,
+            )
+        assert raised.value.status_code == 502
+        assert "202" in raised.value.detail
+    finally:
+        await tga.close()
+        await state.session_manager.close()
+        state.session_manager = state.tga_client = None
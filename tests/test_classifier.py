@@ -6,6 +6,7 @@ from terminal_adapter.domain import (
     RiskLevel,
     PolicyManifest,
 )
+from terminal_adapter.domain.classifier import CompiledPatternSet
 
 
 class TestCommandClassifier:
@@ -123,6 +124,100 @@ class TestCommandClassifier:
         assert result.risk_level == RiskLevel.HIGH_RISK
         assert not result.is_blocked
     
+    # ========================================================================
+    # Compiled Matcher
+    # ========================================================================
+    
+    def test_matched_pattern_is_reported(self, classifier):
+        result = classifier.classify("git", ["status"])
+        assert result.matched_pattern == r"^git status\b"
+    
+    def test_blocklist_takes_precedence_over_high_risk(self, classifier):
+        result = classifier.classify("ls", ["&&", "rm", "x"])
+        assert result.is_blocked
+        assert result.matched_pattern == r".*&&\s*rm\b"
+    
+    def test_high_risk_takes_precedence_over_read(self, classifier):
+        result = classifier.classify("cat", ["a", "|", "rm", "b"])
+        assert result.risk_level == RiskLevel.HIGH_RISK
+        assert result.matched_pattern == r".*\|.*rm\b"
+    
+    def test_unanchored_pattern_matches_after_newline(self, classifier):
+        result = classifier.classify("cat", ["a\nb", ">", "c"])
+        assert result.risk_level == RiskLevel.HIGH_RISK
+        assert result.matched_pattern == r".*>.*"
+    
+    def test_pattern_set_first_listed_wins(self):
+        patterns = CompiledPatternSet([("a", [r"^foo\b"]), ("b", [r".*bar"])])
+        assert patterns.first_match("foo bar") == ("a", r"^foo\b")
+        assert patterns.first_match("baz\nbar") == ("b", r".*bar")
+        assert patterns.first_match("baz") is None
+    
+    # ========================================================================
+    # Classification Cache
+    # ========================================================================
+    
+    def test_cache_hit_returns_shared_result(self, classifier):
+        first = classifier.classify("git", ["status"])
+        second = classifier.classify("git", ["status"])
+        assert first is second
+        assert classifier.cache_info()["hits"] == 1
+        assert classifier.cache_info()["misses"] == 1
+    
+    def test_cache_evicts_least_recently_used(self):
+        classifier = CommandClassifier(cache_size=2)
+        ls = classifier.classify("ls", [])
+        classifier.classify("pwd", [])
+        classifier.classify("ls", [])          # refresh ls
+        classifier.classify("cat", ["a"])      # evicts pwd
+        assert classifier.cache_info()["evictions"] == 1
+        assert classifier.classify("ls", []) is ls
+        assert classifier.cache_info()["size"] == 2
+    
+    def test_paranoid_toggle_invalidates_cache(self, classifier):
+        assert classifier.classify("ls", []).risk_level == RiskLevel.READ
+        classifier.paranoid_mode = True
+        assert classifier.classify("ls", []).risk_level == RiskLevel.HIGH_RISK
+        classifier.paranoid_mode = False
+        assert classifier.classify("ls", []).risk_level == RiskLevel.READ
+    
+    def test_manifest_change_invalidates_cache(self, classifier):
+        assert classifier.classify("mytool", []).risk_level == RiskLevel.HIGH_RISK
+        generation = classifier.generation
+        classifier.manifest = PolicyManifest(
+            version="1.0",
+            safe_commands=["mytool"],
+            write_commands=[],
+            blocked_patterns=[],
+            signature="",
+        )
+        assert classifier.generation == generation + 1
+        assert classifier.classify("mytool", []).risk_level == RiskLevel.READ
+    
+    def test_result_is_immutable(self, classifier):
+        result = classifier.classify("ls", ["-la"])
+        assert result.args == ("-la",)
+        with pytest.raises(Exception):
+            result.risk_level = RiskLevel.WRITE
+    
+    # ========================================================================
+    # Batch Classification
+    # ========================================================================
+    
+    def test_classify_many_preserves_order(self, classifier):
+        results = classifier.classify_many([
+            ("ls", ["-la"]),
+            ("rm", ["-rf", "/"]),
+            ("git", ["status"]),
+            ("ls", ["-la"]),
+        ])
+        assert [r.risk_level for r in results] == [
+            RiskLevel.READ, RiskLevel.HIGH_RISK, RiskLevel.READ, RiskLevel.READ,
+        ]
+        assert results[1].is_blocked
+        assert results[0] is results[3]
+        assert classifier.cache_info()["misses"] == 3
+    
     # ========================================================================
     # Paranoid Mode
     # ========================================================================
@@ -163,3 +258,88 @@ class TestPolicyManifest:
         # Custom write tool should be WRITE
         result = classifier.classify("custom_write_tool", [])
         assert result.risk_level == RiskLevel.WRITE
+
+    def test_manifest_subcommand_index(self):
+        """Entries keyed on (binary, subcommand) classify independently."""
+        manifest = PolicyManifest(
+            version="1.0",
+            safe_commands=["git status", "git log"],
+            write_commands=["git", "npm install"],
+            blocked_patterns=[],
+            signature="",
+        )
+        classifier = CommandClassifier(manifest=manifest)
+        
+        assert classifier.classify("git", ["status"]).risk_level == RiskLevel.READ
+        assert classifier.classify("git", ["push"]).risk_level == RiskLevel.WRITE
+        result = classifier.classify("npm", ["install", "left-pad"])
+        assert result.risk_level == RiskLevel.WRITE
+        assert result.matched_pattern == "npm install"
+        # Not in the manifest: falls through to the default patterns
+        assert classifier.classify("npm", ["run", "x"]).matched_pattern == r"^npm run\b"
+    
+    def test_manifest_lookup_uses_frozen_sets(self):
+        manifest = PolicyManifest(
+            version="1.0",
+            safe_commands=[f"tool{i}" for i in range(5000)],
+            write_commands=[],
+            blocked_patterns=[],
+            signature="",
+        )
+        assert isinstance(manifest.index.safe_commands, frozenset)
+        assert manifest.index.lookup("tool4999", []) == (RiskLevel.READ, "tool4999")
+        assert manifest.index.lookup("tool5000", []) is None
+    
+    def test_manifest_blocked_patterns_are_enforced(self):
+        manifest = PolicyManifest(
+            version="1.0",
+            safe_commands=["terraform"],
+            write_commands=[],
+            blocked_patterns=[r"^terraform\s+destroy\b"],
+            signature="",
+        )
+        classifier = CommandClassifier(manifest=manifest)
+        
+        result = classifier.classify("terraform", ["destroy"])
+        assert result.is_blocked
+        assert result.matched_pattern == r"^terraform\s+destroy\b"
+        assert not classifier.classify("terraform", ["plan"]).is_blocked
+    
+    def test_manifest_global_flag_pattern_still_loads(self):
+        manifest = PolicyManifest(
+            version="1.0",
+            safe_commands=[],
+            write_commands=[],
+            blocked_patterns=[r"^terraform\s+destroy\b", "(?i)shutdown"],
+            signature="",
+        )
+        assert not manifest.index.blocked.merged
+        classifier = CommandClassifier(manifest=manifest)
+        
+        assert classifier.classify("SHUTDOWN", ["-h", "now"]).matched_pattern == "(?i)shutdown"
+        assert classifier.classify("terraform", ["destroy"]).matched_pattern == r"^terraform\s+destroy\b"
+        assert not classifier.classify("terraform", ["plan"]).is_blocked
+    
+    def test_manifest_backreference_pattern_keeps_its_meaning(self):
+        manifest = PolicyManifest(
+            version="1.0",
+            safe_commands=[],
+            write_commands=[],
+            # Merged, the second pattern's \1 would point at the first one's group
+            blocked_patterns=[r"(x)y", r"(a)\1x"],
+            signature="",
+        )
+        assert not manifest.index.blocked.merged
+        
+        assert manifest.index.blocked_match("echo aax") == r"(a)\1x"
+        assert manifest.index.blocked_match("echo axx") is None
+        assert manifest.index.blocked_match("echo xy") == r"(x)y"
+    
+    def test_manifest_invalid_blocked_pattern_fails_load(self, tmp_path):
+        import json
+        import re
+        
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(json.dumps({"blocked_patterns": ["("]}))
+        with pytest.raises(re.error):
+            PolicyManifest.load(str(manifest_path))
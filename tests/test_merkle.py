@@ -0,0 +1,160 @@
+"""Tests for session Merkle trees."""
+
+import hashlib
+
+import pytest
+
+from terminal_adapter.domain import (
+    RiskLevel,
+    SessionManager,
+    TerminalAction,
+    TerminalSession,
+)
+from terminal_adapter.domain.merkle import (
+    EMPTY_ROOT,
+    MerkleAccumulator,
+    MerkleTree,
+    verify_consistency,
+    verify_inclusion,
+)
+
+
+def reference_root(leaves):
+    """The original full-rebuild algorithm."""
+    if not leaves:
+        return hashlib.sha256(b"empty").hexdigest()
+    hashes = list(leaves)
+    while len(hashes) > 1:
+        if len(hashes) % 2 == 1:
+            hashes.append(hashes[-1])
+        hashes = [
+            hashlib.sha256((hashes[i] + hashes[i + 1]).encode()).hexdigest()
+            for i in range(0, len(hashes), 2)
+        ]
+    return hashes[0]
+
+
+def leaf(i):
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+def test_accumulator_matches_full_rebuild():
+    acc = MerkleAccumulator()
+    assert acc.root() == EMPTY_ROOT
+    leaves = []
+    for i in range(130):
+        leaves.append(leaf(i))
+        acc.append(leaf(i))
+        assert acc.root() == reference_root(leaves), f"size {i + 1}"
+
+
+def test_session_root_is_incremental_and_identical():
+    session = TerminalSession()
+    for i in range(11):
+        session.add_action(TerminalAction(command="echo", args=[str(i)]))
+    expected = reference_root([a.compute_hash() for a in session.actions])
+    assert session.compute_merkle_root() == expected
+    assert session._merkle.size == 11
+
+
+def test_session_absorbs_directly_appended_actions():
+    """Recovery appends to ``actions`` without add_action."""
+    session = TerminalSession(session_id="recovered")
+    session.add_action(TerminalAction(command="ls"))
+    for i in range(4):
+        session.actions.append(TerminalAction(session_id="recovered", command="cat", args=[str(i)]))
+    expected = reference_root([a.compute_hash() for a in session.actions])
+    assert session.compute_merkle_root() == expected
+
+    # A replaced action list is rebuilt from scratch
+    session.actions = session.actions[:2]
+    expected = reference_root([a.compute_hash() for a in session.actions])
+    assert session.compute_merkle_root() == expected
+
+
+def test_tree_proofs_verify_for_every_size():
+    tree = MerkleTree()
+    leaves = []
+    for n in range(1, 40):
+        leaves.append(leaf(n))
+        tree.append(leaf(n))
+        root = tree.root()
+        assert root == reference_root(leaves)
+        for i in range(n):
+            proof = tree.inclusion_proof(i)
+            assert verify_inclusion(leaves[i], i, n, proof, root)
+        for m in range(1, n + 1):
+            proof = tree.consistency_proof(m)
+            assert verify_consistency(m, n, reference_root(leaves[:m]), root, proof)
+
+
+def test_tampered_proofs_are_rejected():
+    tree = MerkleTree()
+    for i in range(13):
+        tree.append(leaf(i))
+    root = tree.root()
+
+    proof = tree.inclusion_proof(12)
+    assert verify_inclusion(leaf(12), 12, 13, proof, root)
+    assert not verify_inclusion(leaf(11), 12, 13, proof, root)
+    assert not verify_inclusion(leaf(12), 12, 13, proof[:-1], root)
+    # Last odd node must be paired with itself, not an arbitrary hash
+    forged = [leaf(99)] + proof[1:]
+    assert not verify_inclusion(leaf(12), 12, 13, forged, root)
+
+    proof = tree.consistency_proof(5, 13)
+    assert verify_consistency(5, 13, tree.root(5), root, proof)
+    assert not verify_consistency(5, 13, tree.root(6), root, proof)
+    assert not verify_consistency(5, 13, tree.root(5), tree.root(12), proof)
+    assert not verify_consistency(5, 13, tree.root(5), root, list(reversed(proof)))
+
+
+@pytest.mark.asyncio
+async def test_session_manager_proofs(tmp_path):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    session = manager.create_session()
+    for i in range(3):
+        await manager.record_action(session.session_id, "echo", [str(i)], str(tmp_path), RiskLevel.READ)
+    first_root = await manager.anchor_session(session.session_id, immediate=True)
+    for i in range(4):
+        await manager.record_action(session.session_id, "ls", [str(i)], str(tmp_path), RiskLevel.READ)
+    second_root = await manager.anchor_session(session.session_id, immediate=True)
+
+    action = session.actions[5]
+    inclusion = manager.inclusion_proof(session.session_id, action.action_id)
+    assert inclusion["merkle_root"] == second_root
+    assert verify_inclusion(
+        action.compute_hash(), inclusion["leaf_index"], inclusion["tree_size"],
+        inclusion["proof"], second_root,
+    )
+    assert manager.inclusion_proof(session.session_id, "missing") is None
+
+    consistency = manager.consistency_proof(session.session_id, first_root)
+    assert consistency["second_root"] == second_root
+    assert verify_consistency(
+        consistency["first_size"], consistency["second_size"],
+        first_root, second_root, consistency["proof"],
+    )
+    with pytest.raises(ValueError):
+        manager.consistency_proof(session.session_id, "not-anchored")
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_recorded_actions_are_hashed_once(tmp_path, monkeypatch):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    session = manager.create_session()
+    calls = []
+    original = TerminalAction.compute_hash
+    monkeypatch.setattr(TerminalAction, "compute_hash", lambda self: calls.append(1) or original(self))
+
+    for i in range(5):
+        await manager.record_action(session.session_id, "echo", [str(i)], str(tmp_path), RiskLevel.READ)
+    root = session.compute_merkle_root()
+    proof = manager.inclusion_proof(session.session_id, session.actions[-1].action_id)
+
+    assert len(calls) == 5
+    # The session's root and the proof tree are one structure
+    assert session.merkle_tree() is manager._sync_tree(session)
+    assert proof["merkle_root"] == root == reference_root([original(a) for a in session.actions])
+    await manager.close()
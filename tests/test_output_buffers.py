@@ -0,0 +1,99 @@
+"""Tests for bounded output buffers."""
+
+import hashlib
+import sys
+
+import pytest
+
+from terminal_adapter.domain import CappedOutput, OutputRing
+
+
+def feed(capture, data, chunk_size):
+    for i in range(0, len(data), chunk_size):
+        capture.write(data[i:i + chunk_size])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10_000])
+def test_capped_output_head_only(chunk_size):
+    data = bytes(range(256)) * 40
+    capture = CappedOutput(limit=1000)
+    feed(capture, data, chunk_size)
+
+    assert capture.getvalue() == data[:1000]
+    assert capture.truncated
+    assert capture.total_bytes == len(data)
+    assert capture.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10_000])
+def test_capped_output_head_and_tail(chunk_size):
+    data = bytes(range(256)) * 40
+    capture = CappedOutput(limit=1000, tail_bytes=300)
+    feed(capture, data, chunk_size)
+
+    assert capture.getvalue() == data[:700] + data[-300:]
+    assert capture.truncated
+
+
+def test_capped_output_under_limit_is_complete():
+    data = b"hello\nworld\n"
+    capture = CappedOutput(limit=1000, tail_bytes=8)
+    feed(capture, data, 3)
+
+    assert capture.getvalue() == data
+    assert capture.text() == "hello\nworld\n"
+    assert not capture.truncated
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10_000])
+def test_output_ring_keeps_newest_bytes(chunk_size):
+    data = bytes(range(256)) * 40
+    ring = OutputRing(capacity=1000)
+    feed(ring, data, chunk_size)
+
+    assert ring.getvalue() == data[-1000:]
+    assert ring.end == len(data)
+    assert ring.start == len(data) - 1000
+    assert len(ring) == 1000
+
+
+def test_output_ring_reader_offsets_and_drops():
+    ring = OutputRing(capacity=8)
+    ring.write(b"abcdef")
+    views, offset, dropped = ring.read(0, max_bytes=4)
+    assert b"".join(views) == b"abcd" and offset == 4 and dropped == 0
+
+    ring.write(b"ghijk")  # Wraps; "abc" is overwritten
+    views, offset, dropped = ring.read(offset)
+    assert [bytes(v) for v in views] == [b"efgh", b"ijk"]
+    assert (offset, dropped) == (11, 0)
+    assert all(v.obj is ring._buf for v in views)  # Zero-copy slices of the ring
+
+    ring.write(b"0123456789")  # A slow reader at 11 loses 2 bytes
+    views, offset, dropped = ring.read(11)
+    assert b"".join(views) == b"23456789"
+    assert (offset, dropped) == (21, 2)
+    assert ring.read(offset) == ([], 21, 0)
+
+
+@pytest.mark.asyncio
+async def test_execute_command_caps_large_output(monkeypatch, tmp_path):
+    import terminal_adapter.main as main
+
+    monkeypatch.setattr(main, "MAX_OUTPUT_BYTES", 4096)
+    size = 2 * 1024 * 1024
+    stdout, stderr, exit_code = await main._execute_command(
+        command=sys.executable,
+        args=["-c", f"import sys; sys.stdout.write('x' * {size}); sys.stderr.write('err')"],
+        cwd=str(tmp_path),
+        env=None,
+        timeout_ms=30000,
+    )
+
+    assert exit_code == 0
+    assert stdout.text() == "x" * 4096
+    assert stdout.truncated
+    assert stdout.total_bytes == size
+    assert stdout.hexdigest() == hashlib.sha256(b"x" * size).hexdigest()
+    assert stderr.text() == "err"
+    assert not stderr.truncated
@@ -0,0 +1,91 @@
+"""Tests for policy manifest hot reload."""
+
+import json
+
+import pytest
+
+from terminal_adapter.domain import (
+    CommandClassifier,
+    ManifestWatcher,
+    RiskLevel,
+    build_classifier,
+)
+from terminal_adapter.domain.crypto import generate_keypair, sign_json
+
+
+@pytest.fixture
+def keys():
+    return generate_keypair()
+
+
+def write_manifest(path, private_key, safe_commands, tamper=False):
+    data = {
+        "version": "1.0",
+        "safe_commands": safe_commands,
+        "write_commands": [],
+        "blocked_patterns": [],
+    }
+    signature = sign_json(data, private_key).hex()
+    if tamper:
+        data["safe_commands"] = safe_commands + ["rm"]
+    path.write_text(json.dumps({**data, "signature": signature}))
+
+
+def test_build_classifier_verifies_signature(tmp_path, keys):
+    private_key, public_key = keys
+    manifest_path = tmp_path / "manifest.json"
+    write_manifest(manifest_path, private_key, ["mytool"])
+
+    classifier = build_classifier(str(manifest_path), public_key)
+    assert not classifier.paranoid_mode
+    assert classifier.classify("mytool", []).risk_level == RiskLevel.READ
+
+    _, other_public = generate_keypair()
+    assert build_classifier(str(manifest_path), other_public).paranoid_mode
+
+
+@pytest.mark.asyncio
+async def test_watcher_swaps_classifier_on_change(tmp_path, keys):
+    private_key, public_key = keys
+    manifest_path = tmp_path / "manifest.json"
+    write_manifest(manifest_path, private_key, ["mytool"])
+
+    swapped = []
+    watcher = ManifestWatcher(str(manifest_path), public_key, on_reload=swapped.append)
+
+    # Unchanged file: nothing to do
+    assert await watcher.check() is False
+
+    write_manifest(manifest_path, private_key, ["mytool", "othertool"])
+    assert await watcher.check() is True
+
+    classifier = swapped[-1]
+    assert isinstance(classifier, CommandClassifier)
+    assert not classifier.paranoid_mode
+    assert classifier.classify("othertool", []).risk_level == RiskLevel.READ
+
+    metrics = watcher.metrics()
+    assert metrics["reload_count"] == 1
+    assert metrics["reload_failures"] == 0
+    assert metrics["last_reload_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_watcher_enters_paranoid_mode_on_bad_signature(tmp_path, keys):
+    private_key, public_key = keys
+    manifest_path = tmp_path / "manifest.json"
+    write_manifest(manifest_path, private_key, ["mytool"])
+
+    swapped = []
+    watcher = ManifestWatcher(str(manifest_path), public_key, on_reload=swapped.append)
+
+    write_manifest(manifest_path, private_key, ["mytool", "extra"], tamper=True)
+    assert await watcher.check() is True
+    assert swapped[-1].paranoid_mode
+    assert watcher.metrics()["reload_failures"] == 1
+
+    # A deleted manifest is also treated as a failed reload
+    manifest_path.unlink()
+    assert await watcher.check() is True
+    assert swapped[-1].paranoid_mode
+    assert watcher.metrics()["reload_failures"] == 2
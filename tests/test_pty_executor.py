@@ -2,12 +2,22 @@
 Tests for PTYExecutor.
 """
 
+import asyncio
+import sys
+
 import pytest
 from unittest.mock import patch
 from terminal_adapter.domain.pty_executor import PTYExecutor, SessionState
 
+
+@pytest.fixture
+def fake_fd():
+    """Keep the mocked master fd (10) away from the event loop."""
+    with patch.object(PTYExecutor, "_watch"):
+        yield
+
 @pytest.mark.asyncio
-async def test_start_session():
+async def test_start_session(fake_fd):
     """Test starting a session."""
     executor = PTYExecutor(project_root="/tmp")
     
@@ -32,7 +42,7 @@ async def test_start_session():
         assert session.session_id in executor.sessions
 
 @pytest.mark.asyncio
-async def test_write_input():
+async def test_write_input(fake_fd):
     """Test writing input to a session."""
     executor = PTYExecutor(project_root="/tmp")
     
@@ -40,12 +50,12 @@ async def test_write_input():
     with patch("pty.fork", return_value=(12345, 10)):
         session = await executor.start_session("cat", [], "/tmp")
     
-    with patch("os.write") as mock_write:
+    with patch("os.write", side_effect=lambda fd, data: len(data)) as mock_write:
         await executor.write_input(session.session_id, "hello\n")
         mock_write.assert_called_with(10, b"hello\n")
 
 @pytest.mark.asyncio
-async def test_read_output():
+async def test_read_output(fake_fd):
     """Test reading output from a session."""
     executor = PTYExecutor(project_root="/tmp")
     
@@ -61,7 +71,7 @@ async def test_read_output():
     assert not is_complete  # It's still "alive" in our mock
 
 @pytest.mark.asyncio
-async def test_abort_session():
+async def test_abort_session(fake_fd):
     """Test aborting a session."""
     executor = PTYExecutor(project_root="/tmp")
     
@@ -72,3 +82,289 @@ async def test_abort_session():
         await executor.abort_session(session.session_id)
         mock_kill.assert_called()
         assert session.state == SessionState.ABORTED
+
+
+@pytest.mark.asyncio
+async def test_output_is_read_when_readable(tmp_path):
+    """Test real PTY output reaching the callback and the buffer."""
+    executor = PTYExecutor(project_root=str(tmp_path))
+    chunks = []
+    
+    session = await executor.start_session(
+        sys.executable, ["-c", "import sys; sys.stdout.write(input().upper() + '\\u00e9')"],
+        str(tmp_path), on_output=lambda sid, text: chunks.append(text),
+    )
+    assert executor.metrics()["watched"] == 1
+    await executor.write_input(session.session_id, "hello\n")
+    
+    output, is_complete = await executor.read_output(session.session_id, timeout_ms=5000)
+    while not is_complete:
+        more, is_complete = await executor.read_output(session.session_id, timeout_ms=5000)
+        output += more
+    
+    assert "HELLO\u00e9" in "".join(chunks)
+    assert "HELLO\u00e9" in output
+    await asyncio.sleep(0.1)
+    assert session.exit_code == 0
+    assert session.state == SessionState.COMPLETED
+    assert executor.metrics()["watched"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_not_polled(tmp_path):
+    """Test that idle sessions wait on the loop instead of polling."""
+    executor = PTYExecutor(project_root=str(tmp_path))
+    for _ in range(5):
+        await executor.start_session("sleep", ["30"], str(tmp_path))
+    
+    pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    assert pending == []
+    
+    await executor.cleanup_all()
+    assert all(s.state == SessionState.ABORTED for s in executor.sessions.values())
+    assert all(s.exit_code == -9 for s in executor.sessions.values())
+    assert executor.metrics()["watched"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_reader_loses_oldest_output(tmp_path):
+    """Test that unread output is bounded by the ring capacity."""
+    executor = PTYExecutor(project_root=str(tmp_path), output_capacity=1024)
+    session = await executor.start_session(
+        sys.executable, ["-c", "print('x' * 9000 + 'END')"], str(tmp_path),
+    )
+    while executor.metrics()["watched"]:
+        await asyncio.sleep(0.01)
+    
+    assert session.output.end > 9000
+    assert len(session.output) == 1024
+    output, is_complete = await executor.read_output(session.session_id)
+    assert is_complete
+    assert output.rstrip().endswith("xEND")
+    assert len(output) == 1024
+    assert session.dropped_bytes == session.output.end - 1024
+    assert executor.metrics()["dropped_bytes"] == session.dropped_bytes
+
+
+async def _drain(subscriber):
+    text = ""
+    while True:
+        chunk = subscriber.read()
+        text += chunk.text
+        if chunk.complete:
+            return text, chunk
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_subscribers_each_see_full_output(tmp_path):
+    """Test independent cursors, resume by offset and drops for laggards."""
+    executor = PTYExecutor(project_root=str(tmp_path), output_capacity=1024)
+    session = await executor.start_session(
+        sys.executable, ["-c", "print('a' * 500); input(); print('b' * 2000)"], str(tmp_path),
+    )
+    first = executor.subscribe(session.session_id)
+    second = executor.subscribe(session.session_id)
+    assert executor.subscribe("missing") is None
+    assert executor.metrics()["subscribers"] == 2
+    
+    head = ""
+    while "a" * 500 not in head:
+        head += first.read().text
+        await asyncio.sleep(0.01)
+    resumed = executor.subscribe(session.session_id, first.read().offset)
+    await executor.write_input(session.session_id, "\n")
+    text, chunk = await _drain(first)
+    assert "b" * 1000 in text
+    assert chunk.offset == session.output.end
+    
+    # Nobody else's reads consumed anything
+    text, _ = await _drain(resumed)
+    assert text.rstrip().endswith("b" * 1000)
+    
+    # The untouched subscriber fell behind by more than the ring holds
+    chunk = second.read()
+    assert chunk.dropped == session.output.end - 1024
+    assert second.dropped_bytes == chunk.dropped
+    
+    for subscriber in (first, second, resumed):
+        subscriber.close()
+    assert executor.metrics()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sse_streams_are_independent(tmp_path):
+    """Test two SSE clients on one session and Last-Event-ID resume."""
+    from terminal_adapter.main import state, terminal_stream
+    
+    async def events(response):
+        body = "".join([part async for part in response.body_iterator])
+        return [block.split("\n") for block in body.split("\n\n") if block]
+    
+    state.pty_executor = PTYExecutor(project_root=str(tmp_path))
+    try:
+        session = await state.pty_executor.start_session(
+            sys.executable, ["-c", "print('one'); print('two')"], str(tmp_path),
+        )
+        streams = [await terminal_stream(session.session_id, "skip", None) for _ in range(2)]
+        for response in streams:
+            blocks = await events(response)
+            assert blocks[-1] == ["event: complete", "data: {}"]
+            data = [line[6:] for block in blocks for line in block if line.startswith("data: ")]
+            assert "one" in data and "two" in data
+        
+        resumed = await terminal_stream(session.session_id, "skip", "5")
+        blocks = await events(resumed)
+        assert blocks[0][0] == f"id: {session.output.end}"
+        assert "data: two" in blocks[0]
+        assert "data: one" not in blocks[0]
+        assert state.pty_executor.metrics()["subscribers"] == 0
+    finally:
+        await state.pty_executor.cleanup_all()
+        state.pty_executor = None
+
+
+@pytest.mark.asyncio
+async def test_subscriber_coalesces_pushed_output(tmp_path):
+    """Test that small writes are coalesced and idle waits time out."""
+    executor = PTYExecutor(project_root=str(tmp_path))
+    session = await executor.start_session(
+        sys.executable,
+        ["-c", "import time; print('a', flush=True); time.sleep(0.05); print('b'); input()"],
+        str(tmp_path),
+    )
+    subscriber = executor.subscribe(session.session_id)
+    
+    chunk = await subscriber.next(flush_interval=5, flush_bytes=6, idle_timeout=5)
+    assert chunk.text == "a\r\nb\r\n"
+    assert await subscriber.next(idle_timeout=0.05) is None
+    
+    await executor.write_input(session.session_id, "\n")
+    text = ""
+    while not (chunk := await subscriber.next(idle_timeout=5)).complete:
+        text += chunk.text
+    assert session.state == SessionState.COMPLETED
+    assert session.exit_code == 0
+    await executor.cleanup_all()
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_sends_heartbeats(tmp_path, monkeypatch):
+    """Test heartbeat comments on an idle stream."""
+    from terminal_adapter import main
+    
+    monkeypatch.setattr(main, "STREAM_HEARTBEAT_SECONDS", 0.02)
+    main.state.pty_executor = PTYExecutor(project_root=str(tmp_path))
+    try:
+        session = await main.state.pty_executor.start_session("sleep", ["0.2"], str(tmp_path))
+        response = await main.terminal_stream(session.session_id, "skip", None)
+        body = "".join([part async for part in response.body_iterator])
+        assert body.startswith(": heartbeat\n\n")
+        assert body.endswith("event: complete\ndata: {}\n\n")
+    finally:
+        await main.state.pty_executor.cleanup_all()
+        main.state.pty_executor = None
+
+
+class _FakeWebSocket:
+    """Just enough of Starlette's WebSocket for terminal:attach."""
+    
+    def __init__(self, *frames):
+        self.incoming = asyncio.Queue()
+        self.sent = asyncio.Queue()
+        self.accepted = False
+        self.close_code = None
+        for frame in frames:
+            self.push(frame)
+    
+    def push(self, frame):
+        key = "text" if isinstance(frame, str) else "bytes"
+        self.incoming.put_nowait({"type": "websocket.receive", key: frame})
+    
+    async def accept(self):
+        self.accepted = True
+    
+    async def receive(self):
+        return await self.incoming.get()
+    
+    async def send_bytes(self, data):
+        self.sent.put_nowait(data)
+    
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+
+
+@pytest.mark.asyncio
+async def test_attach_multiplexes_session_over_websocket(tmp_path):
+    """Test stdin, output, resize and abort frames on one WebSocket."""
+    import fcntl
+    import json
+    import struct
+    import termios
+    from terminal_adapter.main import AttachFrame, state, terminal_attach
+    
+    state.pty_executor = PTYExecutor(project_root=str(tmp_path))
+    try:
+        session = await state.pty_executor.start_session("cat", [], str(tmp_path))
+        socket = _FakeWebSocket(
+            bytes([AttachFrame.RESIZE]) + struct.pack("!HH", 40, 100),
+            bytes([AttachFrame.STDIN]) + b"caf\xc3\xa9\n",
+        )
+        attached = asyncio.create_task(terminal_attach(socket, session.session_id))
+        
+        output = b""
+        while output.count(b"caf\xc3\xa9") < 2:  # Terminal echo, then cat
+            frame = await asyncio.wait_for(socket.sent.get(), 5)
+            assert frame[0] == AttachFrame.STDOUT
+            output += frame[1:]
+        size = fcntl.ioctl(session.master_fd, termios.TIOCGWINSZ, b"\0" * 8)
+        assert struct.unpack("HHHH", size)[:2] == (40, 100)
+        
+        socket.push(bytes([AttachFrame.ABORT, 0x01]))
+        await asyncio.wait_for(attached, 5)
+        frames = [socket.sent.get_nowait() for _ in range(socket.sent.qsize())]
+        assert frames[-1][0] == AttachFrame.EXIT
+        assert json.loads(frames[-1][1:]) == {"exit_code": -9, "state": "aborted"}
+        assert socket.close_code == 1000
+        assert state.pty_executor.metrics()["subscribers"] == 0
+        
+        rejected = _FakeWebSocket("text")
+        await terminal_attach(rejected, "missing")
+        assert (rejected.accepted, rejected.close_code) == (False, 1008)
+        session = await state.pty_executor.start_session("cat", [], str(tmp_path))
+        await asyncio.wait_for(terminal_attach(rejected, session.session_id), 5)
+        assert (rejected.accepted, rejected.close_code) == (True, 1003)
+    finally:
+        await state.pty_executor.cleanup_all()
+        state.pty_executor = None
+
+
+@pytest.mark.asyncio
+async def test_attach_copies_output_before_sending_drop_notice(fake_fd):
+    """Test that output written while a frame is sent can't corrupt it."""
+    from terminal_adapter.main import AttachFrame, state, terminal_attach
+    
+    state.pty_executor = PTYExecutor(project_root="/tmp", output_capacity=16)
+    try:
+        with patch("pty.fork", return_value=(12345, 10)):
+            session = await state.pty_executor.start_session("cat", [], "/tmp")
+        session.output.write(b"lost-" + b"0123456789abcdef")
+        retained = session.output.getvalue(session.output.start)
+        
+        class Overrunning(_FakeWebSocket):
+            async def send_bytes(self, data):
+                if data[0] == AttachFrame.DROPPED:
+                    session.output.write(b"Z" * 16)  # The PTY reader runs meanwhile
+                await super().send_bytes(data)
+        
+        socket = Overrunning()
+        attached = asyncio.create_task(terminal_attach(socket, session.session_id, offset=0))
+        dropped = await asyncio.wait_for(socket.sent.get(), 5)
+        output = await asyncio.wait_for(socket.sent.get(), 5)
+        attached.cancel()
+        await asyncio.gather(attached, return_exceptions=True)
+        
+        assert dropped[0] == AttachFrame.DROPPED
+        assert output == bytes([AttachFrame.STDOUT]) + retained
+    finally:
+        state.pty_executor = None
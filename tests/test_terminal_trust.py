@@ -84,6 +84,33 @@ async def test_check_capability_hardening(keys):
     
     assert await client.check_capability("scope", "touch", RiskLevel.WRITE, token) is True
 
+@pytest.mark.asyncio
+async def test_tga_client_reuses_one_pool():
+    import httpx
+    from terminal_adapter.domain import SupervisorDecision
+    
+    timeouts = []
+    
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={"decision": "approved"})
+    
+    client = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler), timeout_seconds=30)
+    action_request = client.build_action_request("rm", ["./build"], "/repo", RiskLevel.HIGH_RISK)
+    for _ in range(5):
+        response = await client.request_approval(action_request)
+        assert response.decision == SupervisorDecision.APPROVED
+    pool = client._client
+    await client.request_approval(action_request, timeout=2.5)
+    
+    assert client._client is pool
+    assert timeouts == [30] * 5 + [2.5]
+    metrics = client.metrics()
+    assert metrics["requests"] == 6
+    assert metrics["latency_p99_ms"] >= metrics["latency_p50_ms"] > 0
+    assert metrics["pool"]["requests"] == 6
+    await client.close()
+
 @pytest.mark.asyncio
 async def test_anchor_to_audit(keys):
     # Mocking httpx.AsyncClient.post
@@ -151,3 +178,91 @@ def test_paranoid_mode_activation(pem_public_key, keys):
     finally:
         if os.path.exists(manifest_path):
             os.remove(manifest_path)
+
+@pytest.mark.asyncio
+async def test_classify_batch_endpoint():
+    from terminal_adapter.main import (
+        TerminalClassifyBatchRequest,
+        terminal_classify_batch,
+    )
+    from terminal_adapter.domain import CommandClassifier
+    
+    state.classifier = CommandClassifier()
+    request = TerminalClassifyBatchRequest(commands=[
+        {"command": "ls", "args": ["-la"]},
+        {"command": "pkill", "args": ["python"]},
+        {"command": "npm", "args": ["install"]},
+    ])
+    
+    response = await terminal_classify_batch(request)
+    
+    assert [r.risk_level for r in response.results] == ["READ", "HIGH_RISK", "WRITE"]
+    assert response.results[1].is_blocked
+    assert response.results[1].matched_pattern == r"^pkill\b"
+    assert response.results[0].args == ["-la"]
+    assert response.paranoid_mode is False
+
+@pytest.mark.asyncio
+async def test_readiness_tracks_session_recovery(tmp_path):
+    from terminal_adapter.main import readiness_check
+    from terminal_adapter.domain import SessionManager
+    
+    state.session_manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    state.session_manager.recovery["state"] = "running"
+    response = await readiness_check()
+    assert response.status_code == 503
+    assert json.loads(response.body)["recovery"]["state"] == "running"
+    
+    await state.session_manager.recover_all()
+    response = await readiness_check()
+    assert response.status_code == 200
+    assert json.loads(response.body)["ready"] is True
+    await state.session_manager.close()
+    state.session_manager = None
+
+@pytest.mark.asyncio
+async def test_execute_plan_runs_approved_steps_in_order(tmp_path):
+    import httpx
+    from terminal_adapter.main import TerminalExecutePlanRequest, terminal_execute_plan
+    from terminal_adapter.domain import CommandClassifier, SessionManager
+    
+    submissions = []
+    
+    def handler(request):
+        body = json.loads(request.content)
+        submissions.append(body)
+        return httpx.Response(200, json={"decisions": [
+            {"action_request_id": r["action_request_id"],
+             "decision": "rejected" if r["proposal"]["args"] == ["./b"] else "approved"}
+            for r in body["action_requests"]
+        ]})
+    
+    state.classifier = CommandClassifier()
+    state.project_root = str(tmp_path)
+    state.session_manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path / "wal"))
+    state.tga_client = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler))
+    try:
+        request = TerminalExecutePlanRequest(steps=[
+            {"command": "mkdir", "args": ["./a"], "cwd": str(tmp_path)},
+            {"command": "ls", "args": [], "cwd": str(tmp_path)},
+            {"command": "mkdir", "args": ["./b"], "cwd": str(tmp_path)},
+            {"command": "mkdir", "args": ["./c"], "cwd": str(tmp_path)},
+        ])
+        response = await terminal_execute_plan(request, None, None)
+        
+        assert len(submissions) == 1
+        assert len(submissions[0]["action_requests"]) == 3
+        assert response.plan_id == submissions[0]["plan_id"]
+        assert [r.decision for r in response.results] == ["approved", "not_required", "rejected", "approved"]
+        assert [r.status for r in response.results] == ["completed", "completed", "rejected", "skipped"]
+        assert (tmp_path / "a").is_dir() and not (tmp_path / "c").exists()
+        assert len(state.session_manager.get_session(response.session_id).actions) == 2
+        
+        request.continue_on_error = True
+        response = await terminal_execute_plan(request, None, None)
+        assert [r.status for r in response.results] == ["completed", "completed", "rejected", "completed"]
+        assert (tmp_path / "c").is_dir()
+    finally:
+        await state.tga_client.close()
+        await state.session_manager.close()
+        state.session_manager = state.tga_client = None
@@ -0,0 +1,284 @@
+"""Tests for TGA client approval caching and request coalescing."""
+
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+import pytest
+
+from terminal_adapter.domain import (
+    ApprovalCache,
+    RiskLevel,
+    SupervisorDecision,
+    TGAClient,
+    TGAError,
+)
+from terminal_adapter.domain.crypto import generate_keypair, verify_json_signature
+from terminal_adapter.domain.tga_client import capability_expiry, capability_scope
+
+
+def _client(responses, **kwargs):
+    """TGA client whose Supervisor answers from ``responses`` in order."""
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        return httpx.Response(200, json=responses[min(len(calls), len(responses)) - 1])
+
+    client = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler), **kwargs)
+    return client, calls
+
+
+@pytest.mark.asyncio
+async def test_cached_approval_skips_supervisor():
+    client, calls = _client([{"decision": "approved"}], approval_cache=ApprovalCache())
+
+    first = client.build_action_request("npm", ["install"], "/repo", RiskLevel.WRITE)
+    second = client.build_action_request("npm", ["install"], "/repo", RiskLevel.WRITE)
+    other_cwd = client.build_action_request("npm", ["install"], "/other", RiskLevel.WRITE)
+
+    assert (await client.request_approval(first)).decision == SupervisorDecision.APPROVED
+    response = await client.request_approval(second)
+    assert response.decision == SupervisorDecision.APPROVED
+    assert response.action_request_id == second.action_request_id
+    assert len(calls) == 1
+
+    await client.request_approval(other_cwd)
+    assert len(calls) == 2
+    metrics = client.metrics()["approval_cache"]
+    assert metrics["hits"] == 1
+    assert metrics["hit_rate"] == pytest.approx(1 / 3)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_rejections_and_uncached_risk_levels_go_to_supervisor():
+    client, calls = _client(
+        [{"decision": "rejected"}, {"decision": "rejected"}, {"decision": "approved"}],
+        approval_cache=ApprovalCache(),
+    )
+    write = client.build_action_request("touch", ["./a"], "/repo", RiskLevel.WRITE)
+    high_risk = client.build_action_request("rm", ["./a"], "/repo", RiskLevel.HIGH_RISK)
+
+    await client.request_approval(write)
+    await client.request_approval(write)
+    await client.request_approval(high_risk)
+    await client.request_approval(high_risk)
+    assert len(calls) == 4
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_honours_response_ttl_and_capability_expiry():
+    cache = ApprovalCache(ttl_seconds=300)
+    client, calls = _client(
+        [{"decision": "approved", "ttl_seconds": 0},
+         {"decision": "approved", "minted_capability": json.dumps({"data": {"exp": time.time() - 1}})},
+         {"decision": "approved", "ttl_seconds": 60}],
+        approval_cache=cache,
+    )
+    request = client.build_action_request("make", [], "/repo", RiskLevel.WRITE)
+
+    for _ in range(4):
+        await client.request_approval(request)
+    assert len(calls) == 3  # Only the third response was cacheable
+
+    deadline, _ = next(iter(cache._entries.values()))
+    assert deadline <= time.monotonic() + 60
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_revoke_and_bounded_size():
+    cache = ApprovalCache(max_size=2)
+    client, calls = _client([{"decision": "approved"}], approval_cache=cache)
+    requests = [client.build_action_request("mkdir", [f"./{n}"], "/repo", RiskLevel.WRITE) for n in range(3)]
+    for request in requests:
+        await client.request_approval(request)
+    assert cache.metrics()["size"] == 2
+    assert cache.metrics()["evictions"] == 1
+
+    assert cache.revoke(digest=requests[2].digest) == 1
+    await client.request_approval(requests[2])
+    assert len(calls) == 4
+    assert cache.revoke() == 2
+    await client.close()
+
+
+def test_capability_expiry_formats():
+    assert capability_expiry(None) is None
+    assert capability_expiry(json.dumps({"data": {"exp": 1700000000}})) == 1700000000
+    assert capability_expiry(json.dumps({"expires_at": "2024-01-01T00:00:00Z"})) == 1704067200
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": 1800000000}).encode()).decode().rstrip("=")
+    assert capability_expiry(f"eyJhbGciOiJFZERTQSJ9.{payload}.sig") == 1800000000
+    assert capability_expiry("not a capability") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_round_trip():
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await release.wait()
+        return httpx.Response(200, json={"decision": "approved"})
+
+    client = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler))
+    requests = [client.build_action_request("npm", ["ci"], "/repo", RiskLevel.WRITE) for _ in range(5)]
+    other = client.build_action_request("npm", ["test"], "/repo", RiskLevel.WRITE)
+
+    pending = [asyncio.create_task(client.request_approval(r)) for r in requests + [other]]
+    await asyncio.sleep(0.01)
+    pending[0].cancel()  # The first caller giving up doesn't cancel the others
+    release.set()
+    responses = await asyncio.gather(*pending[1:])
+
+    assert len(calls) == 2
+    assert [r.action_request_id for r in responses] == [r.action_request_id for r in requests[1:] + [other]]
+    assert all(r.decision == SupervisorDecision.APPROVED for r in responses)
+    assert client.metrics()["coalesced"] == 4
+    assert client.metrics()["in_flight"] == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_share_errors():
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(500, text="boom")
+
+    client = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler))
+    request = client.build_action_request("npm", ["ci"], "/repo", RiskLevel.WRITE)
+    results = await asyncio.gather(
+        *(client.request_approval(request) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, TGAError) for r in results)
+    assert client.metrics()["requests"] == 1
+    await client.close()
+
+
+def _plan_client(batch_status=200, **kwargs):
+    """TGA client whose batch endpoint approves every step but ``rm``."""
+    calls = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        calls.append((request.url.path, body))
+        if request.url.path.endswith("/batch"):
+            if batch_status != 200:
+                return httpx.Response(batch_status)
+            return httpx.Response(200, json={"decisions": [
+                {
+                    "action_request_id": r["action_request_id"],
+                    "decision": "rejected" if r["proposal"]["command"] == "rm" else "approved",
+                }
+                for r in body["action_requests"]
+            ]})
+        return httpx.Response(200, json={"decision": "approved"})
+
+    client = TGAClient(tga_url="http://tga", transport=httpx.MockTransport(handler), **kwargs)
+    return client, calls
+
+
+@pytest.mark.asyncio
+async def test_plan_is_approved_in_one_call():
+    client, calls = _plan_client(approval_cache=ApprovalCache())
+    steps = [
+        client.build_action_request("npm", ["ci"], "/repo", RiskLevel.WRITE),
+        client.build_action_request("rm", ["./dist"], "/repo", RiskLevel.HIGH_RISK),
+        client.build_action_request("npm", ["publish"], "/repo", RiskLevel.WRITE),
+    ]
+    plan = client.build_plan(steps)
+    assert {r.plan_id for r in steps} == {plan.plan_id}
+
+    responses = await client.request_plan_approval(plan)
+    assert [r.decision for r in responses] == [
+        SupervisorDecision.APPROVED, SupervisorDecision.REJECTED, SupervisorDecision.APPROVED,
+    ]
+    assert [r.action_request_id for r in responses] == [r.action_request_id for r in steps]
+    assert len(calls) == 1
+    assert calls[0][1]["digest"] == plan.digest
+
+    # Approved WRITE steps now come from the cache; only the rest is submitted
+    again = client.build_plan([
+        client.build_action_request("npm", ["ci"], "/repo", RiskLevel.WRITE),
+        client.build_action_request("rm", ["./dist"], "/repo", RiskLevel.HIGH_RISK),
+    ])
+    await client.request_plan_approval(again)
+    assert len(calls) == 2
+    assert [r["proposal"]["command"] for r in calls[1][1]["action_requests"]] == ["rm"]
+    assert client.metrics()["plans"] == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_plan_envelope_is_signed():
+    private_key, public_key = generate_keypair()
+    client, calls = _plan_client(signing_key=private_key)
+    plan = client.build_plan([
+        client.build_action_request("npm", ["ci"], "/repo", RiskLevel.WRITE),
+        client.build_action_request("npm", ["test"], "/repo", RiskLevel.WRITE),
+    ])
+    await client.request_plan_approval(plan)
+
+    body = calls[0][1]
+    signed = {
+        "agent_id": body["agent_id"],
+        "plan_id": body["plan_id"],
+        "trace_id": body["trace_id"],
+        "ts": body["ts"],
+        "intent": body["intent"],
+        "action_request_ids": [r["action_request_id"] for r in body["action_requests"]],
+        "digest": body["digest"],
+    }
+    assert verify_json_signature(signed, bytes.fromhex(body["signature"]), public_key)
+    signed["action_request_ids"].reverse()
+    assert not verify_json_signature(signed, bytes.fromhex(body["signature"]), public_key)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_plan_falls_back_to_individual_requests():
+    client, calls = _plan_client(batch_status=404)
+    plan = client.build_plan([
+        client.build_action_request("npm", ["ci"], "/repo", RiskLevel.WRITE),
+        client.build_action_request("npm", ["test"], "/repo", RiskLevel.WRITE),
+    ])
+
+    responses = await client.request_plan_approval(plan)
+    assert all(r.decision == SupervisorDecision.APPROVED for r in responses)
+    assert client.batch_supported is False
+    assert [path for path, _ in calls] == ["/action-requests/batch", "/action-requests", "/action-requests"]
+
+    await client.request_plan_approval(plan)
+    assert [path for path, _ in calls[3:]] == ["/action-requests", "/action-requests"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_approvals_are_not_shared_between_requesters():
+    cache = ApprovalCache()
+    client, calls = _client([{"decision": "approved"}], approval_cache=cache)
+    read_scope = json.dumps({"data": {"scope": "terminal:read"}, "signature": "00"})
+
+    def request(**requester):
+        return client.build_action_request("npm", ["install"], "/repo", RiskLevel.WRITE, **requester)
+
+    await client.request_approval(request(principal="alice", session_id="s1"))
+    await client.request_approval(request(principal="alice", session_id="s1"))
+    assert len(calls) == 1
+
+    await client.request_approval(request(principal="mallory", session_id="s1"))
+    await client.request_approval(request(principal="alice", session_id="s2"))
+    await client.request_approval(
+        request(principal="alice", session_id="s1", scope=capability_scope(read_scope))
+    )
+    assert len(calls) == 4
+    # The requester never reaches TGA
+    assert all("principal" not in call for call in calls)
+
+    assert cache.revoke(principal="alice") == 3
+    await client.close()
@@ -148,3 +148,39 @@ def test_action_request_digest():
     expected_digest = hashlib.sha256(expected_jcs).hexdigest()
     
     assert req.digest == expected_digest
+
+
+def test_keyring_parses_each_key_once(keys):
+    """Test that the keyring reuses parsed key objects."""
+    from terminal_adapter.domain.crypto import Keyring
+    priv, pub = keys
+    keyring = Keyring()
+    
+    signatures = [keyring.sign({"n": n}, priv) for n in range(5)]
+    results = keyring.verify_many([({"n": n}, sig) for n, sig in enumerate(signatures)], pub)
+    assert results == [True] * 5
+    assert keyring.verify({"n": 0}, signatures[1], pub) is False
+    assert keyring.verify({"n": 0}, signatures[0], pub) is True
+    assert keyring.verify({"n": 1}, signatures[0], pub) is False
+    assert keyring.verify_many([({"n": 0}, signatures[0])], b"short") == [False]
+    assert keyring.metrics()["parsed"] == 2  # One private, one public
+
+
+def test_verify_capabilities_batch(keys):
+    """Test verifying many capability tokens in one call."""
+    priv, pub = keys
+    client = TGAClient(supervisor_public_key=pub)
+    
+    def token(data, signer=priv):
+        return json.dumps({"data": data, "signature": sign_json(data, signer).hex()})
+    
+    other_priv, _ = generate_keypair()
+    tokens = [
+        token({"scope": "terminal:write", "n": 1}),
+        token({"scope": "terminal:write", "n": 2}, signer=other_priv),
+        "not json",
+        None,
+        token({"scope": "terminal:write", "n": 3}),
+    ]
+    assert client.verify_capabilities(tokens) == [True, False, False, False, True]
+    assert TGAClient().verify_capabilities(tokens) == [False] * 5
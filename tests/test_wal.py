@@ -0,0 +1,355 @@
+"""Tests for the Write-Ahead Log and group commit writer."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from terminal_adapter.domain import (
+    GroupCommitWriter,
+    RiskLevel,
+    SegmentedLog,
+    SessionManager,
+    TerminalAction,
+    WriteAheadLog,
+)
+from terminal_adapter.domain import wal
+from terminal_adapter.domain.session_manager import pack_action, unpack_action
+
+
+@pytest.mark.asyncio
+async def test_group_commit_batches_concurrent_appends(tmp_path):
+    writer = GroupCommitWriter(commit_window_ms=20, max_batch=1000)
+    paths = [str(tmp_path / f"s{i}.wal") for i in range(4)]
+
+    await asyncio.gather(*(
+        writer.append(paths[i % 4], f"{i}\n".encode()) for i in range(200)
+    ))
+    metrics = writer.metrics()
+    await writer.close()
+
+    assert metrics["entries"] == 200
+    assert metrics["batches"] < 200
+    assert metrics["syncs"] < 200
+    for n, path in enumerate(paths):
+        with open(path) as f:
+            assert [int(line) for line in f] == list(range(n, 200, 4))
+
+
+@pytest.mark.asyncio
+async def test_group_commit_bounds_open_files(tmp_path):
+    writer = GroupCommitWriter(commit_window_ms=5, max_open_files=2)
+    paths = [str(tmp_path / f"s{i}.wal") for i in range(5)]
+
+    await asyncio.gather(*(writer.append(p, b"x\n") for p in paths))
+    assert writer.metrics()["open_files"] <= 2
+    await writer.close()
+
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read() == b"x\n"
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_keeps_entries_after_anchor(tmp_path):
+    writer = GroupCommitWriter(commit_window_ms=0)
+    wal = WriteAheadLog("s1", SegmentedLog(str(tmp_path), writer=writer))
+
+    for i in range(3):
+        await wal.append_async(TerminalAction(session_id="s1", command="ls", args=[str(i)]))
+    through = wal.sequence - 1
+    late = wal.append_async(TerminalAction(session_id="s1", command="cat"))
+    await wal.checkpoint(through)
+    await late
+    await writer.close()
+
+    log = SegmentedLog(str(tmp_path))
+    assert [seq for seq, _ in log.records("s1")] == [3]
+    recovered = WriteAheadLog("s1", log)
+    assert [a.command for a in recovered.recover()] == ["cat"]
+    assert recovered.sequence == 4
+
+
+def test_segmented_log_shares_segments_across_sessions(tmp_path):
+    log = SegmentedLog(str(tmp_path), segment_bytes=512)
+    for i in range(20):
+        log.append(f"s{i % 4}", i // 4, f"payload-{i}".encode())
+
+    segments = list(tmp_path.glob("*.seg"))
+    assert 1 < len(segments) < 20
+
+    reloaded = SegmentedLog(str(tmp_path))
+    assert sorted(reloaded.sessions()) == ["s0", "s1", "s2", "s3"]
+    assert reloaded.records("s2") == [(n, f"payload-{n * 4 + 2}".encode()) for n in range(5)]
+    assert reloaded.high_sequence("s2") == 4
+
+
+def test_checkpoint_is_index_update_and_drops_dead_segments(tmp_path):
+    log = SegmentedLog(str(tmp_path), segment_bytes=256)
+    for i in range(10):
+        log.append("anchored", i, b"x" * 64)
+    log.append("live", 0, b"keep")
+    before = log.metrics()["segments"]
+
+    log.checkpoint("anchored", 9)
+    assert log.records("anchored") == []
+    assert log.metrics()["segments"] < before
+    assert len(list(tmp_path.glob("*.seg"))) == log.metrics()["segments"]
+
+    reloaded = SegmentedLog(str(tmp_path))
+    assert reloaded.sessions() == ["live"]
+    assert reloaded.records("live") == [(0, b"keep")]
+    assert reloaded.high_sequence("anchored") == 9
+
+
+@pytest.mark.asyncio
+async def test_compaction_moves_live_records(tmp_path):
+    writer = GroupCommitWriter(commit_window_ms=0)
+    log = SegmentedLog(str(tmp_path), segment_bytes=300, writer=writer)
+    for i in range(6):
+        await log.append("a", i, b"a" * 40)
+        await log.append("b", i, b"b" * 40)
+    first = min(log.segments)
+    log.checkpoint("a", 5)
+
+    assert await log.compact() >= 1
+    assert first not in log.segments
+    assert log.records("b") == [(i, b"b" * 40) for i in range(6)]
+    await writer.close()
+
+    reloaded = SegmentedLog(str(tmp_path))
+    assert reloaded.sessions() == ["b"]
+    assert [seq for seq, _ in reloaded.records("b")] == list(range(6))
+
+
+class TornFile:
+    """Writes half of one record, then fails."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, data):
+        self.f.write(data[:len(data) // 2])
+        raise OSError("short write")
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+
+@pytest.mark.asyncio
+async def test_failed_write_seals_segment(tmp_path):
+    writer = GroupCommitWriter(commit_window_ms=0)
+    log = SegmentedLog(str(tmp_path), writer=writer)
+    await log.append("s1", 0, b"first")
+    torn = min(log.segments)
+
+    open_file = writer._open
+    writer._open = lambda path: TornFile(open_file(path))
+    with pytest.raises(OSError, match="short write"):
+        await log.append("s1", 1, b"torn")
+    writer._open = open_file
+
+    # Acknowledged records never land behind the torn one
+    await log.append("s1", 2, b"after")
+    assert max(log.segments) > torn
+    assert [seq for seq, _ in log.records("s1")] == [0, 2]
+    await writer.close()
+
+    reloaded = SegmentedLog(str(tmp_path))
+    assert reloaded.records("s1") == [(0, b"first"), (2, b"after")]
+
+
+def test_recovery_ignores_torn_tail(tmp_path):
+    log = SegmentedLog(str(tmp_path))
+    for i in range(3):
+        log.append("s1", i, b"entry")
+    (segment,) = tmp_path.glob("*.seg")
+    with open(segment, "r+b") as f:
+        f.truncate(segment.stat().st_size - 3)
+
+    reloaded = SegmentedLog(str(tmp_path))
+    assert [seq for seq, _ in reloaded.records("s1")] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_record_action_is_durable_and_ordered(tmp_path):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path), wal_commit_window_ms=5)
+    session = manager.create_session()
+
+    await asyncio.gather(*(
+        manager.record_action(session.session_id, "echo", [str(i)], str(tmp_path), RiskLevel.READ)
+        for i in range(50)
+    ))
+
+    recovered = WriteAheadLog(session.session_id, SegmentedLog(str(tmp_path))).recover()
+    assert [a.action_id for a in recovered] == [a.action_id for a in session.actions]
+    assert manager.metrics()["wal"]["batches"] < 50
+
+    await manager.anchor_session(session.session_id, immediate=True)
+    assert WriteAheadLog(session.session_id, SegmentedLog(str(tmp_path))).recover() == []
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_leaves_session_untouched(tmp_path, monkeypatch):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    session = manager.create_session()
+    await manager.record_action(session.session_id, "ls", [], str(tmp_path), RiskLevel.READ)
+    root = session.compute_merkle_root()
+
+    def failing_sync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(wal, "_fdatasync", failing_sync)
+    with pytest.raises(OSError, match="disk full"):
+        await manager.record_action(session.session_id, "rm", ["x"], str(tmp_path), RiskLevel.WRITE)
+
+    assert [a.command for a in session.actions] == ["ls"]
+    assert session.compute_merkle_root() == root
+    await manager.close()
+
+
+def test_action_payload_round_trip():
+    actions = [
+        TerminalAction(session_id="s1", command="git", args=["commit", "-m", "ünïcode"],
+                       cwd="/repo", risk_level=RiskLevel.WRITE, exit_code=1,
+                       stdout_hash="ab" * 8, stderr_hash="cd" * 8),
+        TerminalAction(session_id="s1", command="ls", timestamp=datetime(2024, 5, 1, 12, 30, 1, 5)),
+        TerminalAction(session_id="s1", command="rm", risk_level=RiskLevel.HIGH_RISK,
+                       timestamp=datetime(2024, 5, 1, 12, 30, tzinfo=timezone(timedelta(hours=-5)))),
+    ]
+    for action in actions:
+        decoded = unpack_action("s1", pack_action(action))
+        assert decoded == action
+        assert decoded.compute_hash() == action.compute_hash()
+
+
+def test_recovery_stops_at_corrupt_record(tmp_path):
+    log = SegmentedLog(str(tmp_path))
+    for i in range(5):
+        log.append("s1", i, pack_action(TerminalAction(session_id="s1", command="ls", args=[str(i)])))
+    (segment,) = tmp_path.glob("*.seg")
+    size = segment.stat().st_size
+    with open(segment, "r+b") as f:
+        f.seek(size * 3 // 5 + 30)  # Inside the fourth record
+        f.write(b"\xff")
+
+    reloaded = SegmentedLog(str(tmp_path))
+    recovered = WriteAheadLog("s1", reloaded).recover()
+    assert [a.args for a in recovered] == [["0"], ["1"], ["2"]]
+    metrics = reloaded.metrics()
+    assert metrics["recovered_bytes"] == size * 3 // 5
+    assert metrics["discarded_bytes"] == size - size * 3 // 5
+
+
+@pytest.mark.asyncio
+async def test_recovered_session_has_same_merkle_root(tmp_path):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    session = manager.create_session()
+    for i in range(7):
+        await manager.record_action(session.session_id, "make", [str(i)], str(tmp_path),
+                                    RiskLevel.WRITE, exit_code=i % 2, stdout="out")
+    await manager.close()
+
+    restarted = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    recovered = restarted.recover_session(session.session_id)
+    assert recovered.compute_merkle_root() == session.compute_merkle_root()
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_recover_all_rebuilds_every_session(tmp_path):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    sessions = [manager.create_session() for _ in range(5)]
+    for n, session in enumerate(sessions):
+        for i in range(n + 1):
+            await manager.record_action(session.session_id, "ls", [str(i)], str(tmp_path), RiskLevel.READ)
+    await manager.anchor_session(sessions[0].session_id, immediate=True)
+    await manager.close()
+
+    restarted = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    restarted.RECOVERY_BATCH_SIZE = 2
+    assert restarted.recovery["state"] == "idle"
+    assert await restarted.recover_all(max_workers=2) == 4
+
+    assert restarted.ready
+    assert restarted.recovery["sessions_recovered"] == 4
+    assert restarted.recovery["actions_recovered"] == 2 + 3 + 4 + 5
+    assert sessions[0].session_id not in restarted.sessions
+    for session in sessions[1:]:
+        recovered = restarted.get_session(session.session_id)
+        assert recovered.compute_merkle_root() == session.compute_merkle_root()
+        last = session.actions[-1].action_id
+        assert restarted.inclusion_proof(session.session_id, last)["merkle_root"] == session.compute_merkle_root()
+
+    # New appends continue the recovered session's sequence
+    await restarted.record_action(sessions[1].session_id, "pwd", [], str(tmp_path), RiskLevel.READ)
+    assert len(WriteAheadLog(sessions[1].session_id, SegmentedLog(str(tmp_path))).recover()) == 3
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_recovery_is_retried_until_ready(tmp_path):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    session = manager.create_session()
+    await manager.record_action(session.session_id, "ls", [], str(tmp_path), RiskLevel.READ)
+    await manager.close()
+
+    restarted = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    restarted.RECOVERY_RETRY_BASE_SECONDS = 0.2
+    load = restarted.wal_log.load
+    failures = iter([OSError("segment unreadable")])
+
+    def flaky_load():
+        for error in failures:
+            raise error
+        load()
+
+    restarted.wal_log.load = flaky_load
+    recovery = asyncio.create_task(restarted.recover_with_retry())
+    await asyncio.sleep(0.05)
+    assert not restarted.ready
+    assert restarted.recovery["state"] == "failed"
+    assert restarted.recovery["error"] == "segment unreadable"
+
+    assert await asyncio.wait_for(recovery, 5) == 1
+    assert restarted.ready
+    assert restarted.recovery["attempts"] == 2
+    assert restarted.get_session(session.session_id).compute_merkle_root() == session.compute_merkle_root()
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_load_failure_is_rescanned_on_retry(tmp_path):
+    manager = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path), wal_segment_bytes=200)
+    sessions = [manager.create_session() for _ in range(3)]
+    for session in sessions:
+        for i in range(3):
+            await manager.record_action(session.session_id, "ls", [str(i)], str(tmp_path), RiskLevel.READ)
+    await manager.close()
+    segments = sorted(tmp_path.glob("*.seg"))
+    assert len(segments) > 2
+
+    restarted = SessionManager(project_root=str(tmp_path), wal_dir=str(tmp_path))
+    restarted.RECOVERY_RETRY_BASE_SECONDS = 0.01
+    scan = restarted.wal_log._scan_segment
+    scanned = []
+
+    def flaky_scan(segment, data):
+        scanned.append(segment.segment_id)
+        if len(scanned) == 2:
+            raise OSError("transient read error")
+        scan(segment, data)
+
+    restarted.wal_log._scan_segment = flaky_scan
+    assert await asyncio.wait_for(restarted.recover_with_retry(), 5) == 3
+    assert restarted.recovery["attempts"] == 2
+    for session in sessions:
+        recovered = restarted.get_session(session.session_id)
+        assert recovered.compute_merkle_root() == session.compute_merkle_root()
+
+    # New records go to a fresh segment, not onto an unscanned one
+    await restarted.record_action(sessions[0].session_id, "pwd", [], str(tmp_path), RiskLevel.READ)
+    assert max(restarted.wal_log.segments) > int(segments[-1].stem)
+    await restarted.close()
+    assert len(WriteAheadLog(sessions[0].session_id, SegmentedLog(str(tmp_path))).recover()) == 4